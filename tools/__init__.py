@@ -5,6 +5,7 @@ from .northdata import (  # noqa: F401
     NorthDataError,
     NorthDataSuggestion,
     fetch_suggestions,
+    fetch_suggestions_async,
     format_top_suggestion,
     store_suggestions,
 )
@@ -7,19 +7,14 @@ from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Optional
-from urllib.parse import urlparse
+
+from tools.url_utils import domain_key
 
 BLACKLIST_PATH = Path("data/staging/blacklist.json")
 
 
 def _domain_key(url: str) -> str:
-    parsed = urlparse(url)
-    host = parsed.netloc.split("@")[-1].lower()
-    if ":" in host:
-        host = host.split(":", 1)[0]
-    if host.startswith("www."):
-        host = host[4:]
-    return host or url.lower()
+    return domain_key(url) or url.lower()
 
 
 @dataclass
@@ -0,0 +1,134 @@
+"""
+Priorisierte Crawl-Frontier fuer abgeleitete Kandidaten (Verzeichnis-Eintraege, Partner-Links).
+
+Statt abgeleitete Kandidaten rekursiv nacheinander zu bewerten (und dabei einen
+Kandidaten-Slot zu blockieren), legt die Pipeline sie in die Frontier. Eine
+begrenzte Zahl Worker arbeitet sie nach Prioritaet (Relevanz des Linktexts,
+Tiefe) parallel ab. Budgets begrenzen den Fan-out pro Lauf insgesamt, pro Quelle
+(Domain der Ursprungsseite) und pro Tiefe; doppelte Schluessel werden verworfen.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from tools.query_dedupe import fold_text
+
+# Abzug pro zusaetzlicher Tiefe: flache Eintraege vor tief verschachtelten.
+DEPTH_PENALTY = 0.5
+
+
+def anchor_relevance(text: str, keywords: Iterable[str]) -> float:
+    """Anteil passender Schluesselwoerter im (gefalteten) Linktext bzw. in der URL, 0.0 - 1.0."""
+    folded = fold_text(text or "")
+    terms = {fold_text(keyword) for keyword in keywords if keyword and keyword.strip()}
+    if not folded or not terms:
+        return 0.0
+    hits = sum(1 for term in terms if term in folded)
+    return hits / (hits + 2.0)
+
+
+@dataclass
+class FrontierBudget:
+    max_total: int = 80
+    max_per_source: int = 25
+    max_per_depth: int = 50
+
+
+@dataclass(order=True)
+class FrontierItem:
+    sort_key: tuple
+    payload: Any = field(compare=False)
+    source: str = field(compare=False, default="")
+    depth: int = field(compare=False, default=1)
+    priority: float = field(compare=False, default=0.0)
+
+
+class CrawlFrontier:
+    def __init__(self, budget: Optional[FrontierBudget] = None) -> None:
+        self.budget = budget or FrontierBudget()
+        self.per_source: Counter = Counter()
+        self.per_depth: Counter = Counter()
+        self.admitted = 0
+        self.dropped: Counter = Counter()
+        self.processed = 0
+        self.errors = 0
+        self._seen: set[str] = set()
+        self._order = itertools.count()
+        self._queue: "asyncio.PriorityQueue[FrontierItem]" = asyncio.PriorityQueue()
+        self._workers: List[asyncio.Task] = []
+
+    def _over_budget(self, source: str, depth: int) -> str:
+        if self.admitted >= self.budget.max_total:
+            return "total"
+        if self.per_source[source] >= self.budget.max_per_source:
+            return "source"
+        if self.per_depth[depth] >= self.budget.max_per_depth:
+            return "depth"
+        return ""
+
+    def push(self, payload: Any, *, key: str, source: str, depth: int, relevance: float = 0.0) -> bool:
+        """Nimmt ein Element auf; False bei Duplikat oder erschoepftem Budget (Grund in `dropped`)."""
+        if key in self._seen:
+            self.dropped["duplicate"] += 1
+            return False
+        reason = self._over_budget(source, depth)
+        if reason:
+            self.dropped[reason] += 1
+            return False
+        self._seen.add(key)
+        self.admitted += 1
+        self.per_source[source] += 1
+        self.per_depth[depth] += 1
+        priority = relevance - DEPTH_PENALTY * max(0, depth - 1)
+        self._queue.put_nowait(
+            FrontierItem((-priority, next(self._order)), payload, source=source, depth=depth, priority=priority)
+        )
+        return True
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self, workers: int, handler: Callable[[FrontierItem], Awaitable[int]]) -> None:
+        """Startet Worker; `handler` liefert die Zahl verarbeiteter Kandidaten und darf neue Elemente pushen."""
+
+        async def work() -> None:
+            while True:
+                item = await self._queue.get()
+                try:
+                    # Erst abwarten, dann addieren: `+=` ueber ein await verliert parallele Updates.
+                    processed = int(await handler(item) or 0)
+                    self.processed += processed
+                except Exception:
+                    self.errors += 1
+                finally:
+                    self._queue.task_done()
+
+        self._workers.extend(asyncio.create_task(work()) for _ in range(max(1, workers)))
+
+    async def join(self) -> None:
+        """Wartet, bis alle (auch waehrenddessen nachgeschobenen) Elemente verarbeitet sind."""
+        await self._queue.join()
+
+    async def close(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "processed": self.processed,
+            "pending": self.pending(),
+            "errors": self.errors,
+            "dropped": dict(self.dropped),
+            "per_depth": dict(self.per_depth),
+        }
+
+
+__all__ = ["CrawlFrontier", "FrontierBudget", "FrontierItem", "anchor_relevance"]
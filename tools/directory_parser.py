@@ -13,16 +13,22 @@ import json
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List
-from urllib.error import HTTPError, URLError
+from typing import Iterable, List, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
-from urllib.request import Request, urlopen
 
-from lxml import html
+from tools.fetch_memory import get_fetch_memory
+from tools.host_health import HostUnavailableError, get_host_health
+from tools.html_decoding import HtmlDecodingError, charset_from_content_type, parse_html_bytes
+from tools.http_client import HttpClientError, get_client
+from tools.keyword_matcher import KeywordMatcher
+from tools.parse_pool import run_parse
+from tools.single_flight import SingleFlight
+from tools.url_utils import canonical_url, domain_key, url_key
 
 DIRECTORY_CACHE_DIR = Path("data/staging/directory_expansions")
 USER_AGENT = "AgentenSystem/DirectoryParser/1.0"
 MAX_FETCH_BYTES = 2_500_000  # 2.5 MB safety net
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
 ENTRY_KEYWORDS = [
     "maker",
     "hack",
@@ -49,6 +55,13 @@ ENTRY_KEYWORDS = [
 ]
 
 
+# Gleichzeitige Expansionen derselben Uebersichtsseite teilen sich einen Abruf.
+_FLIGHTS = SingleFlight()
+
+
+ENTRY_MATCHER = KeywordMatcher(ENTRY_KEYWORDS)
+
+
 class DirectoryParserError(RuntimeError):
     """Signals issues while fetching or parsing a directory page."""
 
@@ -112,16 +125,57 @@ def store_entries(source_url: str, entries: Iterable[DirectoryEntry]) -> Path:
     return path
 
 
-def _fetch_html(url: str, *, timeout: float = 15.0) -> str:
-    request = Request(url, headers={"User-Agent": USER_AGENT})
+def _translate_error(exc: HttpClientError, url: str) -> DirectoryParserError:
+    if exc.reason:
+        # Kein HTML oder zu gross: beim naechsten Mal gar nicht erst abrufen.
+        memory = get_fetch_memory()
+        memory.record_skipped(url, exc.reason)
+        memory.save()
+        return DirectoryParserError(f"Kein verwertbares HTML ({exc.reason}) für {url}")
+    if exc.status is not None:
+        return DirectoryParserError(f"HTTP {exc.status} für {url}")
+    return DirectoryParserError(f"Seite nicht erreichbar ({exc})")
+
+
+def _check_skipped(url: str) -> None:
+    if get_fetch_memory().is_skipped(url):
+        raise DirectoryParserError(f"{url} übersprungen (kein HTML oder zu gross)")
+
+
+def _fetch_html(url: str, *, timeout: float = 15.0) -> Tuple[bytes, Optional[str]]:
+    _check_skipped(url)
+    try:
+        with get_host_health().guard(url):
+            response = get_client().request(
+                url,
+                headers={"User-Agent": USER_AGENT},
+                timeout=timeout,
+                max_bytes=MAX_FETCH_BYTES,
+                accept_types=HTML_CONTENT_TYPES,
+            )
+    except HostUnavailableError as exc:
+        raise DirectoryParserError(str(exc)) from exc
+    except HttpClientError as exc:  # pragma: no cover - network dependent
+        raise _translate_error(exc, url) from exc
+    return response.body, charset_from_content_type(response.headers.get("content-type"))
+
+
+async def _fetch_html_async(url: str, *, timeout: float = 15.0) -> Tuple[bytes, Optional[str]]:
+    _check_skipped(url)
     try:
-        with urlopen(request, timeout=timeout) as response:
-            content = response.read(MAX_FETCH_BYTES)
-    except HTTPError as exc:  # pragma: no cover - network dependent
-        raise DirectoryParserError(f"HTTP {exc.code} für {url}") from exc
-    except URLError as exc:  # pragma: no cover
-        raise DirectoryParserError(f"Seite nicht erreichbar ({exc})") from exc
-    return content.decode("utf-8", errors="ignore")
+        with get_host_health().guard(url):
+            response = await get_client().request_async(
+                url,
+                headers={"User-Agent": USER_AGENT},
+                timeout=timeout,
+                max_bytes=MAX_FETCH_BYTES,
+                accept_types=HTML_CONTENT_TYPES,
+            )
+    except HostUnavailableError as exc:
+        raise DirectoryParserError(str(exc)) from exc
+    except HttpClientError as exc:  # pragma: no cover - network dependent
+        raise _translate_error(exc, url) from exc
+    return response.body, charset_from_content_type(response.headers.get("content-type"))
 
 
 def _normalize(text: str) -> str:
@@ -129,8 +183,7 @@ def _normalize(text: str) -> str:
 
 
 def _anchor_matches(text: str) -> bool:
-    lowered = text.lower()
-    return any(keyword in lowered for keyword in ENTRY_KEYWORDS)
+    return ENTRY_MATCHER.search(text)
 
 
 def parse_directory_entries(
@@ -142,11 +195,30 @@ def parse_directory_entries(
     """
     Returns potential Maker entries extracted from an overview page.
     """
-    html_text = _fetch_html(url)
-    doc = html.fromstring(html_text)
+    body, charset = _fetch_html(url)
+    return parse_directory_html(url, body, max_entries=max_entries, min_links=min_links, charset=charset)
+
+
+def parse_directory_html(
+    url: str,
+    content: Union[bytes, str],
+    *,
+    max_entries: int = 25,
+    min_links: int = 3,
+    charset: Optional[str] = None,
+) -> List[DirectoryEntry]:
+    """
+    Extracts potential Maker entries from already fetched overview HTML.
+
+    Raw bytes are parsed directly with the HTTP `charset` (or BOM/meta detection).
+    """
+    body = content.encode("utf-8") if isinstance(content, str) else content
+    try:
+        doc = parse_html_bytes(body, charset or ("utf-8" if isinstance(content, str) else None))
+    except HtmlDecodingError as exc:
+        raise DirectoryParserError(f"HTML von {url} nicht lesbar ({exc})") from exc
     anchors = doc.xpath("//a[@href]")
-    parsed = urlparse(url)
-    base_host = parsed.netloc
+    base_host = domain_key(url)
 
     entries: List[DirectoryEntry] = []
     seen_urls: set[str] = set()
@@ -167,17 +239,18 @@ def parse_directory_entries(
         if not parsed_target.scheme.startswith("http"):
             continue
         # Avoid jumping to completely unrelated TLDs unless explicitly linked.
-        if parsed_target.netloc == base_host and parsed_target.path in {"/", ""}:
+        if domain_key(resolved) == base_host and parsed_target.path in {"/", ""}:
             continue
-        resolved = resolved.rstrip("/")
-        if resolved in seen_urls:
+        resolved = canonical_url(resolved)
+        key = url_key(resolved)
+        if key in seen_urls:
             continue
         parent_text = anchor.getparent().text_content() if anchor.getparent() is not None else text
         description = _normalize(parent_text).replace(text, "").strip(" :-–|")
         if not description:
             description = f"Gefunden über {url}"
         entries.append(DirectoryEntry(name=text, url=resolved, description=description))
-        seen_urls.add(resolved)
+        seen_urls.add(key)
 
     if len(entries) < min_links:
         return []
@@ -204,11 +277,46 @@ def expand_directory(
     return entries
 
 
+async def expand_directory_async(
+    url: str,
+    *,
+    max_entries: int = 25,
+    min_links: int = 3,
+    use_cache: bool = True,
+) -> List[DirectoryEntry]:
+    """
+    Async variant of `expand_directory`: pooled fetch, parsing in a worker thread
+    or process (`PIPELINE_PARSE_WORKERS`).
+    Concurrent calls for the same page await a single fetch.
+    """
+    cached = load_cached_entries(url) if use_cache else []
+    if cached:
+        return cached[:max_entries]
+
+    async def expand() -> List[DirectoryEntry]:
+        body, charset = await _fetch_html_async(url)
+        entries = await run_parse(
+            parse_directory_html,
+            url,
+            body,
+            max_entries=max_entries,
+            min_links=min_links,
+            charset=charset,
+        )
+        if entries:
+            store_entries(url, entries)
+        return entries
+
+    return list(await _FLIGHTS.run((url_key(url), max_entries, min_links), expand))
+
+
 __all__ = [
     "DirectoryEntry",
     "DirectoryParserError",
     "expand_directory",
+    "expand_directory_async",
     "load_cached_entries",
     "parse_directory_entries",
+    "parse_directory_html",
     "store_entries",
 ]
@@ -6,18 +6,27 @@ Wird als Fallback verwendet, wenn die Google Custom Search API nicht verfügbar
 
 from __future__ import annotations
 
+import asyncio
 import json
-import time
-from dataclasses import dataclass, asdict
+import os
+import threading
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, Iterator, List
+from typing import Iterable, Iterator, List, Optional
 
 from duckduckgo_search import DDGS
-from duckduckgo_search.exceptions import RatelimitException
+from duckduckgo_search.exceptions import DuckDuckGoSearchException, RatelimitException
 
+from tools.rate_limiter import TokenBucket, get_limiter
+from tools.search_cache import SEARCH_OUTPUT_DIR, get_search_cache, to_search_results
 
-SEARCH_OUTPUT_DIR = Path("data/staging/search")
+RATE_STATE_PATH = Path("data/staging/duckduckgo_rate.json")
+# AIMD: pro Erfolg +AIMD_INCREASE req/s, pro Rate-Limit Rate * AIMD_DECREASE.
+AIMD_MIN_RATE = 0.05
+AIMD_MAX_RATE = 2.0
+AIMD_INCREASE = 0.05
+AIMD_DECREASE = 0.5
 
 
 @dataclass
@@ -33,6 +42,202 @@ def ensure_search_dir(path: Path = SEARCH_OUTPUT_DIR) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+class AimdRateController:
+    """
+    Additive-Increase/Multiplicative-Decrease-Regler fuer den DuckDuckGo-Bucket.
+
+    Die zuletzt tolerierte Rate wird in `data/staging/duckduckgo_rate.json`
+    gespeichert, damit der naechste Lauf dort weitermacht statt bei der
+    konservativen Standardrate: nach einem Rate-Limit sofort, Erhoehungen erst mit
+    `save()` am Laufende. Ist `SEARCH_RATE_LIMIT_DUCKDUCKGO` gesetzt, bleibt die
+    Rate fest.
+    """
+
+    def __init__(self, limiter: TokenBucket, *, path: Path = RATE_STATE_PATH, adaptive: Optional[bool] = None) -> None:
+        self.limiter = limiter
+        self.path = path
+        self.adaptive = not os.environ.get("SEARCH_RATE_LIMIT_DUCKDUCKGO") if adaptive is None else adaptive
+        self.successes = 0
+        self.ratelimits = 0
+        self.changed = False
+        self._lock = threading.Lock()
+        if self.adaptive:
+            self._load()
+
+    @property
+    def rate(self) -> float:
+        return self.limiter.rate
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            rate = float(payload.get("rate"))
+        except (json.JSONDecodeError, TypeError, ValueError):
+            return
+        self.successes = int(payload.get("successes", 0) or 0)
+        self.ratelimits = int(payload.get("ratelimits", 0) or 0)
+        self.limiter.set_rate(min(AIMD_MAX_RATE, max(AIMD_MIN_RATE, rate)))
+
+    def _save(self) -> None:
+        self.changed = False
+        payload = {
+            "rate": round(self.limiter.rate, 4),
+            "successes": self.successes,
+            "ratelimits": self.ratelimits,
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def on_success(self) -> None:
+        if not self.adaptive:
+            return
+        with self._lock:
+            self.successes += 1
+            self.limiter.set_rate(min(AIMD_MAX_RATE, self.limiter.rate + AIMD_INCREASE))
+            # Nicht pro Erfolg schreiben; `save()` am Laufende persistiert den Stand.
+            self.changed = True
+
+    def on_ratelimit(self) -> None:
+        if not self.adaptive:
+            return
+        with self._lock:
+            self.ratelimits += 1
+            self.limiter.set_rate(max(AIMD_MIN_RATE, self.limiter.rate * AIMD_DECREASE))
+            self._save()
+
+    def save(self) -> Optional[Path]:
+        """Schreibt den Stand, falls sich seit dem letzten Speichern etwas geaendert hat."""
+        with self._lock:
+            if not self.adaptive or not self.changed:
+                return None
+            self._save()
+            return self.path
+
+
+class DuckDuckGoClient:
+    """Langlebige DDGS-Session, die ueber alle Queries wiederverwendet wird."""
+
+    def __init__(self, controller: Optional[AimdRateController] = None, *, timeout: int = 10) -> None:
+        self.controller = controller or AimdRateController(get_limiter("duckduckgo"))
+        self.timeout = timeout
+        self._ddgs: Optional[DDGS] = None
+        self._lock = threading.Lock()
+
+    def _session(self) -> DDGS:
+        if self._ddgs is None:
+            self._ddgs = DDGS(timeout=self.timeout)
+        return self._ddgs
+
+    def _close_session(self) -> None:
+        session, self._ddgs = self._ddgs, None
+        if session is None:
+            return
+        try:
+            session.__exit__(None, None, None)
+            close = getattr(getattr(session, "client", None), "close", None)
+            if callable(close):
+                close()
+        except Exception:  # pragma: no cover - Aufraeumen darf den Lauf nicht abbrechen
+            pass
+
+    def reset(self) -> None:
+        with self._lock:
+            self._close_session()
+
+    def close(self) -> None:
+        """Schliesst die DDGS-Session und speichert den AIMD-Stand."""
+        with self._lock:
+            self._close_session()
+        self.controller.save()
+
+    def text(
+        self,
+        query: str,
+        *,
+        max_results: int,
+        region: str,
+        safesearch: str,
+    ) -> List[DuckDuckGoResult]:
+        get_limiter("duckduckgo").acquire_sync()
+        with self._lock:
+            try:
+                items = self._session().text(
+                    query,
+                    region=region,
+                    safesearch=safesearch,
+                    max_results=max_results,
+                    backend="lite",
+                )
+            except RatelimitException:
+                raise
+            except DuckDuckGoSearchException:
+                # Verbindung/Session defekt: naechster Aufruf baut sie neu auf.
+                self._close_session()
+                raise
+        return [
+            DuckDuckGoResult(
+                query=query,
+                title=item.get("title", "").strip(),
+                url=item.get("href", "").strip(),
+                snippet=item.get("body", "").strip(),
+            )
+            for item in items or []
+        ]
+
+    def search(
+        self,
+        query: str,
+        *,
+        max_results: int = 6,
+        region: str = "de-de",
+        safesearch: str = "moderate",
+        max_retries: int = 2,
+    ) -> List[DuckDuckGoResult]:
+        attempt = 0
+        while attempt <= max_retries:
+            try:
+                print(f"[DuckDuckGo] Query '{query}' (Versuch {attempt + 1}/{max_retries + 1}) ...")
+                results = self.text(query, max_results=max_results, region=region, safesearch=safesearch)
+                self.controller.on_success()
+                return results
+            except RatelimitException:
+                self.controller.on_ratelimit()
+                attempt += 1
+                if attempt > max_retries:
+                    break
+                # Die Wartezeit ergibt sich aus der gesenkten Bucket-Rate beim naechsten acquire.
+                print(f"[DuckDuckGo] Rate-Limit fuer '{query}', Rate jetzt {self.controller.rate:.2f}/s ...")
+        print(f"[DuckDuckGo] Keine Ergebnisse fuer '{query}'.")
+        return []
+
+
+_CLIENT: Optional[DuckDuckGoClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_duckduckgo_client() -> DuckDuckGoClient:
+    """Prozessweit geteilter DuckDuckGo-Client (inkl. AIMD-Regler)."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = DuckDuckGoClient()
+        return _CLIENT
+
+
+def close_duckduckgo_client() -> None:
+    """Schliesst den geteilten Client (falls angelegt); der naechste Aufruf baut ihn neu auf."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        client, _CLIENT = _CLIENT, None
+    if client is not None:
+        client.close()
+
+
 def search_duckduckgo(
     query: str,
     *,
@@ -42,86 +247,46 @@ def search_duckduckgo(
     max_retries: int = 2,
 ) -> List[DuckDuckGoResult]:
     ensure_search_dir()
-    attempt = 0
-    delay = 3.0
-    while attempt <= max_retries:
-        try:
-            print(f"[DuckDuckGo] Query '{query}' (Versuch {attempt + 1}/{max_retries + 1}) ...")
-            time.sleep(1.0 if attempt == 0 else delay / 2)
-            results: List[DuckDuckGoResult] = []
-            with DDGS() as ddgs:
-                for item in ddgs.text(
-                    query,
-                    region=region,
-                    safesearch=safesearch,
-                    max_results=max_results,
-                    backend="lite",
-                ):
-                    results.append(
-                        DuckDuckGoResult(
-                            query=query,
-                            title=item.get("title", "").strip(),
-                            url=item.get("href", "").strip(),
-                            snippet=item.get("body", "").strip(),
-                        )
-                    )
-            return results
-        except RatelimitException:
-            print(f"[DuckDuckGo] Rate-Limit fuer '{query}', warte {delay:.1f}s ...")
-            attempt += 1
-            if attempt > max_retries:
-                break
-            print(f"Rate-Limit bei DuckDuckGo, warte {delay:.1f}s und versuche erneut...")
-            time.sleep(delay)
-            delay *= 2
-    print(f"[DuckDuckGo] Keine Ergebnisse fuer '{query}'.")
-    return []
+    return get_duckduckgo_client().search(
+        query,
+        max_results=max_results,
+        region=region,
+        safesearch=safesearch,
+        max_retries=max_retries,
+    )
+
+
+async def search_duckduckgo_async(query: str, **kwargs: object) -> List[DuckDuckGoResult]:
+    """Async-Fassade: `duckduckgo-search` ist synchron und laeuft daher im Worker-Thread."""
+    return await asyncio.to_thread(search_duckduckgo, query, **kwargs)
 
 
 def store_search_results(
     query: str, results: Iterable[DuckDuckGoResult], *, directory: Path = SEARCH_OUTPUT_DIR
 ) -> Path:
-    ensure_search_dir(directory)
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    file_path = directory / f"{slugify(query)}_{timestamp}.json"
-    payload = {
-        "query": query,
-        "fetched_at": timestamp,
-        "results": [asdict(result) for result in results],
-    }
-    file_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    return file_path
+    return get_search_cache(directory).store(query, results, backend="duckduckgo")
 
 
 def load_cached_results(
-    query: str, *, directory: Path = SEARCH_OUTPUT_DIR
+    query: str,
+    *,
+    directory: Path = SEARCH_OUTPUT_DIR,
+    fresh_only: bool = False,
 ) -> List[DuckDuckGoResult]:
-    ensure_search_dir(directory)
-    slug = slugify(query)
-    files = sorted(directory.glob(f"{slug}_*.json"), reverse=True)
-    for file in files:
-        try:
-            payload = json.loads(file.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            continue
-        items = payload.get("results") or []
-        results: List[DuckDuckGoResult] = []
-        for item in items:
-            url = item.get("url") or item.get("href") or ""
-            if not url:
-                continue
-            results.append(
-                DuckDuckGoResult(
-                    query=item.get("query", query),
-                    title=item.get("title", "").strip(),
-                    url=url.strip(),
-                    snippet=item.get("snippet") or item.get("body", "") or "",
-                    source=item.get("source", "duckduckgo"),
-                )
-            )
-        if results:
-            return results
-    return []
+    hit = get_search_cache(directory).lookup(query, "duckduckgo", fresh_only=fresh_only)
+    if hit is None:
+        return []
+    _, items = hit
+    return [
+        DuckDuckGoResult(
+            query=item.query,
+            title=item.title,
+            url=item.url,
+            snippet=item.snippet,
+            source=item.source,
+        )
+        for item in to_search_results(items, query=query, backend="duckduckgo")
+    ]
 
 
 def slugify(value: str) -> str:
@@ -0,0 +1,260 @@
+"""
+Aequivalenzpruefung des Single-Pass-Extraktors (`site_scraper._extract_page`).
+
+`reference_extract` ist die fruehere XPath-Implementierung (getrennte Scans fuer
+`//p`, `//li`, mailto-Links, `//a[@href]` und `text_content()`), nur um die
+Navigationslinks ergaenzt. Der Vergleich parst jede Seite einmal und prueft alle
+Snapshot-Felder beider Extraktoren; jede Abweichung ist ein Fehler (Exit-Code 1).
+
+    python -m tools.extract_equivalence [--pages 3000] [--seed 0]
+    python -m tools.extract_equivalence --from-store   # Seiten aus data/staging/pages/
+
+Neben den festen Fixtures (verschachtelte Listen/Absaetze, Kommentare, mailto-,
+relative, externe und Fragment-Links, Kontakt-Abschnitte) werden zufaellige
+Seiten aus denselben Bausteinen erzeugt.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from dataclasses import asdict
+from typing import Dict, List, Sequence, Tuple
+from urllib.parse import urljoin, urlparse
+
+from lxml import html
+
+from tools.html_decoding import detect_charset, parse_html_bytes
+from tools.parse_benchmark import stored_pages
+from tools.site_scraper import (
+    EMAIL_RE,
+    HIGHLIGHT_LIMIT,
+    LINK_LIMIT,
+    NAV_SCAN_LIMIT,
+    SUMMARY_MAX_CHARS,
+    SUMMARY_MIN_CHARS,
+    ContactInfo,
+    _detect_location,
+    _extract_page,
+    _nav_links,
+    _PageExtract,
+)
+from tools.url_utils import canonical_url, domain_key, url_key
+
+BASE_URL = "https://www.verein.de/"
+COMPARED_FIELDS = ("title", "summary", "highlights", "detected_location", "contacts", "links", "nav_links")
+WORDS = (
+    "Kontakt Impressum Lübeck Hamburg Verein Makerspace offene Werkstatt Projekte Kinder Robotik Löten "
+    "Treffen jeden Dienstag"
+).split()
+
+FIXTURES: Tuple[str, ...] = (
+    "<html><head><title>Verein</title></head><body><p>kurz</p></body></html>",
+    "<p>x</p>",
+    "<title>Nur Titel</title>Text ohne Absatz in Lübeck",
+    # Verschachtelte Absaetze und Listen
+    "<div><p>Erster Absatz <p>Ein deutlich laengerer Absatz mit genug Zeichen fuer die Zusammenfassung hier.</p></p>"
+    "<ul><li>Punkt eins mit genug Text<ul><li>innerer Punkt mit genug Text</li></ul></li>"
+    "<li>Punkt eins mit genug Text</li></ul></div>",
+    # Kommentare und Processing Instructions mit Tail-Text
+    "<body><!-- kommentar -->Tail vorstand@verein.de <?pi x?>weiter <p>Absatz<!-- c -->mit Kommentar</p></body>",
+    # mailto-, relative, externe, Fragment- und Sonderlinks
+    '<a href="mailto:Info@Verein.de?subject=Hallo">Info</a><a href="/kontakt">Kontakt</a>'
+    '<a href="#top">Oben</a><a href=" http://ext.org/?utm_source=x">Extern</a>'
+    '<a href="https://www.verein.de/impressum">Impressum</a><a href="javascript:void(0)">JS</a>'
+    '<a href="//cdn.example.com/x">CDN</a><a href="">leer</a><a>ohne href</a>',
+    # Kontakt-Abschnitte ohne andere Treffer bzw. mit Text-E-Mail
+    "<section>KONTAKT <p>schreib an <b>kontakt</b></p></section><section>Impressum x@y.de</section>",
+    "<section>Anderes</section><script>var a='skript@y.de';</script><p>mail: team@verein.de</p>",
+)
+
+
+def _text(node: html.HtmlElement) -> str:
+    return " ".join(node.text_content().split())
+
+
+def reference_extract(doc: html.HtmlElement, url: str) -> _PageExtract:
+    """Frueherer Extraktor (mehrere XPath-Scans) als Referenz fuer `_extract_page`."""
+    base_domain = domain_key(url)
+
+    paragraphs = doc.xpath("//p")
+    summary = next(
+        (text for text in (_text(p) for p in paragraphs) if SUMMARY_MIN_CHARS <= len(text) <= SUMMARY_MAX_CHARS),
+        None,
+    )
+    if summary is None:
+        summary = (_text(paragraphs[0]) if paragraphs else _text(doc))[:SUMMARY_MAX_CHARS]
+
+    highlights: List[str] = []
+    for bullet in doc.xpath("//li"):
+        text = _text(bullet)
+        if 20 <= len(text) <= 200 and text not in highlights:
+            highlights.append(text)
+        if len(highlights) >= HIGHLIGHT_LIMIT:
+            break
+
+    contacts: List[ContactInfo] = []
+    seen: set[str] = set()
+
+    def add_contact(email: str, name: str = "", context: str = "") -> None:
+        normalized = email.strip().lower()
+        if not normalized or normalized in seen:
+            return
+        seen.add(normalized)
+        contacts.append(ContactInfo(email=normalized, name=name.strip(), context=context.strip(), source_url=url))
+
+    for node in doc.xpath("//a[starts-with(@href, 'mailto:')]"):
+        add_contact(node.attrib.get("href", "").split("mailto:")[-1].split("?")[0], name=_text(node), context="mailto link")
+    for match in EMAIL_RE.findall(_text(doc)):
+        add_contact(match, context="page text")
+    if not contacts:
+        for section in doc.xpath(
+            "//section[contains(translate(., 'KONTAKT', 'kontakt'), 'kontakt') "
+            "or contains(translate(., 'IMPRESSUM', 'impressum'), 'impressum')]"
+        ):
+            for match in EMAIL_RE.findall(_text(section)):
+                add_contact(match, context="contact section")
+
+    links: List[str] = []
+    link_keys: set[str] = set()
+    anchors: List[Tuple[int, str, str]] = []
+    scanned = 0
+    for order, node in enumerate(doc.xpath("//a[@href]")):
+        raw = node.attrib.get("href", "")
+        if raw.startswith("mailto:"):
+            continue
+        href = raw.strip()
+        if scanned < NAV_SCAN_LIMIT:
+            scanned += 1
+            if href and not href.startswith("#"):
+                anchors.append((order, href, _text(node)))
+        if len(links) >= LINK_LIMIT or not href or href.startswith("#") or href.startswith("mailto:"):
+            continue
+        absolute = urljoin(url, href)
+        if not urlparse(absolute).scheme.startswith("http") or domain_key(absolute) == base_domain:
+            continue
+        normalized = canonical_url(absolute)
+        if url_key(normalized) not in link_keys:
+            link_keys.add(url_key(normalized))
+            links.append(normalized)
+
+    return _PageExtract(
+        title=" ".join(doc.xpath("//title/text()")),
+        summary=summary,
+        highlights=highlights,
+        contacts=contacts,
+        links=links,
+        nav_links=_nav_links(anchors, url, base_domain),
+    )
+
+
+def _fields(page: _PageExtract, url: str) -> Dict[str, object]:
+    values = asdict(page)
+    values["title"] = (page.title or url).strip()
+    values["detected_location"] = _detect_location(page.summary + " " + " ".join(page.highlights))
+    return {name: values[name] for name in COMPARED_FIELDS}
+
+
+def compare_page(body: bytes, url: str = BASE_URL) -> List[str]:
+    """Namen der Felder, in denen Single-Pass- und Referenz-Extraktor abweichen."""
+    doc = parse_html_bytes(body, detect_charset(body))
+    current = _fields(_extract_page(doc, url), url)
+    expected = _fields(reference_extract(doc, url), url)
+    return [name for name in COMPARED_FIELDS if current[name] != expected[name]]
+
+
+def _random_text(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def _random_block(rng: random.Random, depth: int = 0) -> str:
+    out: List[str] = []
+    for _ in range(rng.randint(1, 6)):
+        kind = rng.random()
+        if depth > 4 or kind < 0.25:
+            out.append(_random_text(rng, rng.randint(0, 30)))
+        elif kind < 0.4:
+            inner = _random_block(rng, depth + 1) if rng.random() < 0.3 else ""
+            out.append(f"<p>{_random_text(rng, rng.randint(3, 40))}{inner}</p>")
+        elif kind < 0.55:
+            items = "".join(
+                f"<li>{_random_text(rng, rng.randint(1, 20))}{_random_block(rng, depth + 1) if rng.random() < 0.3 else ''}</li>"
+                for _ in range(rng.randint(1, 8))
+            )
+            out.append(f"<ul>{items}</ul>")
+        elif kind < 0.65:
+            mail = f"{rng.choice(['a', 'b', 'info'])}@{rng.choice(['x.de', 'y.org'])}"
+            out.append(f'<a href="mailto:{mail}?subject=x">{_random_text(rng, 2)}</a>')
+        elif kind < 0.75:
+            href = rng.choice(
+                [
+                    f"https://ext{rng.randint(0, 20)}.de/p",
+                    "/local",
+                    "/kontakt",
+                    "impressum.html",
+                    "#top",
+                    " http://ext.org/?utm_source=x",
+                    "javascript:void(0)",
+                    "mailto:z@q.de",
+                ]
+            )
+            out.append(f'<a href="{href}">{_random_text(rng, 2)}</a>')
+        elif kind < 0.8:
+            out.append(f"<!-- c -->{_random_text(rng, 3)} kontakt@verein{rng.randint(0, 3)}.de")
+        elif kind < 0.87:
+            out.append(f"<section>{rng.choice(['KONTAKT', 'Impressum', 'x'])} {_random_block(rng, depth + 1)}</section>")
+        elif kind < 0.9:
+            out.append("<script>var a='x@y.de';</script>")
+        else:
+            out.append(f"<div>{_random_block(rng, depth + 1)}</div>")
+    return "".join(out)
+
+
+def fixture_pages(count: int, seed: int = 0) -> List[bytes]:
+    """Feste Fixtures plus `count` zufaellige Seiten (mit und ohne html/head/title)."""
+    pages = [page.encode("utf-8") for page in FIXTURES]
+    for idx in range(count):
+        rng = random.Random(seed + idx)
+        body = _random_block(rng)
+        kind = idx % 3
+        if kind == 0:
+            page = f"<html><head><title>{_random_text(rng, 3)}</title></head><body>{body}</body></html>"
+        elif kind == 1:
+            page = f"<title>T{idx}</title>{body}"
+        else:
+            page = body or "<p>x</p>"
+        pages.append(page.encode("utf-8"))
+    return pages
+
+
+def run_comparison(pages: Sequence[bytes], url: str = BASE_URL) -> List[Tuple[int, List[str]]]:
+    """Liefert (seitenindex, abweichende_felder) fuer jede abweichende Seite."""
+    mismatches: List[Tuple[int, List[str]]] = []
+    for idx, body in enumerate(pages):
+        fields = compare_page(body, url)
+        if fields:
+            mismatches.append((idx, fields))
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Single-Pass-Extraktor gegen die XPath-Referenz pruefen.")
+    parser.add_argument("--pages", type=int, default=3000, help="Anzahl zufaelliger Seiten (Standard 3000).")
+    parser.add_argument("--seed", type=int, default=0, help="Startwert fuer die Zufallsseiten.")
+    parser.add_argument("--from-store", action="store_true", help="Seiten aus dem PageStore statt Fixtures.")
+    args = parser.parse_args()
+    pages = stored_pages(args.pages) if args.from_store else fixture_pages(args.pages, args.seed)
+    mismatches = run_comparison(pages)
+    print(f"{len(pages)} Seiten geprueft, {len(mismatches)} mit Abweichungen.")
+    for idx, fields in mismatches[:10]:
+        print(f"  Seite {idx}: {', '.join(fields)}")
+    if mismatches:
+        sys.exit(1)
+
+
+__all__ = ["compare_page", "fixture_pages", "reference_extract", "run_comparison"]
+
+
+if __name__ == "__main__":
+    main()
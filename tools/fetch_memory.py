@@ -0,0 +1,206 @@
+"""
+Gedaechtnis fuer geratene Unterseiten pro Host.
+
+`build_related_urls` raet Pfade wie `/kontakt` oder `/impressum`; die meisten
+davon liefern 404. Das Gedaechtnis merkt sich pro Domain, welche Pfade fehlen
+(404/410) und welche funktioniert haben, und speichert das unter
+`data/staging/fetch_memory.json`. Fehlende Pfade werden bis zum Ablauf der TTL
+(`PIPELINE_FETCH_MEMORY_TTL_DAYS`, Standard 30 Tage) uebersprungen, bekannte
+Treffer zuerst geladen. URLs, deren Abruf anhand der Header abgebrochen wurde
+(kein HTML, zu gross), werden ebenfalls fuer die TTL uebersprungen. Zusaetzlich werden die aus `sitemap.xml` gewonnenen
+Kandidaten pro Domain fuer dieselbe TTL zwischengespeichert.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from tools.url_utils import domain_key
+
+FETCH_MEMORY_PATH = Path("data/staging/fetch_memory.json")
+DEFAULT_TTL_DAYS = 30.0
+MISSING_STATUSES = {404, 410}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _path_key(url: str) -> str:
+    return urlparse(url).path.rstrip("/").lower() or "/"
+
+
+def configured_ttl_days() -> float:
+    try:
+        return max(0.0, float(os.environ.get("PIPELINE_FETCH_MEMORY_TTL_DAYS", DEFAULT_TTL_DAYS)))
+    except ValueError:
+        return DEFAULT_TTL_DAYS
+
+
+class FetchMemory:
+    """Thread-sichere Zuordnung `{domain: {pfad: {"status": "ok"|"missing"|"skipped", "code", "at"}}}`."""
+
+    def __init__(self, path: Path = FETCH_MEMORY_PATH, *, ttl_days: Optional[float] = None) -> None:
+        self.path = path
+        self.ttl = timedelta(days=configured_ttl_days() if ttl_days is None else ttl_days)
+        self.hosts: Dict[str, Dict[str, Dict[str, object]]] = {}
+        self.sitemaps: Dict[str, Dict[str, object]] = {}
+        self.changed = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+        for host, paths in (payload.get("hosts") or {}).items():
+            if isinstance(paths, dict):
+                self.hosts[host] = {key: dict(entry) for key, entry in paths.items() if isinstance(entry, dict)}
+        for host, entry in (payload.get("sitemaps") or {}).items():
+            if isinstance(entry, dict):
+                self.sitemaps[host] = dict(entry)
+
+    def _prune_expired(self) -> None:
+        for host in list(self.hosts):
+            paths = self.hosts[host]
+            for key in [key for key, entry in paths.items() if self._expired(entry)]:
+                del paths[key]
+                self.changed = True
+            if not paths:
+                del self.hosts[host]
+        for host in [host for host, entry in self.sitemaps.items() if self._expired(entry)]:
+            del self.sitemaps[host]
+            self.changed = True
+
+    def save(self) -> Optional[Path]:
+        with self._lock:
+            self._prune_expired()
+            if not self.changed:
+                return None
+            payload = {
+                "updated_at": _now().isoformat(timespec="seconds"),
+                "hosts": self.hosts,
+                "sitemaps": self.sitemaps,
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+            tmp_path.replace(self.path)
+            self.changed = False
+            return self.path
+
+    def _expired(self, entry: Dict[str, object]) -> bool:
+        try:
+            recorded = datetime.fromisoformat(str(entry.get("at")))
+        except ValueError:
+            return True
+        return _now() - recorded > self.ttl
+
+    def _entry(self, url: str) -> Optional[Dict[str, object]]:
+        entry = self.hosts.get(domain_key(url), {}).get(_path_key(url))
+        if not entry or self._expired(entry):
+            return None
+        return entry
+
+    def _record(self, url: str, status: str, code: Optional[int], reason: str = "") -> None:
+        host = domain_key(url)
+        if not host:
+            return
+        with self._lock:
+            current = self._entry(url)
+            if current and current.get("status") == status:
+                return
+            self.hosts.setdefault(host, {})[_path_key(url)] = {
+                "status": status,
+                "code": code,
+                "path": urlparse(url).path or "/",
+                **({"reason": reason} if reason else {}),
+                "at": _now().isoformat(timespec="seconds"),
+            }
+            self.changed = True
+
+    def record_ok(self, url: str) -> None:
+        self._record(url, "ok", 200)
+
+    def record_missing(self, url: str, code: Optional[int]) -> None:
+        self._record(url, "missing", code)
+
+    def record_skipped(self, url: str, reason: str) -> None:
+        self._record(url, "skipped", None, reason)
+
+    def is_missing(self, url: str) -> bool:
+        with self._lock:
+            entry = self._entry(url)
+        return bool(entry) and entry.get("status") == "missing"
+
+    def is_skipped(self, url: str) -> bool:
+        with self._lock:
+            entry = self._entry(url)
+        return bool(entry) and entry.get("status") == "skipped"
+
+    def known_good(self, url: str) -> List[str]:
+        """Funktionierende Pfade der Domain als absolute URLs (juengste zuerst)."""
+        base = f"{urlparse(url).scheme or 'https'}://{urlparse(url).netloc}"
+        with self._lock:
+            paths = self.hosts.get(domain_key(url), {})
+            good = [
+                (str(entry.get("at")), str(entry.get("path") or key))
+                for key, entry in paths.items()
+                if entry.get("status") == "ok" and not self._expired(entry)
+            ]
+        return [urljoin(base, path) for _, path in sorted(good, reverse=True)]
+
+    def sitemap_urls(self, url: str) -> Optional[List[str]]:
+        """Zwischengespeicherte Sitemap-Kandidaten der Domain oder None (unbekannt/abgelaufen)."""
+        with self._lock:
+            entry = self.sitemaps.get(domain_key(url))
+            if not entry or self._expired(entry):
+                return None
+            return [str(item) for item in entry.get("urls") or []]
+
+    def remember_sitemap(self, url: str, urls: List[str]) -> None:
+        host = domain_key(url)
+        if not host:
+            return
+        with self._lock:
+            self.sitemaps[host] = {"urls": list(urls), "at": _now().isoformat(timespec="seconds")}
+            self.changed = True
+
+    def plan(self, url: str, guesses: Iterable[str], limit: int) -> List[str]:
+        """Bekannte Treffer zuerst, bekannte 404 raus, die Startseite selbst nie."""
+        own = _path_key(url)
+        planned: List[str] = []
+        seen: set[str] = {own}
+        for candidate in [*self.known_good(url), *guesses]:
+            key = _path_key(candidate)
+            if key in seen or self.is_missing(candidate) or self.is_skipped(candidate):
+                continue
+            seen.add(key)
+            planned.append(candidate)
+            if len(planned) >= limit:
+                break
+        return planned
+
+
+_MEMORY: Optional[FetchMemory] = None
+_MEMORY_LOCK = threading.Lock()
+
+
+def get_fetch_memory() -> FetchMemory:
+    global _MEMORY
+    with _MEMORY_LOCK:
+        if _MEMORY is None:
+            _MEMORY = FetchMemory()
+        return _MEMORY
+
+
+__all__ = ["FetchMemory", "MISSING_STATUSES", "get_fetch_memory"]
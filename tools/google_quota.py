@@ -0,0 +1,128 @@
+"""
+Tageskontingent der Google Custom Search API.
+
+Das Ledger zaehlt API-Aufrufe pro Kontingent-Tag (Reset um Mitternacht
+Pazifikzeit, wie bei Google) und pro API-Key (nur als Hash gespeichert) in
+`data/staging/google_quota.json`. Das Tageslimit kommt aus `GOOGLE_DAILY_QUOTA`
+(Standard: 100 freie Aufrufe).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    from zoneinfo import ZoneInfo
+
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+except Exception:  # pragma: no cover - fehlende tzdata
+    QUOTA_TIMEZONE = timezone.utc
+
+QUOTA_PATH = Path("data/staging/google_quota.json")
+DEFAULT_DAILY_QUOTA = 100
+QUOTA_RETENTION_DAYS = 7
+
+
+def quota_day(now: Optional[datetime] = None) -> str:
+    return (now or datetime.now(timezone.utc)).astimezone(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+
+def key_hash(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+def configured_daily_quota() -> int:
+    try:
+        return max(0, int(os.environ.get("GOOGLE_DAILY_QUOTA", DEFAULT_DAILY_QUOTA)))
+    except ValueError:
+        return DEFAULT_DAILY_QUOTA
+
+
+class QuotaLedger:
+    """Thread-sicheres Ledger `{tag: {key_hash: aufrufe}}`."""
+
+    def __init__(self, path: Path = QUOTA_PATH, *, daily_limit: Optional[int] = None) -> None:
+        self.path = path
+        self.daily_limit = configured_daily_quota() if daily_limit is None else daily_limit
+        self._lock = threading.Lock()
+        self._days: Dict[str, Dict[str, int]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=QUOTA_RETENTION_DAYS)).strftime("%Y-%m-%d")
+        for day, keys in (payload.get("days") or {}).items():
+            if day >= cutoff and isinstance(keys, dict):
+                self._days[day] = {key: int(value) for key, value in keys.items()}
+
+    def _save(self) -> None:
+        payload = {
+            "daily_limit": self.daily_limit,
+            "timezone": str(QUOTA_TIMEZONE),
+            "days": self._days,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def used(self, api_key: str) -> int:
+        with self._lock:
+            return self._days.get(quota_day(), {}).get(key_hash(api_key), 0)
+
+    def remaining(self, api_key: str) -> int:
+        return max(0, self.daily_limit - self.used(api_key))
+
+    def reserve(self, api_key: str, calls: int = 1) -> int:
+        """Bucht bis zu `calls` Aufrufe und liefert die tatsaechlich gebuchte Anzahl."""
+        with self._lock:
+            day = self._days.setdefault(quota_day(), {})
+            digest = key_hash(api_key)
+            granted = max(0, min(calls, self.daily_limit - day.get(digest, 0)))
+            if granted:
+                day[digest] = day.get(digest, 0) + granted
+                self._save()
+            return granted
+
+    def release(self, api_key: str, calls: int = 1) -> None:
+        """Gibt nicht ausgefuehrte Reservierungen zurueck."""
+        if calls <= 0:
+            return
+        with self._lock:
+            day = self._days.setdefault(quota_day(), {})
+            digest = key_hash(api_key)
+            day[digest] = max(0, day.get(digest, 0) - calls)
+            self._save()
+
+    def mark_exhausted(self, api_key: str) -> None:
+        """Google meldet das Tageslimit (dailyLimitExceeded/quotaExceeded): Rest des Tages sperren."""
+        with self._lock:
+            day = self._days.setdefault(quota_day(), {})
+            day[key_hash(api_key)] = max(day.get(key_hash(api_key), 0), self.daily_limit)
+            self._save()
+
+
+_LEDGER: Optional[QuotaLedger] = None
+_LEDGER_LOCK = threading.Lock()
+
+
+def get_quota_ledger() -> QuotaLedger:
+    global _LEDGER
+    with _LEDGER_LOCK:
+        if _LEDGER is None:
+            _LEDGER = QuotaLedger()
+        return _LEDGER
+
+
+__all__ = ["QuotaLedger", "configured_daily_quota", "get_quota_ledger", "quota_day"]
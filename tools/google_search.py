@@ -7,19 +7,22 @@ Ergebnisse werden strukturiert zurückgegeben und auf Wunsch im Dateisystem pers
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-import time
-from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
+import socket
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Iterator, List, Optional
-from urllib.error import HTTPError, URLError
+from typing import Any, Iterable, Iterator, List, Optional
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+
+from tools.google_quota import get_quota_ledger
+from tools.http_client import HttpClientError, get_client, run_sync
+from tools.query_dedupe import canonical_query
+from tools.rate_limiter import get_limiter
+from tools.search_cache import SEARCH_OUTPUT_DIR, get_search_cache, to_search_results
 
 
-SEARCH_OUTPUT_DIR = Path("data/staging/search")
 GOOGLE_SEARCH_ENDPOINT = "https://www.googleapis.com/customsearch/v1"
 MAX_RESULTS_PER_CALL = 10
 MAX_RESULTS_TOTAL = 100
@@ -29,6 +32,19 @@ class GoogleSearchError(RuntimeError):
     """Signalisiert Fehler bei der Kommunikation mit der Google-Suche."""
 
 
+class GoogleQuotaExceeded(GoogleSearchError):
+    """Tageskontingent der Custom Search API ist (laut Ledger oder Google) aufgebraucht."""
+
+
+class GoogleRateLimited(GoogleSearchError):
+    """Kurzfristige Drosselung (429/rateLimitExceeded); wird mit Backoff wiederholt."""
+
+
+# Nur diese Gruende sperren den Key fuer den Rest des Tages; 429/rateLimitExceeded sind Minuten-Limits.
+QUOTA_ERROR_MARKERS = ("dailyLimitExceeded", "quotaExceeded")
+RATE_LIMIT_MARKERS = ("rateLimitExceeded", "userRateLimitExceeded")
+
+
 @dataclass
 class GoogleSearchResult:
     query: str
@@ -42,22 +58,109 @@ def ensure_search_dir(path: Path = SEARCH_OUTPUT_DIR) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def _perform_request(params: dict[str, object]) -> dict:
+def _build_request_url(params: dict[str, object]) -> str:
     query_string = urlencode({k: v for k, v in params.items() if v is not None})
-    url = f"{GOOGLE_SEARCH_ENDPOINT}?{query_string}"
-    request = Request(url, headers={"User-Agent": "AgentenSystem/1.0"})
+    return f"{GOOGLE_SEARCH_ENDPOINT}?{query_string}"
+
+
+def _translate_error(exc: HttpClientError) -> GoogleSearchError:
+    if exc.status in {403, 429} and any(marker in exc.body_text for marker in QUOTA_ERROR_MARKERS):
+        return GoogleQuotaExceeded(f"Google API Kontingent erschöpft (HTTP {exc.status}): {exc.body_text}")
+    if exc.status == 429 or (exc.status == 403 and any(marker in exc.body_text for marker in RATE_LIMIT_MARKERS)):
+        return GoogleRateLimited(f"Google API drosselt (HTTP {exc.status}): {exc.body_text}")
+    if exc.status is not None:
+        return GoogleSearchError(f"Google API HTTP {exc.status}: {exc.body_text}")
+    return GoogleSearchError(f"Google API nicht erreichbar: {exc}")
+
+
+def _perform_request(params: dict[str, object]) -> dict:
+    get_limiter("google").acquire_sync()
+    try:
+        response = get_client().request(_build_request_url(params), timeout=20)
+    except HttpClientError as exc:  # pragma: no cover - Netzwerkfehler schwer testbar
+        raise _translate_error(exc) from exc
+    return json.loads(response.text())
+
+
+async def _perform_request_async(params: dict[str, object]) -> dict:
+    await get_limiter("google").acquire()
+    try:
+        response = await get_client().request_async(_build_request_url(params), timeout=20)
+    except HttpClientError as exc:  # pragma: no cover
+        raise _translate_error(exc) from exc
+    return json.loads(response.text())
+
+
+def _never_sent(exc: BaseException) -> bool:
+    """True, wenn der Abruf Google nachweislich nicht erreicht hat (DNS/Verbindung abgelehnt)."""
+    cause = exc.__cause__
+    if not isinstance(cause, HttpClientError) or cause.status is not None:
+        return False
+    return isinstance(cause.__cause__, (ConnectionRefusedError, socket.gaierror))
+
+
+def google_quota_remaining(api_key: Optional[str] = None) -> Optional[int]:
+    """Verbleibende Aufrufe laut Ledger fuer den (konfigurierten) API-Key."""
+    api_key = api_key or os.environ.get("GOOGLE_API_KEY")
+    if not api_key:
+        return None
+    return get_quota_ledger().remaining(api_key)
+
+
+def _parse_items(query: str, data: dict) -> List[GoogleSearchResult]:
+    if "error" in data:
+        message = data["error"].get("message", "Unbekannter Google-API-Fehler.")
+        raise GoogleSearchError(message)
+    return [
+        GoogleSearchResult(
+            query=query,
+            title=item.get("title", "").strip(),
+            url=item.get("link", "").strip(),
+            snippet=item.get("snippet", "").strip(),
+        )
+        for item in data.get("items") or []
+    ]
+
+
+def _total_results(data: dict) -> Optional[int]:
     try:
-        with urlopen(request, timeout=20) as response:
-            payload = response.read().decode("utf-8")
-    except HTTPError as exc:  # pragma: no cover - Netzwerkfehler schwer testbar
-        error_body = exc.read().decode("utf-8", errors="ignore")
-        raise GoogleSearchError(f"Google API HTTP {exc.code}: {error_body}") from exc
-    except URLError as exc:  # pragma: no cover
-        raise GoogleSearchError(f"Google API nicht erreichbar: {exc}") from exc
-    return json.loads(payload)
+        return int((data.get("searchInformation") or {}).get("totalResults"))
+    except (TypeError, ValueError):
+        return None
 
 
-def search_google(
+async def _fetch_page(
+    params: dict[str, object],
+    *,
+    api_key: str,
+    max_retries: int,
+    pause_seconds: float,
+) -> dict:
+    """Ein Seitenabruf inkl. Kontingent-Buchung und Retries mit Backoff."""
+    ledger = get_quota_ledger()
+    retry_delay = pause_seconds
+    while True:
+        if not ledger.reserve(api_key):
+            raise GoogleQuotaExceeded(
+                f"Google-Tageskontingent ({ledger.daily_limit} Aufrufe) laut Ledger aufgebraucht."
+            )
+        try:
+            return await _perform_request_async(params)
+        except GoogleQuotaExceeded:
+            ledger.mark_exhausted(api_key)
+            raise
+        except GoogleSearchError as exc:
+            if _never_sent(exc):
+                ledger.release(api_key)
+            if max_retries <= 0:
+                raise
+            print(f"Google-Suche fehlgeschlagen ({exc}); neuer Versuch in {retry_delay:.1f}s.")
+            await asyncio.sleep(retry_delay)
+            retry_delay *= 2
+            max_retries -= 1
+
+
+async def search_google_async(
     query: str,
     *,
     max_results: int = 6,
@@ -67,7 +170,11 @@ def search_google(
     pause_seconds: float = 1.0,
 ) -> List[GoogleSearchResult]:
     """
-    Führt eine Google-Suche über die Custom Search API aus.
+    Führt eine Google-Suche über die Custom Search API aus (async, gepoolte Verbindungen).
+
+    Die erste Seite liefert `totalResults`; die restlichen Seiten werden danach
+    parallel abgefragt (gedrosselt durch den Google-Token-Bucket). Jeder Aufruf
+    wird im Kontingent-Ledger gebucht.
     """
     api_key = api_key or os.environ.get("GOOGLE_API_KEY")
     search_engine_id = search_engine_id or os.environ.get("GOOGLE_SEARCH_ENGINE_ID")
@@ -78,18 +185,10 @@ def search_google(
         )
 
     ensure_search_dir()
-    results: List[GoogleSearchResult] = []
-    start_index = 1
-    retry_delay = pause_seconds
-
     max_results = max(1, min(max_results, MAX_RESULTS_TOTAL))
 
-    while len(results) < max_results:
-        print(
-            f"[GoogleSearch] Query '{query}' (Start {start_index}) – Ziel {max_results} Ergebnisse."
-        )
-        num = min(MAX_RESULTS_PER_CALL, max_results - len(results))
-        params = {
+    def page_params(start_index: int, num: int) -> dict[str, object]:
+        return {
             "key": api_key,
             "cx": search_engine_id,
             "q": query,
@@ -98,91 +197,86 @@ def search_google(
             "safe": "active",
             "lr": "lang_de",
         }
-        try:
-            data = _perform_request(params)
-        except GoogleSearchError as exc:
-            if max_retries <= 0:
-                raise
-            print(f"Google-Suche fehlgeschlagen ({exc}); neuer Versuch in {retry_delay:.1f}s.")
-            time.sleep(retry_delay)
-            retry_delay *= 2
-            max_retries -= 1
-            continue
 
-        if "error" in data:
-            message = data["error"].get("message", "Unbekannter Google-API-Fehler.")
-            raise GoogleSearchError(message)
-
-        items = data.get("items") or []
-        if not items:
-            break
-
-        for item in items:
-            results.append(
-                GoogleSearchResult(
-                    query=query,
-                    title=item.get("title", "").strip(),
-                    url=item.get("link", "").strip(),
-                    snippet=item.get("snippet", "").strip(),
+    print(f"[GoogleSearch] Query '{query}' – Ziel {max_results} Ergebnisse.")
+    first_num = min(MAX_RESULTS_PER_CALL, max_results)
+    first_page = await _fetch_page(
+        page_params(1, first_num),
+        api_key=api_key,
+        max_retries=max_retries,
+        pause_seconds=pause_seconds,
+    )
+    results = _parse_items(query, first_page)
+
+    limit = max_results
+    total = _total_results(first_page)
+    if total is not None:
+        limit = min(limit, total)
+    if len(results) >= first_num and limit > first_num:
+        starts = range(first_num + 1, limit + 1, MAX_RESULTS_PER_CALL)
+        pages = await asyncio.gather(
+            *(
+                _fetch_page(
+                    page_params(start, min(MAX_RESULTS_PER_CALL, limit - start + 1)),
+                    api_key=api_key,
+                    max_retries=max_retries,
+                    pause_seconds=pause_seconds,
                 )
-            )
-            if len(results) >= max_results:
-                break
-
-        if len(items) < num:
-            break
-
-        start_index += num
-        time.sleep(pause_seconds)
-
+                for start in starts
+            ),
+            return_exceptions=True,
+        )
+        for start, page in zip(starts, pages):
+            if isinstance(page, GoogleQuotaExceeded):
+                # Teilergebnis behalten, das Kontingent ist erst ab jetzt erschoepft.
+                continue
+            if isinstance(page, Exception):
+                # Bereits bezahlte Seiten nicht verwerfen; nur die erste Seite ist Pflicht.
+                print(f"[GoogleSearch] Seite ab {start} fuer '{query}' fehlgeschlagen: {page}")
+                continue
+            if isinstance(page, BaseException):
+                raise page
+            try:
+                results.extend(_parse_items(query, page))
+            except GoogleSearchError as exc:
+                print(f"[GoogleSearch] Seite ab {start} fuer '{query}' fehlerhaft: {exc}")
+
+    results = results[:max_results]
     print(f"[GoogleSearch] Query '{query}' lieferte {len(results)} Treffer.")
     return results
 
 
+def search_google(query: str, **kwargs: Any) -> List[GoogleSearchResult]:
+    """Synchroner Wrapper um `search_google_async` (gleiche Parameter)."""
+    return run_sync(search_google_async(query, **kwargs))
+
+
 def store_search_results(
     query: str, results: Iterable[GoogleSearchResult], *, directory: Path = SEARCH_OUTPUT_DIR
 ) -> Path:
-    ensure_search_dir(directory)
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    file_path = directory / f"{slugify(query)}_{timestamp}.json"
-    payload = {
-        "query": query,
-        "fetched_at": timestamp,
-        "results": [asdict(result) for result in results],
-    }
-    file_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    return file_path
+    return get_search_cache(directory).store(query, results, backend="google")
 
 
 def load_cached_results(
-    query: str, *, directory: Path = SEARCH_OUTPUT_DIR
+    query: str,
+    *,
+    directory: Path = SEARCH_OUTPUT_DIR,
+    fresh_only: bool = False,
 ) -> List[GoogleSearchResult]:
-    ensure_search_dir(directory)
-    slug = slugify(query)
-    files = sorted(directory.glob(f"{slug}_*.json"), reverse=True)
-    for file in files:
-        try:
-            payload = json.loads(file.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            continue
-        items = payload.get("results") or []
-        results: List[GoogleSearchResult] = []
-        for item in items:
-            url = item.get("url") or item.get("link") or ""
-            if not url:
-                continue
-            results.append(
-                GoogleSearchResult(
-                    query=item.get("query", query),
-                    title=item.get("title", "").strip(),
-                    url=url.strip(),
-                    snippet=item.get("snippet", "").strip(),
-                    source=item.get("source", "google"),
-                )
-            )
-        if results:
-            return results
-    return []
+    hit = get_search_cache(directory).lookup(query, "google", fresh_only=fresh_only)
+    if hit is None:
+        return []
+    _, items = hit
+    return [
+        GoogleSearchResult(
+            query=item.query,
+            title=item.title,
+            url=item.url,
+            snippet=item.snippet,
+            source=item.source,
+        )
+        for item in to_search_results(items, query=query, backend="google")
+    ]
 
 
 def slugify(value: str) -> str:
@@ -215,7 +309,7 @@ def iter_queries(queries: Iterable[str]) -> Iterator[str]:
         normalized = query.strip()
         if not normalized:
             continue
-        key = normalized.lower()
+        key = canonical_query(normalized)
         if key in seen:
             continue
         seen.add(key)
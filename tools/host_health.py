@@ -0,0 +1,232 @@
+"""
+Host-Gesundheit und Circuit-Breaker fuer Scraper, Directory-Parser und NorthData.
+
+Pro Host werden aufeinanderfolgende Fehler, eine geglaettete Latenz und der
+letzte Fehler gefuehrt und in `data/staging/host_health.json` gespeichert, damit
+der naechste Lauf unerreichbare Hosts gar nicht erst wieder anfragt.
+
+- geschlossen: Abrufe laufen normal.
+- offen: nach `PIPELINE_HOST_FAILURE_THRESHOLD` (Standard 3) Verbindungsfehlern,
+  Timeouts oder 5xx in Folge wird der Host fuer `PIPELINE_HOST_COOLDOWN_MINUTES`
+  (Standard 30) sofort uebersprungen.
+- halb offen: nach der Abkuehlzeit darf genau ein Probe-Abruf laufen; Erfolg
+  schliesst den Circuit, ein Fehler oeffnet ihn mit doppelter Abkuehlzeit
+  (hoechstens `MAX_COOLDOWN`).
+
+404, Nicht-HTML und andere Antworten des Servers zaehlen als erreichbar.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from tools.http_client import HttpClientError
+from tools.url_utils import domain_key
+
+HOST_HEALTH_PATH = Path("data/staging/host_health.json")
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN_MINUTES = 30.0
+MAX_COOLDOWN = timedelta(hours=24)
+# Gewicht eines neuen Messwerts in der geglaetteten Latenz.
+LATENCY_ALPHA = 0.3
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def is_host_failure(exc: HttpClientError) -> bool:
+    """Verbindungsfehler/Timeouts und 5xx sprechen gegen den Host, alles andere nicht."""
+    if exc.reason:
+        return False
+    return exc.status is None or exc.status >= 500
+
+
+class HostUnavailableError(RuntimeError):
+    """Circuit des Hosts ist offen; der Abruf wurde ohne Netzwerkzugriff abgelehnt."""
+
+    def __init__(self, host: str, retry_at: str, last_error: str = "") -> None:
+        detail = f", zuletzt: {last_error}" if last_error else ""
+        super().__init__(f"{host} vorübergehend übersprungen (Circuit offen bis {retry_at}{detail})")
+        self.host = host
+        self.retry_at = retry_at
+
+
+class HostHealth:
+    """Thread-sichere Zuordnung `{host: {"failures", "latency_ms", "last_error", "open_until", ...}}`."""
+
+    def __init__(
+        self,
+        path: Path = HOST_HEALTH_PATH,
+        *,
+        failure_threshold: Optional[int] = None,
+        cooldown_minutes: Optional[float] = None,
+    ) -> None:
+        self.path = path
+        if failure_threshold is None:
+            failure_threshold = int(_env_number("PIPELINE_HOST_FAILURE_THRESHOLD", DEFAULT_FAILURE_THRESHOLD))
+        self.failure_threshold = max(1, failure_threshold)
+        if cooldown_minutes is None:
+            cooldown_minutes = _env_number("PIPELINE_HOST_COOLDOWN_MINUTES", DEFAULT_COOLDOWN_MINUTES)
+        self.cooldown = timedelta(minutes=cooldown_minutes)
+        self.hosts: Dict[str, Dict[str, object]] = {}
+        self.probing: set[str] = set()
+        self.changed = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+        for host, entry in (payload.get("hosts") or {}).items():
+            if isinstance(entry, dict):
+                self.hosts[host] = dict(entry)
+
+    def save(self) -> Optional[Path]:
+        with self._lock:
+            if not self.changed:
+                return None
+            payload = {"updated_at": _now().isoformat(timespec="seconds"), "hosts": self.hosts}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+            tmp_path.replace(self.path)
+            self.changed = False
+            return self.path
+
+    @staticmethod
+    def _open_until(entry: Dict[str, object]) -> Optional[datetime]:
+        try:
+            return datetime.fromisoformat(str(entry.get("open_until")))
+        except ValueError:
+            return None
+
+    def state(self, url: str) -> str:
+        """`closed`, `open` oder `half_open` fuer den Host der URL."""
+        with self._lock:
+            entry = self.hosts.get(domain_key(url))
+            until = self._open_until(entry) if entry else None
+        if until is None:
+            return "closed"
+        return "open" if _now() < until else "half_open"
+
+    def acquire(self, url: str) -> bool:
+        """
+        True, wenn ein Abruf erlaubt ist. Im halb offenen Zustand bekommt nur der
+        erste Aufrufer den Probe-Slot, bis dessen Ergebnis gemeldet wurde.
+        """
+        host = domain_key(url)
+        with self._lock:
+            entry = self.hosts.get(host)
+            until = self._open_until(entry) if entry else None
+            if until is None:
+                return True
+            if _now() < until or host in self.probing:
+                return False
+            self.probing.add(host)
+            return True
+
+    def record_success(self, url: str, latency: float) -> None:
+        host = domain_key(url)
+        if not host:
+            return
+        with self._lock:
+            self.probing.discard(host)
+            entry = self.hosts.setdefault(host, {})
+            previous = entry.get("latency_ms")
+            latency_ms = latency * 1000
+            if isinstance(previous, (int, float)):
+                latency_ms = (1 - LATENCY_ALPHA) * previous + LATENCY_ALPHA * latency_ms
+            entry.update(
+                {
+                    "failures": 0,
+                    "latency_ms": round(latency_ms, 1),
+                    "last_ok": _now().isoformat(timespec="seconds"),
+                }
+            )
+            entry.pop("open_until", None)
+            entry.pop("cooldown_minutes", None)
+            self.changed = True
+
+    def record_failure(self, url: str, error: str) -> None:
+        host = domain_key(url)
+        if not host:
+            return
+        with self._lock:
+            probe = host in self.probing
+            self.probing.discard(host)
+            entry = self.hosts.setdefault(host, {})
+            failures = int(entry.get("failures") or 0) + 1
+            entry.update(
+                {
+                    "failures": failures,
+                    "last_error": error[:300],
+                    "last_failure": _now().isoformat(timespec="seconds"),
+                }
+            )
+            if probe or failures >= self.failure_threshold:
+                previous = float(entry.get("cooldown_minutes") or 0)
+                cooldown = min(timedelta(minutes=previous * 2), MAX_COOLDOWN) if probe and previous else self.cooldown
+                entry["cooldown_minutes"] = cooldown.total_seconds() / 60
+                entry["open_until"] = (_now() + cooldown).isoformat(timespec="seconds")
+            self.changed = True
+
+    @contextmanager
+    def guard(self, url: str) -> Iterator[None]:
+        """
+        Umschliesst einen Abruf: wirft `HostUnavailableError`, solange der Circuit
+        offen ist, und wertet `HttpClientError` bzw. Erfolg fuer den Host aus.
+        """
+        if not self.acquire(url):
+            host = domain_key(url)
+            with self._lock:
+                entry = dict(self.hosts.get(host) or {})
+            raise HostUnavailableError(host, str(entry.get("open_until", "")), str(entry.get("last_error", "")))
+        started = time.perf_counter()
+        try:
+            yield
+        except HttpClientError as exc:
+            if is_host_failure(exc):
+                self.record_failure(url, str(exc))
+            else:
+                self.record_success(url, time.perf_counter() - started)
+            raise
+        except BaseException:
+            # Abbruch/fremde Fehler: Probe-Slot freigeben, ohne den Host zu bewerten.
+            with self._lock:
+                self.probing.discard(domain_key(url))
+            raise
+        self.record_success(url, time.perf_counter() - started)
+
+
+_HEALTH: Optional[HostHealth] = None
+_HEALTH_LOCK = threading.Lock()
+
+
+def get_host_health() -> HostHealth:
+    global _HEALTH
+    with _HEALTH_LOCK:
+        if _HEALTH is None:
+            _HEALTH = HostHealth()
+        return _HEALTH
+
+
+__all__ = ["HostHealth", "HostUnavailableError", "get_host_health", "is_host_failure"]
@@ -0,0 +1,105 @@
+"""
+Zeichensatz-Erkennung und Byte-Parsing fuer abgerufene HTML-Seiten.
+
+Reihenfolge wie im HTML-Standard: BOM, `charset` aus dem HTTP-Header,
+`<meta charset>`/`http-equiv` bzw. XML-Deklaration in den ersten Bytes, sonst
+UTF-8, falls die Bytes gueltig sind, und Windows-1252 als Rueckfall (aeltere
+Vereinsseiten). lxml bekommt die Bytes samt erkannter Kodierung, jede Seite wird
+also genau einmal geparst.
+"""
+
+from __future__ import annotations
+
+import codecs
+import re
+from typing import Optional, Union
+
+from lxml import etree, html
+
+PRESCAN_BYTES = 2048
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+META_CHARSET_RE = re.compile(rb"<meta[^>]+?charset\s*=\s*[\"']?\s*([A-Za-z0-9_:.+-]+)", re.IGNORECASE)
+XML_ENCODING_RE = re.compile(rb"^\s*<\?xml[^>]*encoding\s*=\s*[\"']([A-Za-z0-9_.+-]+)", re.IGNORECASE)
+CONTENT_TYPE_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([A-Za-z0-9_:.+-]+)", re.IGNORECASE)
+# Wie Browser: Latin-1/ASCII-Angaben werden als Windows-1252 gelesen.
+CHARSET_ALIASES = {"latin-1": "cp1252", "iso8859-1": "cp1252", "ascii": "cp1252"}
+# Namen, unter denen libxml2/iconv die Python-Codecs kennt.
+LIBXML_NAMES = {
+    "utf-8": "UTF-8",
+    "cp1252": "windows-1252",
+    "utf-16-le": "UTF-16LE",
+    "utf-16-be": "UTF-16BE",
+}
+
+
+class HtmlDecodingError(ValueError):
+    """Seite ist leer oder fuer lxml nicht lesbar."""
+
+
+def normalize_charset(label: Optional[Union[str, bytes]]) -> Optional[str]:
+    """Python-Codec-Name fuer ein Charset-Label oder None, wenn unbekannt."""
+    if not label:
+        return None
+    if isinstance(label, bytes):
+        label = label.decode("ascii", errors="ignore")
+    try:
+        name = codecs.lookup(label.strip().strip("\"'")).name
+    except LookupError:
+        return None
+    return CHARSET_ALIASES.get(name, name)
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    match = CONTENT_TYPE_CHARSET_RE.search(content_type or "")
+    return normalize_charset(match.group(1)) if match else None
+
+
+def detect_charset(body: bytes, declared: Optional[str] = None) -> str:
+    """Erkennt die Kodierung: BOM > HTTP-Header > Meta/XML-Deklaration > UTF-8-Pruefung > Windows-1252."""
+    for bom, name in BOMS:
+        if body.startswith(bom):
+            return name
+    header = normalize_charset(declared)
+    if header:
+        return header
+    head = body[:PRESCAN_BYTES]
+    match = META_CHARSET_RE.search(head) or XML_ENCODING_RE.match(head)
+    meta = normalize_charset(match.group(1)) if match else None
+    if meta:
+        # Eine Meta-Angabe UTF-16 ohne BOM kann nicht stimmen (der Prescan war ASCII-lesbar).
+        return "utf-8" if meta.startswith("utf-16") else meta
+    try:
+        body.decode("utf-8")
+    except UnicodeDecodeError:
+        return "cp1252"
+    return "utf-8"
+
+
+def parse_html_bytes(body: bytes, charset: Optional[str] = None) -> html.HtmlElement:
+    """Parst Bytes mit der angegebenen (bzw. erkannten) Kodierung in einem Durchgang."""
+    encoding = normalize_charset(charset) or detect_charset(body)
+    if body.startswith(codecs.BOM_UTF8):
+        body = body[len(codecs.BOM_UTF8) :]
+    try:
+        try:
+            parser = html.HTMLParser(encoding=LIBXML_NAMES.get(encoding, encoding))
+            return html.fromstring(body, parser=parser)
+        except LookupError:
+            # libxml2 kennt den Codec nicht: in Python dekodieren, als UTF-8 parsen.
+            body = body.decode(encoding, errors="replace").encode("utf-8")
+            return html.fromstring(body, parser=html.HTMLParser(encoding="UTF-8"))
+    except (ValueError, etree.ParserError) as exc:
+        raise HtmlDecodingError(str(exc)) from exc
+
+
+__all__ = [
+    "HtmlDecodingError",
+    "charset_from_content_type",
+    "detect_charset",
+    "normalize_charset",
+    "parse_html_bytes",
+]
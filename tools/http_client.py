@@ -0,0 +1,400 @@
+"""
+Gemeinsamer HTTP-Client mit Connection-Pool pro Host.
+
+Alle Tools (Google, NorthData, Directory-Parser, Site-Scraper) teilen sich einen
+Client: Verbindungen werden per Keep-Alive wiederverwendet, die Zahl paralleler
+Requests ist pro Host und global begrenzt. Die async-API laeuft auf einem
+eigenen, begrenzten Executor statt auf dem Default-Executor von asyncio, die
+synchronen Aufrufe nutzen denselben Pool. Umgesetzt mit der Standardbibliothek
+(`http.client`), damit keine zusaetzliche Abhaengigkeit noetig ist.
+
+Antworten werden komprimiert angefordert (gzip/deflate, brotli falls das Paket
+`brotli` ab 1.1 mit begrenzter Ausgabe installiert ist) und beim Lesen gestreamt
+entpackt; `max_bytes` gilt fuer die entpackten Daten. Mit `accept_types` bricht der Client anhand der
+Header ab, bevor der Body gelesen wird (falscher Content-Type oder
+`Content-Length` ueber `max_bytes`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import http.client
+import json
+import socket
+import ssl
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict, Iterable, List, Mapping, Optional, Tuple, TypeVar
+from urllib.parse import urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optionale Abhaengigkeit
+    brotli = None
+
+DEFAULT_USER_AGENT = "AgentenSystem/1.0"
+DEFAULT_TIMEOUT = 15.0
+MAX_CONNECTIONS_PER_HOST = 4
+MAX_IN_FLIGHT = 16
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Aeltere brotli-Versionen entpacken jeden Chunk vollstaendig; dann kein `br` anbieten (Kompressionsbomben).
+BROTLI_STREAMING = brotli is not None and hasattr(brotli.Decompressor, "can_accept_more_data")
+ACCEPT_ENCODING = "gzip, deflate, br" if BROTLI_STREAMING else "gzip, deflate"
+READ_CHUNK_BYTES = 64 * 1024
+
+T = TypeVar("T")
+
+
+class HttpClientError(RuntimeError):
+    """
+    Fehler beim HTTP-Abruf; `status` ist bei HTTP-Fehlern gesetzt, sonst None.
+    `reason` ist `content_type` oder `too_large`, wenn der Abruf anhand der
+    Header abgebrochen wurde.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        url: str = "",
+        status: Optional[int] = None,
+        body: bytes = b"",
+        reason: str = "",
+    ) -> None:
+        super().__init__(message)
+        self.url = url
+        self.status = status
+        self.body = body
+        self.reason = reason
+
+    @property
+    def body_text(self) -> str:
+        return self.body.decode("utf-8", errors="ignore")
+
+
+@dataclass
+class HttpResponse:
+    url: str
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="ignore")
+
+    def json(self) -> Any:
+        return json.loads(self.text())
+
+
+_SSL_CONTEXT = ssl.create_default_context()
+
+
+def _rejection(headers: Mapping[str, str], accept_types: Optional[Iterable[str]], max_bytes: Optional[int]) -> str:
+    """Prueft die Header vor dem Lesen des Bodys; liefert den Abbruchgrund oder ''."""
+    if accept_types is not None:
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in accept_types:
+            return "content_type"
+    if max_bytes:
+        try:
+            declared = int(headers.get("content-length", "") or 0)
+        except ValueError:
+            declared = 0
+        if declared > max_bytes:
+            return "too_large"
+    return ""
+
+
+class _Decoder:
+    """Streaming-Entpacker fuer Content-Encoding mit Obergrenze fuer die Ausgabe."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        self._zlib: Optional[Any] = None
+        self._brotli: Optional[Any] = None
+        if encoding in {"gzip", "x-gzip"}:
+            self._zlib = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "br" and BROTLI_STREAMING:
+            self._brotli = brotli.Decompressor()
+
+    def decompress(self, chunk: bytes, limit: int) -> bytes:
+        if self.encoding == "deflate" and self._zlib is None:
+            # "deflate" kommt mal mit zlib-Header, mal als rohes Deflate.
+            raw = not chunk or (chunk[0] & 0x0F) != 8
+            self._zlib = zlib.decompressobj(-zlib.MAX_WBITS if raw else zlib.MAX_WBITS)
+        if self._zlib is not None:
+            out = bytearray()
+            data = chunk
+            while data and len(out) < limit:
+                out += self._zlib.decompress(data, limit - len(out))
+                data = self._zlib.unconsumed_tail
+            return bytes(out)
+        if self._brotli is not None:
+            out = bytearray(self._brotli.process(chunk, output_buffer_limit=limit))
+            # Restausgabe aus dem internen Puffer holen, ohne das Limit zu ueberschreiten.
+            while len(out) < limit and not self._brotli.can_accept_more_data():
+                piece = self._brotli.process(b"", output_buffer_limit=limit - len(out))
+                if not piece:
+                    break
+                out += piece
+            return bytes(out)
+        return chunk[:limit]
+
+
+def _read_body(response: http.client.HTTPResponse, encoding: str, max_bytes: Optional[int]) -> bytes:
+    encoding = encoding.strip().lower()
+    if encoding in {"", "identity"}:
+        return response.read(max_bytes) if max_bytes else response.read()
+    if encoding == "br" and not BROTLI_STREAMING:
+        raise zlib.error("brotli (>= 1.1) nicht installiert")
+    decoder = _Decoder(encoding)
+    limit = max_bytes or float("inf")
+    body = bytearray()
+    while len(body) < limit:
+        chunk = response.read(READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        body += decoder.decompress(chunk, int(min(limit - len(body), 2**31 - 1)))
+    return bytes(body)
+
+
+def _proxy_for(scheme: str, host: str) -> Optional[Tuple[str, int]]:
+    proxy = getproxies().get(scheme)
+    if not proxy or proxy_bypass(host):
+        return None
+    parsed = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    if not parsed.hostname:
+        return None
+    return parsed.hostname, parsed.port or 8080
+
+
+class _HostPool:
+    """Keep-Alive-Verbindungen zu einem (scheme, host, port)."""
+
+    def __init__(self, scheme: str, host: str, port: int, size: int) -> None:
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.proxy = _proxy_for(scheme, host)
+        self._slots = threading.BoundedSemaphore(max(1, size))
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self, timeout: float) -> http.client.HTTPConnection:
+        if self.scheme == "https":
+            if self.proxy:
+                conn = http.client.HTTPSConnection(*self.proxy, timeout=timeout, context=_SSL_CONTEXT)
+                conn.set_tunnel(self.host, self.port)
+                return conn
+            return http.client.HTTPSConnection(self.host, self.port, timeout=timeout, context=_SSL_CONTEXT)
+        if self.proxy:
+            return http.client.HTTPConnection(*self.proxy, timeout=timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def request_target(self, path: str) -> str:
+        if self.proxy and self.scheme == "http":
+            return f"http://{self.host}:{self.port}{path}"
+        return path
+
+    def acquire(self, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        self._slots.acquire()
+        with self._lock:
+            while self._idle:
+                conn = self._idle.pop()
+                if conn.sock is not None:
+                    conn.timeout = timeout
+                    conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+        return self._connect(timeout), False
+
+    def release(self, conn: http.client.HTTPConnection, *, reusable: bool) -> None:
+        try:
+            if reusable and conn.sock is not None:
+                with self._lock:
+                    self._idle.append(conn)
+            else:
+                conn.close()
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class HttpClient:
+    """Thread-safe HTTP/1.1-Client mit Pools pro Host und globalem In-Flight-Limit."""
+
+    def __init__(
+        self,
+        *,
+        user_agent: str = DEFAULT_USER_AGENT,
+        max_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        max_in_flight: int = MAX_IN_FLIGHT,
+    ) -> None:
+        self.user_agent = user_agent
+        self.max_per_host = max_per_host
+        self.max_in_flight = max(1, max_in_flight)
+        self._pools: Dict[Tuple[str, str, int], _HostPool] = {}
+        self._pools_lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="http")
+
+    def _pool_for(self, scheme: str, host: str, port: int) -> _HostPool:
+        key = (scheme, host, port)
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = _HostPool(scheme, host, port, self.max_per_host)
+                self._pools[key] = pool
+            return pool
+
+    def _send_once(
+        self,
+        url: str,
+        method: str,
+        headers: Mapping[str, str],
+        timeout: float,
+        max_bytes: Optional[int],
+        accept_types: Optional[Iterable[str]] = None,
+    ) -> HttpResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in {"http", "https"} or not parts.hostname:
+            raise HttpClientError(f"Nicht unterstuetzte URL: {url}", url=url)
+        port = parts.port or (443 if scheme == "https" else 80)
+        pool = self._pool_for(scheme, parts.hostname.lower(), port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        target = pool.request_target(path)
+
+        for attempt in range(2):
+            conn, reused = pool.acquire(timeout)
+            reusable = False
+            try:
+                conn.request(method, target, headers=dict(headers))
+                response = conn.getresponse()
+                response_headers = {key.lower(): value for key, value in response.getheaders()}
+                reason = _rejection(response_headers, accept_types, max_bytes) if response.status < 300 else ""
+                if reason:
+                    # Body nicht lesen; die Verbindung wird verworfen statt wiederverwendet.
+                    raise HttpClientError(
+                        f"Abruf von {url} abgebrochen ({reason}: "
+                        f"{response_headers.get('content-type') or response_headers.get('content-length')})",
+                        url=url,
+                        status=response.status,
+                        reason=reason,
+                    )
+                body = _read_body(response, response_headers.pop("content-encoding", ""), max_bytes)
+                reusable = response.isclosed() and not response.will_close
+                return HttpResponse(url=url, status=response.status, headers=response_headers, body=body)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as exc:
+                # Vom Server geschlossene Keep-Alive-Verbindung: einmal frisch verbinden.
+                if reused and attempt == 0:
+                    continue
+                raise HttpClientError(f"{url} nicht erreichbar ({exc})", url=url) from exc
+            except (OSError, socket.timeout, http.client.HTTPException) as exc:
+                raise HttpClientError(f"{url} nicht erreichbar ({exc})", url=url) from exc
+            except zlib.error as exc:
+                raise HttpClientError(f"Ungueltige Kompression von {url} ({exc})", url=url) from exc
+            finally:
+                pool.release(conn, reusable=reusable)
+        raise HttpClientError(f"{url} nicht erreichbar", url=url)  # pragma: no cover
+
+    def request(
+        self,
+        url: str,
+        *,
+        method: str = "GET",
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_bytes: Optional[int] = None,
+        raise_for_status: bool = True,
+        accept_types: Optional[Iterable[str]] = None,
+    ) -> HttpResponse:
+        """
+        `accept_types`: erlaubte Content-Types (ohne Parameter, klein); andere
+        Antworten und solche mit `Content-Length` > `max_bytes` werden vor dem
+        Lesen des Bodys mit `HttpClientError(reason=...)` abgebrochen.
+        """
+        accept_types = {item.lower() for item in accept_types} if accept_types is not None else None
+        merged = {"User-Agent": self.user_agent, "Accept": "*/*", "Accept-Encoding": ACCEPT_ENCODING}
+        merged.update(headers or {})
+        current = url
+        with self._in_flight:
+            for _ in range(MAX_REDIRECTS + 1):
+                response = self._send_once(current, method, merged, timeout, max_bytes, accept_types)
+                location = response.headers.get("location")
+                if response.status in REDIRECT_STATUSES and location:
+                    current = urljoin(current, location)
+                    if response.status == 303:
+                        method = "GET"
+                    continue
+                break
+            else:
+                raise HttpClientError(f"Zu viele Redirects für {url}", url=url)
+        response.url = current
+        if raise_for_status and response.status >= 400:
+            raise HttpClientError(
+                f"HTTP {response.status} für {current}",
+                url=current,
+                status=response.status,
+                body=response.body,
+            )
+        return response
+
+    async def request_async(self, url: str, **kwargs: Any) -> HttpResponse:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(self.request, url, **kwargs))
+
+    def close(self) -> None:
+        with self._pools_lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.close()
+
+
+_CLIENT: Optional[HttpClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Prozessweit geteilter Client (lazy erzeugt)."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = HttpClient()
+        return _CLIENT
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """
+    Fuehrt eine Coroutine synchron aus (fuer die sync-Wrapper der Tools).
+
+    Laeuft im aktuellen Thread bereits ein Event-Loop, wird ein Hilfsthread genutzt.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(awaitable)  # type: ignore[arg-type]
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, awaitable).result()  # type: ignore[arg-type]
+
+
+__all__ = [
+    "HttpClient",
+    "HttpClientError",
+    "HttpResponse",
+    "get_client",
+    "run_sync",
+]
@@ -0,0 +1,74 @@
+"""
+Kompilierter Mehrfach-Keyword-Matcher fuer die Heuristik-Listen.
+
+Statt `any(keyword in text for keyword in LISTE)` pro Liste und Aufruf wird jede
+Liste einmal zu einer Regex-Alternation kompiliert (laengste Begriffe zuerst).
+`search` prueft dann mit einem Durchlauf, ob irgendein Begriff vorkommt;
+`hits` liefert alle vorkommenden Begriffe, ebenfalls in einem Durchlauf (die
+Suche springt von Treffer zu Treffer, vorberechnete Praefix-Mengen ergaenzen
+kuerzere Begriffe an derselben Position, z. B. `maker` in `makerspaces`).
+Kurze Listen mit fruehem Abbruch (z. B. `LOCATION_CUES` im Scraper) bleiben
+Schleifen; dort ist `in` auf dem Text schneller (siehe workflows/keyword_benchmark).
+
+`word_start=True` verlangt, dass ein Begriff am Wortanfang beginnt (`essen`
+passt dann auf "Essener", aber nicht auf "Interessen"); Komposita wie
+"Nordbayern" muessen dann als eigene Begriffe in der Liste stehen. Sonst gilt
+dieselbe Teilstring-Semantik wie bei `keyword in text.lower()`.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+
+class KeywordMatcher:
+    def __init__(self, terms: Iterable[str], *, word_start: bool = False) -> None:
+        ordered: List[str] = []
+        for term in terms:
+            folded = (term or "").lower()
+            if folded.strip() and folded not in ordered:
+                ordered.append(folded)
+        self.terms: Tuple[str, ...] = tuple(ordered)
+        self.word_start = word_start
+        # Kuerzere Begriffe, die Praefix eines Treffers sind, beginnen an derselben Position.
+        self._prefixes: Dict[str, FrozenSet[str]] = {
+            term: frozenset(other for other in self.terms if term.startswith(other)) for term in self.terms
+        }
+        alternation = "|".join(re.escape(term) for term in sorted(self.terms, key=len, reverse=True))
+        boundary = r"(?<!\w)" if word_start else ""
+        self._pattern = re.compile(f"{boundary}(?:{alternation})") if self.terms else None
+
+    def search(self, text: str) -> bool:
+        """True, wenn mindestens ein Begriff vorkommt."""
+        return bool(self._pattern and text and self._pattern.search(text.lower()))
+
+    def hits(self, text: str) -> Set[str]:
+        """Alle vorkommenden Begriffe (kleingeschrieben), auch ueberlappende."""
+        found: Set[str] = set()
+        if not self._pattern or not text:
+            return found
+        lowered = text.lower()
+        search = self._pattern.search
+        match = search(lowered)
+        while match:
+            found |= self._prefixes[match.group()]
+            match = search(lowered, match.start() + 1)
+        return found
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+
+@lru_cache(maxsize=64)
+def _cached_matcher(terms: Tuple[str, ...], word_start: bool) -> KeywordMatcher:
+    return KeywordMatcher(terms, word_start=word_start)
+
+
+def keyword_matcher(terms: Iterable[str], *, word_start: bool = False) -> KeywordMatcher:
+    """Matcher fuer eine Begriffsliste; gleiche Listen (z. B. pro Brief/Region) werden nur einmal kompiliert."""
+    return _cached_matcher(tuple(terms), word_start)
+
+
+__all__ = ["KeywordMatcher", "keyword_matcher"]
@@ -9,17 +9,22 @@ Standard-Bibliotheken, um zusätzliche Abhängigkeiten zu vermeiden.
 from __future__ import annotations
 
 import json
-import urllib.error
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable, List, Optional
 
+from tools.host_health import HostUnavailableError, get_host_health
+from tools.http_client import HttpClientError, get_client
+from tools.single_flight import SingleFlight
+
 
 NORTHDATA_BASE_URL = "https://www.northdata.de"
 ENRICHMENT_DIR = Path("data/staging/enrichment")
+DEFAULT_USER_AGENT = "Agentensystem/0.1 (+https://fablab-luebeck.de)"
+# Gleichzeitige Lookups derselben Query teilen sich einen Request.
+_FLIGHTS = SingleFlight()
 
 
 @dataclass
@@ -45,12 +50,33 @@ def _build_suggest_url(query: str, countries: Optional[str] = None) -> str:
     return f"{NORTHDATA_BASE_URL}/suggest.json?{encoded}"
 
 
+def _parse_suggestions(payload: str, query: str) -> List[NorthDataSuggestion]:
+    try:
+        data = json.loads(payload)
+    except json.JSONDecodeError as exc:
+        raise NorthDataError("Antwort von NorthData konnte nicht geparst werden.") from exc
+
+    results = data.get("results", [])
+    suggestions: List[NorthDataSuggestion] = []
+    for item in results:
+        suggestions.append(
+            NorthDataSuggestion(
+                title=item.get("title") or item.get("name") or query,
+                name=item.get("name") or item.get("title") or query,
+                description=item.get("description"),
+                url=item.get("url", ""),
+                type=item.get("type"),
+            )
+        )
+    return suggestions
+
+
 def fetch_suggestions(
     query: str,
     *,
     countries: Optional[str] = None,
     timeout: float = 10.0,
-    user_agent: str = "Agentensystem/0.1 (+https://fablab-luebeck.de)",
+    user_agent: str = DEFAULT_USER_AGENT,
 ) -> List[NorthDataSuggestion]:
     """
     Ruft NorthData-Suggest-API auf und liefert gefundene Vorschläge zurück.
@@ -62,32 +88,40 @@ def fetch_suggestions(
         user_agent: User-Agent-Header zur höflichen Kennzeichnung.
     """
     url = _build_suggest_url(query, countries)
-    request = urllib.request.Request(url, headers={"User-Agent": user_agent})
-
     try:
-        with urllib.request.urlopen(request, timeout=timeout) as response:
-            payload = response.read().decode("utf-8")
-    except urllib.error.URLError as exc:  # pragma: no cover - Netzwerkteil
+        with get_host_health().guard(url):
+            response = get_client().request(url, headers={"User-Agent": user_agent}, timeout=timeout)
+    except HostUnavailableError as exc:
+        raise NorthDataError(str(exc)) from exc
+    except HttpClientError as exc:  # pragma: no cover - Netzwerkteil
         raise NorthDataError(f"NorthData-Suggest nicht erreichbar: {exc}") from exc
+    return _parse_suggestions(response.text(), query)
 
-    try:
-        data = json.loads(payload)
-    except json.JSONDecodeError as exc:
-        raise NorthDataError("Antwort von NorthData konnte nicht geparst werden.") from exc
 
-    results = data.get("results", [])
-    suggestions: List[NorthDataSuggestion] = []
-    for item in results:
-        suggestions.append(
-            NorthDataSuggestion(
-                title=item.get("title") or item.get("name") or query,
-                name=item.get("name") or item.get("title") or query,
-                description=item.get("description"),
-                url=item.get("url", ""),
-                type=item.get("type"),
-            )
-        )
-    return suggestions
+async def fetch_suggestions_async(
+    query: str,
+    *,
+    countries: Optional[str] = None,
+    timeout: float = 10.0,
+    user_agent: str = DEFAULT_USER_AGENT,
+) -> List[NorthDataSuggestion]:
+    """
+    Async-Variante von `fetch_suggestions` über den gemeinsamen Verbindungspool;
+    parallele Aufrufe mit derselben Query teilen sich einen Request.
+    """
+    url = _build_suggest_url(query, countries)
+
+    async def lookup() -> List[NorthDataSuggestion]:
+        try:
+            with get_host_health().guard(url):
+                response = await get_client().request_async(url, headers={"User-Agent": user_agent}, timeout=timeout)
+        except HostUnavailableError as exc:
+            raise NorthDataError(str(exc)) from exc
+        except HttpClientError as exc:  # pragma: no cover - Netzwerkteil
+            raise NorthDataError(f"NorthData-Suggest nicht erreichbar: {exc}") from exc
+        return _parse_suggestions(response.text(), query)
+
+    return list(await _FLIGHTS.run(url, lookup))
 
 
 def slugify(value: str, max_length: int = 120) -> str:
@@ -0,0 +1,81 @@
+"""
+Inhaltsadressierter Rohseiten-Speicher fuer den Site-Scraper.
+
+Jede abgerufene Seite wird gzip-komprimiert unter
+`data/staging/pages/<aa>/<sha256>.html.gz` abgelegt; identische Inhalte (z. B.
+dasselbe Impressum unter mehreren URLs) landen nur einmal auf der Platte. Der
+Snapshot verweist ueber `content_hash` auf die Datei, damit verbesserte
+Extraktoren ohne erneutes Crawlen auf den Bestand angewendet werden koennen.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+PAGE_STORE_DIR = Path("data/staging/pages")
+PAGE_SUFFIX = ".html.gz"
+COMPRESS_LEVEL = 6
+# Juengere Dateien bleiben: ein paralleler Lauf kann die Seite schon abgelegt, den Snapshot aber noch nicht geschrieben haben.
+PRUNE_MIN_AGE_SECONDS = 3600
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class PageStore:
+    def __init__(self, directory: Path = PAGE_STORE_DIR) -> None:
+        self.directory = directory
+
+    def path_for(self, digest: str) -> Path:
+        return self.directory / digest[:2] / f"{digest}{PAGE_SUFFIX}"
+
+    def put(self, body: bytes) -> str:
+        """Speichert den Inhalt (falls neu) und liefert den SHA-256-Hash."""
+        digest = content_hash(body)
+        path = self.path_for(digest)
+        if path.exists():
+            return digest
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Eindeutiger Temp-Name, damit parallele Schreiber sich nicht ueberholen.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{id(body)}.tmp")
+        tmp_path.write_bytes(gzip.compress(body, compresslevel=COMPRESS_LEVEL))
+        tmp_path.replace(path)
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        if not digest:
+            return None
+        path = self.path_for(digest)
+        try:
+            return gzip.decompress(path.read_bytes())
+        except (OSError, EOFError):
+            return None
+
+    def __contains__(self, digest: str) -> bool:
+        return bool(digest) and self.path_for(digest).exists()
+
+    def prune(self, referenced: Iterable[str], *, min_age_seconds: float = PRUNE_MIN_AGE_SECONDS) -> int:
+        """Entfernt Seiten, auf die kein Snapshot mehr verweist (und die aelter als `min_age_seconds` sind)."""
+        keep = set(referenced)
+        cutoff = time.time() - min_age_seconds
+        removed = 0
+        for path in self.directory.glob(f"*/*{PAGE_SUFFIX}"):
+            if path.name[: -len(PAGE_SUFFIX)] in keep:
+                continue
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+            except OSError:
+                continue
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+__all__ = ["PageStore", "content_hash"]
@@ -0,0 +1,142 @@
+"""
+Benchmark der Parse-Stufe: Threads gegen Prozesspool.
+
+Simuliert `candidate_concurrency` parallele Kandidaten-Tasks: jeder "Abruf"
+wartet die angegebene Netzlatenz ab und gibt die Roh-Bytes dann an die
+Parse-Stufe (`tools/parse_pool.run_parse` mit `_parse_snapshot`). Gemessen werden
+Seiten pro Sekunde und die maximale Verzoegerung des Event-Loops.
+
+    python -m tools.parse_benchmark --pages 200 --workers 4
+    python -m tools.parse_benchmark --from-store   # Seiten aus data/staging/pages/
+
+Ohne `--from-store` werden synthetische Vereinsseiten (`--page-kb`) erzeugt.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import os
+import random
+import time
+from typing import List, Sequence, Tuple
+
+from tools.page_store import PAGE_STORE_DIR, PAGE_SUFFIX
+from tools.parse_pool import run_parse, shutdown_parse_pool
+from tools.site_scraper import _parse_snapshot
+
+DEFAULT_CONCURRENCY = (4, 16, 64)
+LAG_TICK = 0.005
+WORDS = "verein werkstatt mitglieder kontakt vorstand projekte lasercutter offene treffen lübeck kiel".split()
+
+
+def synthetic_pages(count: int, page_kb: int, seed: int = 1) -> List[bytes]:
+    rng = random.Random(seed)
+    pages: List[bytes] = []
+    for idx in range(count):
+        blocks: List[str] = []
+        size = 0
+        while size < page_kb * 1024:
+            text = " ".join(rng.choice(WORDS) for _ in range(60))
+            links = "".join(f'<li><a href="/seite-{rng.randint(1, 500)}">{rng.choice(WORDS)}</a></li>' for _ in range(8))
+            block = f"<div class='c'><h2>{rng.choice(WORDS)}</h2><p>{text}</p><ul>{links}</ul></div>"
+            blocks.append(block)
+            size += len(block)
+        html = (
+            f"<html><head><title>Verein {idx}</title></head><body>{''.join(blocks)}"
+            f"<p>Kontakt: Vorstand <a href='mailto:vorstand{idx}@verein.de'>vorstand{idx}@verein.de</a></p></body></html>"
+        )
+        pages.append(html.encode("utf-8"))
+    return pages
+
+
+def stored_pages(limit: int) -> List[bytes]:
+    pages: List[bytes] = []
+    for path in sorted(PAGE_STORE_DIR.glob(f"*/*{PAGE_SUFFIX}"))[:limit]:
+        try:
+            pages.append(gzip.decompress(path.read_bytes()))
+        except (OSError, EOFError):
+            continue
+    return pages
+
+
+async def _loop_lag(stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_TICK)
+        worst = max(worst, time.perf_counter() - started - LAG_TICK)
+    return worst
+
+
+async def _run(pages: Sequence[bytes], concurrency: int, latency_ms: float) -> Tuple[float, float]:
+    gate = asyncio.Semaphore(concurrency)
+
+    async def candidate(idx: int, body: bytes) -> None:
+        async with gate:
+            await asyncio.sleep(latency_ms / 1000)
+            await run_parse(_parse_snapshot, f"https://verein{idx}.de/", body, "utf-8")
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(candidate(idx, body) for idx, body in enumerate(pages)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return len(pages) / elapsed, await lag_task
+
+
+def run_benchmark(
+    pages: Sequence[bytes], *, workers: int, concurrency: Sequence[int] = DEFAULT_CONCURRENCY, latency_ms: float = 50.0
+) -> List[Tuple[int, str, float, float]]:
+    """Liefert (concurrency, modus, seiten_pro_s, max_loop_lag_ms) fuer Threads und Prozesspool."""
+    rows: List[Tuple[int, str, float, float]] = []
+    previous = os.environ.get("PIPELINE_PARSE_WORKERS")
+    try:
+        for mode, parse_workers in (("threads", 0), (f"prozesse({workers})", workers)):
+            os.environ["PIPELINE_PARSE_WORKERS"] = str(parse_workers)
+            if parse_workers:
+                # Pool vorwaermen, damit der Prozessstart nicht in die Messung faellt.
+                asyncio.run(_run(pages[: parse_workers * 2], parse_workers * 2, 0.0))
+            for level in concurrency:
+                rate, lag = asyncio.run(_run(pages, level, latency_ms))
+                rows.append((level, mode, rate, lag * 1000))
+            shutdown_parse_pool()
+    finally:
+        if previous is None:
+            os.environ.pop("PIPELINE_PARSE_WORKERS", None)
+        else:
+            os.environ["PIPELINE_PARSE_WORKERS"] = previous
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Durchsatz der Parse-Stufe: Threads vs. Prozesspool.")
+    parser.add_argument("--pages", type=int, default=200, help="Anzahl Seiten (Standard 200).")
+    parser.add_argument("--page-kb", type=int, default=300, help="Groesse synthetischer Seiten in KB.")
+    parser.add_argument("--from-store", action="store_true", help="Seiten aus dem PageStore statt synthetisch.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Prozesse im Pool.")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulierte Netzlatenz pro Abruf.")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=list(DEFAULT_CONCURRENCY), help="candidate_concurrency-Stufen."
+    )
+    args = parser.parse_args()
+    pages = stored_pages(args.pages) if args.from_store else synthetic_pages(args.pages, args.page_kb)
+    if not pages:
+        print("Keine Seiten gefunden.")
+        return
+    total_mb = sum(len(page) for page in pages) / 1_000_000
+    print(f"{len(pages)} Seiten ({total_mb:.1f} MB), Latenz {args.latency_ms:.0f} ms, CPU-Kerne: {os.cpu_count()}")
+    print(f"{'concurrency':>11}  {'modus':<14} {'seiten/s':>9} {'max. loop-lag ms':>17}")
+    for level, mode, rate, lag_ms in run_benchmark(
+        pages, workers=max(1, args.workers), concurrency=args.concurrency, latency_ms=args.latency_ms
+    ):
+        print(f"{level:>11}  {mode:<14} {rate:>9.1f} {lag_ms:>17.1f}")
+
+
+__all__ = ["run_benchmark", "stored_pages", "synthetic_pages"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Parse-Stufe fuer abgerufenes HTML: Threads oder Prozesspool.
+
+lxml-Parsing und Extraktion halten bei grossen Seiten lange das GIL und
+konkurrieren dann mit dem Event-Loop. Mit `PIPELINE_PARSE_WORKERS=N` (N > 0)
+laufen Parser in einem Pool aus N Prozessen: der Fetcher uebergibt die Roh-Bytes,
+die Worker liefern kompakte Dataclasses (`SiteSnapshot`, `DirectoryEntry`)
+zurueck. Mit 0 (Standard) bleibt es bei `asyncio.to_thread`.
+
+Die Funktionen muessen auf Modulebene definiert und ihre Argumente picklebar
+sein.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import functools
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def configured_parse_workers() -> int:
+    try:
+        return max(0, int(os.environ.get("PIPELINE_PARSE_WORKERS", 0)))
+    except ValueError:
+        return 0
+
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+
+def get_parse_pool(workers: Optional[int] = None) -> Optional[ProcessPoolExecutor]:
+    """Gemeinsamer Prozesspool oder None, wenn die Parse-Stufe in Threads laeuft."""
+    global _POOL, _POOL_WORKERS
+    workers = configured_parse_workers() if workers is None else workers
+    with _POOL_LOCK:
+        if workers <= 0:
+            return None
+        if _POOL is not None and _POOL_WORKERS != workers:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = None
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=workers)
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+def shutdown_parse_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=True, cancel_futures=True)
+            _POOL = None
+
+
+atexit.register(shutdown_parse_pool)
+
+
+async def run_parse(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Fuehrt `func` im Prozesspool aus (falls konfiguriert), sonst in einem Thread."""
+    pool = get_parse_pool()
+    if pool is None:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+
+
+__all__ = ["configured_parse_workers", "get_parse_pool", "run_parse", "shutdown_parse_pool"]
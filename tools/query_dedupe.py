@@ -0,0 +1,241 @@
+"""
+Erkennt nahezu doppelte Suchqueries, bevor sie Such-Kontingent verbrauchen.
+
+Queries werden kanonisiert (Kleinschreibung, Umlaut-Faltung `lübeck`/`luebeck`,
+Fuellwoerter raus, Token-Menge statt Wortreihenfolge) und per Token- und
+Zeichen-Shingle-Jaccard gegen bereits genutzte Queries verglichen. Der Index wird
+unter `data/staging/query_index.json` persistiert, damit auch Wiederholungen aus
+frueheren Laeufen erkannt werden.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import unicodedata
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+QUERY_INDEX_PATH = Path("data/staging/query_index.json")
+CROSS_RUN_TTL_DAYS = 14
+TOKEN_JACCARD_THRESHOLD = 0.8
+SHINGLE_JACCARD_THRESHOLD = 0.85
+SHINGLE_SIZE = 3
+UMLAUT_MAP = {"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"}
+FILLER_TOKENS = {
+    "a",
+    "am",
+    "an",
+    "and",
+    "auf",
+    "aus",
+    "bei",
+    "das",
+    "dem",
+    "den",
+    "der",
+    "des",
+    "die",
+    "e",
+    "ein",
+    "eine",
+    "einer",
+    "for",
+    "fuer",
+    "im",
+    "in",
+    "mit",
+    "oder",
+    "of",
+    "the",
+    "und",
+    "v",
+    "vom",
+    "von",
+    "zu",
+    "zum",
+    "zur",
+}
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold_text(text: str) -> str:
+    lowered = text.lower()
+    for umlaut, replacement in UMLAUT_MAP.items():
+        lowered = lowered.replace(umlaut, replacement)
+    decomposed = unicodedata.normalize("NFKD", lowered)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def query_tokens(query: str) -> List[str]:
+    tokens = TOKEN_RE.findall(fold_text(query))
+    meaningful = [token for token in tokens if token not in FILLER_TOKENS]
+    return meaningful or tokens
+
+
+def canonical_query(query: str) -> str:
+    """Reihenfolge-, Umlaut- und Fuellwort-unabhaengiger Schluessel einer Query."""
+    return " ".join(sorted(set(query_tokens(query))))
+
+
+def shingles(canonical: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    compact = canonical.replace(" ", "_")
+    if len(compact) <= size:
+        return {compact} if compact else set()
+    return {compact[idx : idx + size] for idx in range(len(compact) - size + 1)}
+
+
+def jaccard(left: Set[str], right: Set[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+@dataclass
+class QueryRecord:
+    query: str
+    canonical: str
+    last_used: str
+
+
+@dataclass
+class QueryDecision:
+    query: str
+    original: str
+    status: str  # new | merged | duplicate
+    match: str = ""
+
+
+class QueryIndex:
+    """Index bereits genutzter Queries (aktueller Lauf + persistierte Vorlaeufe)."""
+
+    def __init__(
+        self,
+        path: Path = QUERY_INDEX_PATH,
+        *,
+        ttl_days: float = CROSS_RUN_TTL_DAYS,
+        ignore_tokens: Iterable[str] = (),
+    ) -> None:
+        self.path = path
+        self.ttl_days = ttl_days
+        self.ignore_tokens = {fold_text(token) for token in ignore_tokens if token}
+        self.records: Dict[str, QueryRecord] = {}
+        self.session: Set[str] = set()
+        self.changed = False
+        self._features: Dict[str, tuple[Set[str], Set[str]]] = {}
+        self.load()
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.ttl_days)
+        for item in payload.get("records", []):
+            try:
+                record = QueryRecord(**item)
+            except TypeError:
+                continue
+            try:
+                last_used = datetime.fromisoformat(record.last_used)
+            except ValueError:
+                continue
+            if self.ttl_days > 0 and last_used >= cutoff:
+                self.records[record.canonical] = record
+
+    def save(self) -> Optional[Path]:
+        if not self.changed:
+            return None
+        payload = {
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "records": [asdict(record) for record in sorted(self.records.values(), key=lambda r: r.canonical)],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        self.changed = False
+        return self.path
+
+    def _features_for(self, canonical: str) -> tuple[Set[str], Set[str]]:
+        cached = self._features.get(canonical)
+        if cached is None:
+            tokens = set(canonical.split())
+            significant = tokens - self.ignore_tokens or tokens
+            cached = (significant, shingles(" ".join(sorted(significant))))
+            self._features[canonical] = cached
+        return cached
+
+    def match(self, query: str) -> Optional[QueryRecord]:
+        """Liefert den bekannten Eintrag, dem die Query (nahezu) entspricht."""
+        canonical = canonical_query(query)
+        exact = self.records.get(canonical)
+        if exact:
+            return exact
+        tokens, grams = self._features_for(canonical)
+        best: Optional[QueryRecord] = None
+        best_score = 0.0
+        for record in self.records.values():
+            other_tokens, other_grams = self._features_for(record.canonical)
+            if not tokens & other_tokens:
+                continue
+            token_score = jaccard(tokens, other_tokens)
+            gram_score = jaccard(grams, other_grams)
+            if token_score >= TOKEN_JACCARD_THRESHOLD or gram_score >= SHINGLE_JACCARD_THRESHOLD:
+                score = max(token_score, gram_score)
+                if score > best_score:
+                    best, best_score = record, score
+        return best
+
+    def add(self, query: str) -> QueryRecord:
+        canonical = canonical_query(query)
+        record = QueryRecord(
+            query=query,
+            canonical=canonical,
+            last_used=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        )
+        self.records[canonical] = record
+        self.session.add(canonical)
+        self.changed = True
+        return record
+
+    def admit(self, queries: Iterable[str]) -> List[QueryDecision]:
+        """
+        Prueft Queries gegen den Index und registriert die zugelassenen.
+
+        Treffer aus dem aktuellen Lauf werden verworfen (`duplicate`); Treffer aus
+        frueheren Laeufen werden auf den alten Wortlaut zusammengefuehrt (`merged`),
+        damit Such-Cache-Eintraege wiederverwendet werden koennen.
+        """
+        decisions: List[QueryDecision] = []
+        for query in queries:
+            normalized = " ".join(query.split())
+            if not normalized:
+                continue
+            record = self.match(normalized)
+            if record is None:
+                self.add(normalized)
+                decisions.append(QueryDecision(query=normalized, original=normalized, status="new"))
+            elif record.canonical in self.session:
+                decisions.append(
+                    QueryDecision(query=record.query, original=normalized, status="duplicate", match=record.query)
+                )
+            else:
+                self.add(record.query)
+                decisions.append(
+                    QueryDecision(query=record.query, original=normalized, status="merged", match=record.query)
+                )
+        return decisions
+
+
+__all__ = [
+    "QueryDecision",
+    "QueryIndex",
+    "QueryRecord",
+    "canonical_query",
+    "fold_text",
+    "jaccard",
+    "query_tokens",
+]
@@ -0,0 +1,199 @@
+"""
+Ertrags-Statistik pro Suchquery und Query-Familie.
+
+Fuer jede Query werden Suchen, Treffer, Kandidaten nach Filtern, Akzeptierte und
+versendete Anschreiben gezaehlt und unter `data/staging/query_stats.json`
+persistiert. Eine Familie ist die Query ohne Orts-, Fokus- und Kontaktwoerter
+(`Makerspace Lübeck Kontakt` und `Kiel Makerspace` -> `makerspace`).
+
+`QueryStats.schedule` sortiert neue Queries nach erwarteten Akzeptierten pro
+Kosteneinheit (Suchaufruf + bewertete Kandidaten) und verwirft Familien, die
+nach mehreren Suchen nichts gebracht haben.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tools.query_dedupe import canonical_query, fold_text, query_tokens
+
+QUERY_STATS_PATH = Path("data/staging/query_stats.json")
+# Optimistischer Prior fuer unbekannte Familien: 0.5 Akzeptierte pro Suche.
+PRIOR_ACCEPTED = 0.5
+PRIOR_SEARCHES = 1.0
+# Gewicht der Familienrate gegenueber den Werten der Query selbst.
+FAMILY_WEIGHT = 2.0
+# Kosten eines bewerteten Kandidaten relativ zu einem Suchaufruf (LLM-Calls, Scraping).
+CANDIDATE_COST = 0.5
+PRUNE_MIN_SEARCHES = 4
+FAMILY_STOP_TOKENS = {
+    "ansprechpartner",
+    "email",
+    "kontakt",
+    "mail",
+}
+
+
+@dataclass
+class QueryStat:
+    query: str
+    family: str
+    searches: int = 0
+    results: int = 0
+    candidates: int = 0
+    accepted: int = 0
+    letters: int = 0
+    last_used: str = ""
+
+
+@dataclass
+class FamilyStat:
+    family: str
+    searches: int = 0
+    results: int = 0
+    candidates: int = 0
+    accepted: int = 0
+    letters: int = 0
+    queries: List[str] = field(default_factory=list)
+
+    @property
+    def accept_rate(self) -> float:
+        return (self.accepted + PRIOR_ACCEPTED) / (self.searches + PRIOR_SEARCHES)
+
+    @property
+    def pruned(self) -> bool:
+        return self.searches >= PRUNE_MIN_SEARCHES and self.accepted == 0
+
+
+class QueryStats:
+    def __init__(self, path: Path = QUERY_STATS_PATH, *, ignore_tokens: Iterable[str] = ()) -> None:
+        self.path = path
+        self.ignore_tokens = {fold_text(token) for token in ignore_tokens if token} | FAMILY_STOP_TOKENS
+        self.queries: Dict[str, QueryStat] = {}
+        self.changed = False
+        self.load()
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+        for item in payload.get("queries", []):
+            try:
+                stat = QueryStat(**item)
+            except TypeError:
+                continue
+            self.queries[canonical_query(stat.query)] = stat
+
+    def save(self) -> Optional[Path]:
+        if not self.changed:
+            return None
+        payload = {
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "queries": [asdict(stat) for stat in sorted(self.queries.values(), key=lambda s: (s.family, s.query))],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        self.changed = False
+        return self.path
+
+    def family_of(self, query: str) -> str:
+        tokens = query_tokens(query)
+        core = [token for token in tokens if token not in self.ignore_tokens]
+        return " ".join(sorted(set(core or tokens)))
+
+    def _stat(self, query: str) -> QueryStat:
+        key = canonical_query(query)
+        stat = self.queries.get(key)
+        if stat is None:
+            stat = QueryStat(query=query, family=self.family_of(query))
+            self.queries[key] = stat
+        return stat
+
+    def families(self) -> Dict[str, FamilyStat]:
+        families: Dict[str, FamilyStat] = {}
+        for stat in self.queries.values():
+            family = families.setdefault(stat.family, FamilyStat(family=stat.family))
+            family.searches += stat.searches
+            family.results += stat.results
+            family.candidates += stat.candidates
+            family.accepted += stat.accepted
+            family.letters += stat.letters
+            family.queries.append(stat.query)
+        return families
+
+    def record_search(self, query: str, *, results: int, candidates: int) -> None:
+        stat = self._stat(query)
+        stat.searches += 1
+        stat.results += results
+        stat.candidates += candidates
+        stat.last_used = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.changed = True
+
+    def record_accept(self, query: str) -> None:
+        if not query:
+            return
+        self._stat(query).accepted += 1
+        self.changed = True
+
+    def record_letter(self, query: str) -> None:
+        if not query:
+            return
+        self._stat(query).letters += 1
+        self.changed = True
+
+    def expected_value(self, query: str, families: Optional[Dict[str, FamilyStat]] = None) -> float:
+        """Erwartete Akzeptierte pro Kosteneinheit fuer die naechste Suche mit dieser Query."""
+        families = self.families() if families is None else families
+        family = families.get(self.family_of(query)) or FamilyStat(family="")
+        stat = self.queries.get(canonical_query(query))
+        searches = stat.searches if stat else 0
+        accepted = stat.accepted if stat else 0
+        expected = (accepted + FAMILY_WEIGHT * family.accept_rate) / (searches + FAMILY_WEIGHT)
+        candidates_per_search = (family.candidates + 3.0) / (family.searches + 1.0)
+        return expected / (1.0 + CANDIDATE_COST * candidates_per_search)
+
+    def schedule(self, queries: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """Liefert (Queries nach Erwartungswert absteigend, verworfene Queries aus erfolglosen Familien)."""
+        families = self.families()
+        ranked: List[Tuple[float, int, str]] = []
+        pruned: List[str] = []
+        for idx, query in enumerate(queries):
+            family = families.get(self.family_of(query))
+            if family and family.pruned:
+                pruned.append(query)
+                continue
+            ranked.append((-self.expected_value(query, families), idx, query))
+        ranked.sort()
+        return [query for _, _, query in ranked], pruned
+
+    def prompt_summary(self, limit: int = 6) -> str:
+        """Kompakte Ertragsuebersicht der Familien fuer den QueryRefiner."""
+        families = [family for family in self.families().values() if family.searches]
+        if not families:
+            return ""
+        ranked = sorted(families, key=lambda fam: fam.accept_rate, reverse=True)
+
+        def line(family: FamilyStat) -> str:
+            return (
+                f"- {family.family}: {family.searches} Suchen, {family.candidates} Kandidaten, "
+                f"{family.accepted} akzeptiert, {family.letters} Anschreiben"
+            )
+
+        productive = [fam for fam in ranked if fam.accepted][:limit]
+        barren = [fam for fam in reversed(ranked) if not fam.accepted and fam.searches >= 2][:limit]
+        parts: List[str] = []
+        if productive:
+            parts.append("Ergiebig:\n" + "\n".join(line(fam) for fam in productive))
+        if barren:
+            parts.append("Ohne Ertrag (meiden):\n" + "\n".join(line(fam) for fam in barren))
+        return "\n".join(parts)
+
+
+__all__ = ["FamilyStat", "QueryStat", "QueryStats"]
@@ -0,0 +1,97 @@
+"""
+Token-Bucket-Limiter pro Such-Backend.
+
+Jedes Backend (Google, DuckDuckGo, WebSearchTool) bekommt einen eigenen Bucket,
+der prozessweit geteilt wird. Die Buckets sind thread-safe, damit sowohl
+synchroner Code in `asyncio.to_thread`-Workern als auch Coroutinen im Event-Loop
+dieselbe Rate respektieren.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Tuple
+
+# (Requests pro Sekunde, Burst). DuckDuckGo startet bei der frueheren 2.5s-Pause und
+# wird danach vom AIMD-Regler in `tools.duckduckgo` nachgefuehrt.
+BACKEND_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "duckduckgo": (0.4, 1),
+    "google": (5.0, 5),
+    "web_tool": (1.0, 3),
+}
+DEFAULT_RATE_LIMIT: Tuple[float, int] = (1.0, 1)
+
+
+class TokenBucket:
+    """Klassischer Token-Bucket; `reserve` liefert die noetige Wartezeit."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self._lock = threading.Lock()
+        self.rate = max(rate, 1e-6)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Belegt ein Token und gibt zurueck, wie lange der Aufrufer warten muss."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(rate, 1e-6)
+
+    def acquire_sync(self) -> float:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire(self) -> float:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+_LIMITERS: Dict[str, TokenBucket] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def _configured_rate(name: str) -> Tuple[float, int]:
+    rate, burst = BACKEND_RATE_LIMITS.get(name, DEFAULT_RATE_LIMIT)
+    env_value = os.environ.get(f"SEARCH_RATE_LIMIT_{name.upper()}")
+    if env_value:
+        try:
+            rate = float(env_value)
+        except ValueError:
+            pass
+    return rate, burst
+
+
+def get_limiter(name: str) -> TokenBucket:
+    """Liefert den (prozessweit geteilten) Bucket fuer das angegebene Backend."""
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(name)
+        if limiter is None:
+            rate, burst = _configured_rate(name)
+            limiter = TokenBucket(rate, burst)
+            _LIMITERS[name] = limiter
+        return limiter
+
+
+__all__ = ["BACKEND_RATE_LIMITS", "TokenBucket", "get_limiter"]
@@ -0,0 +1,182 @@
+"""
+Offline-Such-Backend `replay` fuer reproduzierbare Benchmarks.
+
+Liefert Treffer aus den aufgezeichneten Dateien in `data/staging/search/` oder
+aus einem Fixture-Korpus (Datei oder Verzeichnis) statt aus dem Netz. Latenz
+und Fehlerrate lassen sich injizieren; der Zufall ist pro (Seed, Query, Aufruf)
+deterministisch, damit parallele Laeufe unabhaengig von der Reihenfolge gleich
+ablaufen.
+
+Konfiguration ueber Umgebungsvariablen:
+- `PIPELINE_REPLAY_DIR` (Standard `data/staging/search`)
+- `PIPELINE_REPLAY_FIXTURE` (optionale JSON-Datei oder Verzeichnis)
+- `PIPELINE_REPLAY_LATENCY_MS` / `PIPELINE_REPLAY_JITTER_MS`
+- `PIPELINE_REPLAY_ERROR_RATE` (0.0 - 1.0)
+- `PIPELINE_REPLAY_SEED`
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from tools.query_dedupe import canonical_query, jaccard
+from tools.search_cache import INDEX_FILENAME, SEARCH_OUTPUT_DIR
+
+# Mindest-Token-Aehnlichkeit, ab der eine unbekannte Query auf eine aufgezeichnete faellt.
+REPLAY_MIN_SIMILARITY = 0.5
+
+
+class ReplaySearchError(RuntimeError):
+    """Injizierter (simulierter) Backend-Fehler."""
+
+
+@dataclass
+class ReplaySearchResult:
+    query: str
+    title: str
+    url: str
+    snippet: str
+    source: str = "replay"
+
+
+@dataclass
+class ReplayConfig:
+    directory: Path = SEARCH_OUTPUT_DIR
+    fixture: Optional[Path] = None
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def replay_config_from_env() -> ReplayConfig:
+    fixture = os.environ.get("PIPELINE_REPLAY_FIXTURE")
+    return ReplayConfig(
+        directory=Path(os.environ.get("PIPELINE_REPLAY_DIR") or SEARCH_OUTPUT_DIR),
+        fixture=Path(fixture) if fixture else None,
+        latency_ms=max(0.0, _float_env("PIPELINE_REPLAY_LATENCY_MS", 0.0)),
+        jitter_ms=max(0.0, _float_env("PIPELINE_REPLAY_JITTER_MS", 0.0)),
+        error_rate=min(1.0, max(0.0, _float_env("PIPELINE_REPLAY_ERROR_RATE", 0.0))),
+        seed=int(_float_env("PIPELINE_REPLAY_SEED", 0)),
+    )
+
+
+def _iter_json_files(path: Path) -> Iterable[Path]:
+    if path.is_dir():
+        yield from sorted(file for file in path.glob("*.json") if file.name != INDEX_FILENAME)
+    elif path.exists():
+        yield path
+
+
+def _result_items(items: Any) -> List[Dict[str, str]]:
+    parsed: List[Dict[str, str]] = []
+    for item in items or []:
+        if not isinstance(item, dict):
+            continue
+        url = str(item.get("url") or item.get("link") or item.get("href") or "").strip()
+        if not url:
+            continue
+        parsed.append(
+            {
+                "title": str(item.get("title") or "").strip(),
+                "url": url,
+                "snippet": str(item.get("snippet") or item.get("body") or "").strip(),
+            }
+        )
+    return parsed
+
+
+@dataclass
+class ReplayCorpus:
+    entries: Dict[str, List[Dict[str, str]]] = field(default_factory=dict)
+
+    def add(self, query: str, items: Any) -> None:
+        results = _result_items(items)
+        if query.strip() and results:
+            self.entries.setdefault(canonical_query(query), results)
+
+    def load(self, path: Path) -> None:
+        """Liest Such-Cache-Dateien (`query` + `results`) oder Fixtures (`queries: {query: [...]}`)."""
+        for file in _iter_json_files(path):
+            try:
+                payload = json.loads(file.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                continue
+            if isinstance(payload.get("queries"), dict):
+                for query, items in payload["queries"].items():
+                    self.add(str(query), items)
+            elif payload.get("query"):
+                self.add(str(payload["query"]), payload.get("results"))
+
+    def lookup(self, query: str) -> List[Dict[str, str]]:
+        key = canonical_query(query)
+        exact = self.entries.get(key)
+        if exact is not None:
+            return exact
+        tokens = set(key.split())
+        best: List[Dict[str, str]] = []
+        best_score = REPLAY_MIN_SIMILARITY
+        for other, items in sorted(self.entries.items()):
+            score = jaccard(tokens, set(other.split()))
+            if score >= best_score and (score > best_score or not best):
+                best, best_score = items, score
+        return best
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class ReplayBackend:
+    def __init__(self, config: Optional[ReplayConfig] = None) -> None:
+        self.config = config or replay_config_from_env()
+        self.corpus = ReplayCorpus()
+        if self.config.fixture:
+            self.corpus.load(self.config.fixture)
+        self.corpus.load(self.config.directory)
+        self.stats = {"calls": 0, "errors": 0, "hits": 0, "misses": 0}
+        self._attempts: Dict[str, int] = {}
+
+    def _rng(self, query: str) -> random.Random:
+        key = canonical_query(query)
+        attempt = self._attempts.get(key, 0)
+        self._attempts[key] = attempt + 1
+        return random.Random(f"{self.config.seed}:{key}:{attempt}")
+
+    async def search(self, query: str, *, max_results: int = 6, **_: Any) -> List[ReplaySearchResult]:
+        rng = self._rng(query)
+        self.stats["calls"] += 1
+        delay_ms = rng.gauss(self.config.latency_ms, self.config.jitter_ms) if self.config.jitter_ms else self.config.latency_ms
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+        if self.config.error_rate and rng.random() < self.config.error_rate:
+            self.stats["errors"] += 1
+            raise ReplaySearchError(f"Injizierter Replay-Fehler fuer '{query}'")
+        items = self.corpus.lookup(query)
+        self.stats["hits" if items else "misses"] += 1
+        return [
+            ReplaySearchResult(query=query, title=item["title"] or item["url"], url=item["url"], snippet=item["snippet"])
+            for item in items[: max(1, max_results)]
+        ]
+
+
+__all__ = [
+    "ReplayBackend",
+    "ReplayConfig",
+    "ReplayCorpus",
+    "ReplaySearchError",
+    "ReplaySearchResult",
+    "replay_config_from_env",
+]
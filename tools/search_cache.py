@@ -0,0 +1,285 @@
+"""
+Indexierter Cache fuer Suchergebnisse (`data/staging/search`).
+
+Ein einziges `index.json` bildet (Backend, Region, normalisierte Query) auf genau
+eine Ergebnisdatei ab. Lookups sind damit ein Dict-Zugriff statt Globbing, neue
+Ergebnisse ersetzen (und loeschen) die vorherige Datei desselben Schluessels, und
+jeder Eintrag traegt seinen Abrufzeitpunkt fuer TTL-Pruefungen.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SEARCH_OUTPUT_DIR = Path("data/staging/search")
+INDEX_FILENAME = "index.json"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+MAX_RETENTION_SECONDS = 90 * 24 * 3600
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+# Region/Locale, mit der das jeweilige Backend standardmaessig abgefragt wird.
+DEFAULT_REGIONS = {
+    "google": "lang_de",
+    "duckduckgo": "de-de",
+}
+
+
+@dataclass
+class CachedSearchResult:
+    query: str
+    title: str
+    url: str
+    snippet: str
+    source: str
+
+
+@dataclass
+class CacheEntry:
+    query: str
+    backend: str
+    region: str
+    file: str
+    fetched_at: str
+    count: int
+
+    def age_seconds(self, now: Optional[datetime] = None) -> float:
+        try:
+            fetched = datetime.strptime(self.fetched_at, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+        except ValueError:
+            return float("inf")
+        return ((now or datetime.now(timezone.utc)) - fetched).total_seconds()
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _slugify(value: str, max_length: int = 80) -> str:
+    sanitized = "".join(ch if ch.isalnum() else "-" for ch in value.lower())
+    while "--" in sanitized:
+        sanitized = sanitized.replace("--", "-")
+    return sanitized.strip("-")[:max_length].rstrip("-") or "query"
+
+
+def _result_to_dict(result: Any) -> Dict[str, Any]:
+    if is_dataclass(result):
+        return asdict(result)
+    if isinstance(result, dict):
+        return dict(result)
+    return {
+        "query": getattr(result, "query", ""),
+        "title": getattr(result, "title", ""),
+        "url": getattr(result, "url", ""),
+        "snippet": getattr(result, "snippet", ""),
+        "source": getattr(result, "source", ""),
+    }
+
+
+class SearchCache:
+    def __init__(self, directory: Path = SEARCH_OUTPUT_DIR, *, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, CacheEntry] = {}
+        self._load_index()
+
+    @staticmethod
+    def key(query: str, backend: str, region: Optional[str] = None) -> str:
+        region = DEFAULT_REGIONS.get(backend, "") if region is None else region
+        return f"{backend}|{region}|{normalize_query(query)}"
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / INDEX_FILENAME
+
+    def _load_index(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not self.index_path.exists():
+            self._rebuild_from_files()
+            return
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            self._rebuild_from_files()
+            return
+        for key, item in (payload.get("entries") or {}).items():
+            try:
+                self._entries[key] = CacheEntry(**item)
+            except TypeError:
+                continue
+        if self._prune(MAX_RETENTION_SECONDS):
+            self._save_index()
+
+    def _rebuild_from_files(self) -> None:
+        """Einmalige Migration der alten `<slug>_<timestamp>.json`-Dateien."""
+        for file in sorted(self.directory.glob("*.json")):
+            if file.name == INDEX_FILENAME:
+                continue
+            try:
+                payload = json.loads(file.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError):
+                continue
+            results = payload.get("results") or []
+            query = str(payload.get("query") or "").strip()
+            if not query or not results:
+                # Nicht indexieren, aber auch nicht loeschen: die Migration soll nichts zerstoeren.
+                continue
+            backend = str(payload.get("backend") or results[0].get("source") or "unknown")
+            region = str(payload.get("region") if payload.get("region") is not None else DEFAULT_REGIONS.get(backend, ""))
+            entry = CacheEntry(
+                query=query,
+                backend=backend,
+                region=region,
+                file=file.name,
+                fetched_at=str(payload.get("fetched_at") or ""),
+                count=len(results),
+            )
+            key = self.key(query, backend, region)
+            previous = self._entries.get(key)
+            if previous and previous.fetched_at > entry.fetched_at:
+                file.unlink(missing_ok=True)
+                continue
+            if previous:
+                (self.directory / previous.file).unlink(missing_ok=True)
+            self._entries[key] = entry
+        self._save_index()
+
+    def _save_index(self) -> None:
+        payload = {
+            "generated_at": datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT),
+            "entries": {key: asdict(entry) for key, entry in sorted(self._entries.items())},
+        }
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp_path.replace(self.index_path)
+
+    def _prune(self, max_age: float) -> int:
+        now = datetime.now(timezone.utc)
+        expired = [key for key, entry in self._entries.items() if entry.age_seconds(now) > max_age]
+        for key in expired:
+            entry = self._entries.pop(key)
+            (self.directory / entry.file).unlink(missing_ok=True)
+        return len(expired)
+
+    def is_fresh(self, entry: CacheEntry, max_age: Optional[float] = None) -> bool:
+        limit = self.ttl_seconds if max_age is None else max_age
+        return entry.age_seconds() <= limit
+
+    def entry(self, query: str, backend: str, region: Optional[str] = None) -> Optional[CacheEntry]:
+        with self._lock:
+            return self._entries.get(self.key(query, backend, region))
+
+    def lookup(
+        self,
+        query: str,
+        backend: str,
+        region: Optional[str] = None,
+        *,
+        fresh_only: bool = False,
+        max_age: Optional[float] = None,
+    ) -> Optional[Tuple[CacheEntry, List[Dict[str, Any]]]]:
+        """Liefert (Eintrag, Rohtreffer) oder None; `fresh_only` prueft die TTL."""
+        entry = self.entry(query, backend, region)
+        if entry is None:
+            return None
+        if fresh_only and not self.is_fresh(entry, max_age):
+            return None
+        try:
+            payload = json.loads((self.directory / entry.file).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        items = [item for item in payload.get("results") or [] if isinstance(item, dict)]
+        if not items:
+            return None
+        return entry, items
+
+    def store(
+        self,
+        query: str,
+        results: Iterable[Any],
+        *,
+        backend: str,
+        region: Optional[str] = None,
+    ) -> Path:
+        region = DEFAULT_REGIONS.get(backend, "") if region is None else region
+        items = [_result_to_dict(result) for result in results]
+        timestamp = datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+        file_name = f"{_slugify(query)}_{_slugify(backend, 20)}_{timestamp}.json"
+        file_path = self.directory / file_name
+        payload = {
+            "query": query,
+            "backend": backend,
+            "region": region,
+            "fetched_at": timestamp,
+            "results": items,
+        }
+        with self._lock:
+            key = self.key(query, backend, region)
+            previous = self._entries.get(key)
+            if not items and previous and previous.count:
+                # Leere Treffer (z. B. nach dem LLM-Filter) ersetzen keinen brauchbaren Eintrag.
+                return self.directory / previous.file
+            self.directory.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+            if previous and previous.file != file_name:
+                (self.directory / previous.file).unlink(missing_ok=True)
+            self._entries[key] = CacheEntry(
+                query=query,
+                backend=backend,
+                region=region,
+                file=file_name,
+                fetched_at=timestamp,
+                count=len(items),
+            )
+            self._save_index()
+        return file_path
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def to_search_results(items: Iterable[Dict[str, Any]], *, query: str, backend: str) -> List[CachedSearchResult]:
+    results: List[CachedSearchResult] = []
+    for item in items:
+        url = str(item.get("url") or item.get("link") or item.get("href") or "").strip()
+        if not url:
+            continue
+        results.append(
+            CachedSearchResult(
+                query=str(item.get("query") or query),
+                title=str(item.get("title") or "").strip(),
+                url=url,
+                snippet=str(item.get("snippet") or item.get("body") or "").strip(),
+                source=str(item.get("source") or backend),
+            )
+        )
+    return results
+
+
+_CACHES: Dict[Path, SearchCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_search_cache(directory: Path = SEARCH_OUTPUT_DIR) -> SearchCache:
+    """Ein Cache-Objekt pro Verzeichnis (Index wird nur einmal geladen)."""
+    key = directory.resolve()
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = SearchCache(directory)
+            _CACHES[key] = cache
+        return cache
+
+
+__all__ = [
+    "CacheEntry",
+    "CachedSearchResult",
+    "SearchCache",
+    "get_search_cache",
+    "normalize_query",
+    "to_search_results",
+]
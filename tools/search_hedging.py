@@ -0,0 +1,182 @@
+"""
+Gehedgte Suche ueber mehrere Backends plus Latenz-Statistik pro Backend.
+
+`hedged_search` startet das erste Backend und nach einer Verzoegerung (Standard:
+p90-Latenz des zuletzt gestarteten Backends) das naechste parallel. Das erste
+akzeptable Ergebnis gewinnt, die uebrigen Tasks werden abgebrochen. Die Latenzen
+werden vom `LatencyTracker` gesammelt und unter
+`data/staging/search_latency.json` fuer Folgelaeufe persistiert. Abgebrochene
+Verlierer gehen mit ihrer Laufzeit bis zum Abbruch als zensierte Stichprobe
+(untere Schranke) ein; sonst saenke das p90 auf die Latenz der Gewinner und der
+Hedge feuerte immer frueher.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_PATH = Path("data/staging/search_latency.json")
+LATENCY_WINDOW = 200
+MIN_SAMPLES = 5
+HEDGE_PERCENTILE = 0.9
+MIN_HEDGE_DELAY = 0.5
+MAX_HEDGE_DELAY = 60.0
+
+SearchAttempt = Tuple[str, Callable[[], Awaitable[List[Any]]]]
+
+
+class LatencyTracker:
+    """Gleitendes Fenster erfolgreicher bzw. abgebrochener Latenzen (Sekunden) pro Backend."""
+
+    def __init__(self, path: Optional[Path] = LATENCY_PATH, *, window: int = LATENCY_WINDOW) -> None:
+        self.path = path
+        self.window = window
+        self.samples: Dict[str, Deque[float]] = {}
+        self.failures: Dict[str, int] = {}
+        self.censored: Dict[str, int] = {}
+        self.changed = False
+        self.load()
+
+    def _bucket(self, backend: str) -> Deque[float]:
+        bucket = self.samples.get(backend)
+        if bucket is None:
+            bucket = deque(maxlen=self.window)
+            self.samples[backend] = bucket
+        return bucket
+
+    def load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+        for backend, values in (payload.get("samples") or {}).items():
+            bucket = self._bucket(backend)
+            bucket.extend(float(value) for value in values if isinstance(value, (int, float)))
+        self.failures = {key: int(value) for key, value in (payload.get("failures") or {}).items()}
+        self.censored = {key: int(value) for key, value in (payload.get("censored") or {}).items()}
+
+    def save(self) -> Optional[Path]:
+        if not self.path or not self.changed:
+            return None
+        payload = {
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "samples": {backend: [round(value, 3) for value in bucket] for backend, bucket in self.samples.items()},
+            "failures": self.failures,
+            "censored": self.censored,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        self.changed = False
+        return self.path
+
+    def record(self, backend: str, seconds: float, *, ok: bool = True, censored: bool = False) -> None:
+        """`censored`: Versuch wurde abgebrochen, `seconds` ist nur eine untere Schranke."""
+        if censored:
+            self._bucket(backend).append(max(0.0, seconds))
+            self.censored[backend] = self.censored.get(backend, 0) + 1
+        elif ok:
+            self._bucket(backend).append(max(0.0, seconds))
+        else:
+            self.failures[backend] = self.failures.get(backend, 0) + 1
+        self.changed = True
+
+    def percentile(self, backend: str, pct: float) -> Optional[float]:
+        bucket = self.samples.get(backend)
+        if not bucket or len(bucket) < MIN_SAMPLES:
+            return None
+        ordered = sorted(bucket)
+        index = min(len(ordered) - 1, max(0, int(round(pct * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def hedge_delay(self, backend: str, default: float) -> float:
+        """p90 des Backends (geklemmt), sonst der konfigurierte Standardwert."""
+        observed = self.percentile(backend, HEDGE_PERCENTILE)
+        if observed is None:
+            return default
+        return min(MAX_HEDGE_DELAY, max(MIN_HEDGE_DELAY, observed))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        report: Dict[str, Dict[str, Any]] = {}
+        for backend, bucket in self.samples.items():
+            report[backend] = {
+                "samples": len(bucket),
+                "p50": self.percentile(backend, 0.5),
+                "p90": self.percentile(backend, 0.9),
+                "failures": self.failures.get(backend, 0),
+                "censored": self.censored.get(backend, 0),
+            }
+        return report
+
+
+@dataclass
+class HedgeOutcome:
+    results: List[Any]
+    backend: Optional[str]
+    launched: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+async def hedged_search(
+    attempts: Sequence[SearchAttempt],
+    *,
+    delay_for: Callable[[str], float],
+    accept: Callable[[List[Any]], bool] = bool,
+) -> HedgeOutcome:
+    """
+    Startet die Versuche gestaffelt und liefert das erste akzeptable Ergebnis.
+
+    Der naechste Versuch startet, sobald `delay_for(<zuletzt gestartet>)` Sekunden
+    ohne Ergebnis verstrichen sind oder ein laufender Versuch leer/fehlerhaft endet.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    queue = list(attempts)
+    pending: Dict[asyncio.Task, str] = {}
+    outcome = HedgeOutcome(results=[], backend=None)
+
+    def launch() -> None:
+        name, factory = queue.pop(0)
+        outcome.launched.append(name)
+        pending[asyncio.create_task(factory())] = name
+
+    if queue:
+        launch()
+    try:
+        while pending:
+            timeout = delay_for(outcome.launched[-1]) if queue else None
+            done, _ = await asyncio.wait(set(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                launch()
+                continue
+            for task in done:
+                name = pending.pop(task)
+                try:
+                    results = task.result()
+                except Exception as exc:
+                    outcome.errors[name] = str(exc)
+                    continue
+                if accept(results):
+                    outcome.results = list(results)
+                    outcome.backend = name
+                    return outcome
+            if queue:
+                launch()
+        return outcome
+    finally:
+        outcome.elapsed = loop.time() - started
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+__all__ = ["HedgeOutcome", "LatencyTracker", "hedged_search"]
@@ -14,6 +14,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from tools.org_registry import OrganizationRegistry
+from tools.url_utils import domain_key as url_domain_key
 
 CANDIDATES_FILE = Path("data/staging/candidates_selected.json")
 LETTERS_DIR = Path("outputs/letters")
@@ -35,13 +36,7 @@ def slugify(value: str) -> str:
 
 
 def domain_key(url: str) -> str:
-    parsed = urlparse(url)
-    host = parsed.netloc.lower()
-    if host.startswith("www."):
-        host = host[4:]
-    if ":" in host:
-        host = host.split(":", 1)[0]
-    return host or slugify(url)
+    return url_domain_key(url) or slugify(url)
 
 
 def generate_org_slug(name: str, url: str) -> str:
@@ -0,0 +1,63 @@
+"""
+Single-Flight: gleichzeitige Aufrufe mit demselben Schluessel teilen sich einen Abruf.
+
+Laufen mehrere Kandidaten-Tasks (plus Directory- und Partner-Expansion) parallel,
+fragen sie oft im selben Moment dieselbe URL an. `SingleFlight.run` startet die
+Operation nur beim ersten Aufrufer als eigenen Task; alle weiteren warten auf
+denselben Task und bekommen dasselbe Ergebnis bzw. dieselbe Exception. Der Task
+ist gegen Abbruch einzelner Wartender abgeschirmt und wird nach Abschluss
+vergessen, d. h. es wird nichts ueber den Abruf hinaus zwischengespeichert.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+def _consume_result(task: "asyncio.Task[object]") -> None:
+    # Exception abholen, auch wenn alle Wartenden abgebrochen wurden (sonst Warnung im Log).
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlight:
+    """Pro Event-Loop eine Tabelle `{schluessel: laufender Task}`."""
+
+    def __init__(self) -> None:
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.stats = {"started": 0, "shared": 0}
+
+    def _table(self) -> Dict[Hashable, asyncio.Task]:
+        loop = asyncio.get_running_loop()
+        table = self._calls.get(loop)
+        if table is None:
+            table = {}
+            self._calls[loop] = table
+        return table
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        table = self._table()
+        task = table.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            table[key] = task
+            self.stats["started"] += 1
+
+            def forget(done: asyncio.Task, key: Hashable = key) -> None:
+                if table.get(key) is done:
+                    del table[key]
+                _consume_result(done)
+
+            task.add_done_callback(forget)
+        else:
+            self.stats["shared"] += 1
+        return await asyncio.shield(task)
+
+
+__all__ = ["SingleFlight"]
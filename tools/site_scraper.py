@@ -1,28 +1,66 @@
-"""Fetches and summarizes basic info from candidate web pages."""
+"""
+Fetches and summarizes basic info from candidate web pages.
+
+Abrufe laufen asynchron ueber den gemeinsamen HTTP-Client (Keep-Alive-Pool pro
+Host). Pro Event-Loop begrenzen zwei Semaphoren die Last: hoechstens
+`PIPELINE_SCRAPE_PER_HOST` gleichzeitige Abrufe pro Domain (Hoeflichkeit) und
+`PIPELINE_SCRAPE_CONCURRENCY` insgesamt. Die synchronen Funktionen sind duenne
+Wrapper um die async-Varianten. Das Parsing laeuft in Threads oder, mit
+`PIPELINE_PARSE_WORKERS`, in einem Prozesspool (`tools/parse_pool.py`).
+
+Snapshots speichern `ETag`, `Last-Modified` und den Abrufzeitpunkt. Nach Ablauf
+der TTL (`PIPELINE_SNAPSHOT_TTL_HOURS`, Standard 168h) wird per bedingtem GET
+revalidiert: ein 304 erneuert nur den Zeitstempel, ohne Download und Parsing.
+
+Unterseiten (Kontakt, Impressum, Vorstand, ...) werden aus der Navigation der
+Startseite, `robots.txt`/`sitemap.xml` und erst zuletzt aus geratenen Pfaden
+bestimmt und nach Linktext und Pfad gewichtet.
+
+Snapshots liegen sharded nach Hash der kanonischen URL im `SnapshotStore`
+(`data/staging/snapshots/<aa>/<domain>/`). Das Roh-HTML liegt komprimiert im inhaltsadressierten `PageStore`
+(`data/staging/pages/`). `python -m tools.site_scraper reextract` wendet die
+aktuellen Extraktoren in einem Prozesspool offline auf alle Snapshots an.
+"""
 
 from __future__ import annotations
 
-import json
+import argparse
+import asyncio
+import gzip
+import os
 import re
-import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List, Optional
-from urllib.error import HTTPError, URLError
-from urllib.parse import urljoin, urlparse
-from urllib.request import Request, urlopen
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urljoin, urlparse
+
+from lxml import etree, html
+
+from tools.http_client import HttpClientError, HttpResponse, get_client, run_sync
+from tools.fetch_memory import MISSING_STATUSES, FetchMemory, get_fetch_memory
+from tools.host_health import HostUnavailableError, get_host_health
+from tools.html_decoding import HtmlDecodingError, charset_from_content_type, detect_charset, parse_html_bytes
+from tools.page_store import PageStore
+from tools.parse_pool import run_parse
+from tools.query_dedupe import fold_text
+from tools.single_flight import SingleFlight
+from tools.snapshot_store import SNAPSHOT_DIR, SnapshotStore, get_snapshot_store
+from tools.url_utils import canonical_url, domain_key, url_key
 
-from lxml import html
-
-SNAPSHOT_DIR = Path("data/staging/snapshots")
 USER_AGENT = "AgentenSystem/SiteScraper/1.0"
 MAX_FETCH_BYTES = 3_000_000
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
 HIGHLIGHT_LIMIT = 5
 SUMMARY_MIN_CHARS = 60
 SUMMARY_MAX_CHARS = 480
-XML_DECLARATION_RE = re.compile(r"^\s*<\?xml[^>]*encoding[^>]*\?>", re.IGNORECASE)
 EMAIL_RE = re.compile(r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}", re.IGNORECASE)
+EMAIL_LOCAL_CHAR_RE = re.compile(r"[A-Z0-9._%+-]", re.IGNORECASE)
+# Relative Links (ohne Schema/Host) bleiben immer auf der eigenen Domain.
+ABSOLUTE_HREF_RE = re.compile(r"^(?:[a-zA-Z][a-zA-Z0-9+.-]*:|//)")
 LOCATION_CUES = [
     "lübeck",
     "hamburg",
@@ -50,10 +88,65 @@ RELATED_PATH_HINTS = [
 ]
 MAX_RELATED_PAGES = 4
 LINK_LIMIT = 12
+NAV_LINK_LIMIT = 8
+# Nur die ersten internen Links bewerten (Kopf-/Fussnavigation), nicht jeden Link im Fliesstext.
+NAV_SCAN_LIMIT = 300
+# Gewichte fuer Pfad bzw. Linktext (gefaltet: ue statt ü, Trenner als Leerzeichen).
+RELATED_KEYWORDS = {
+    "kontakt": 3.0,
+    "contact": 3.0,
+    "impressum": 3.0,
+    "imprint": 3.0,
+    "ansprechpartner": 2.5,
+    "vorstand": 2.0,
+    "team": 1.5,
+    "ueber uns": 1.5,
+    "about": 1.5,
+    "wir sind": 1.0,
+    "verein": 1.0,
+    "mitmachen": 1.0,
+}
+RELATED_NEGATIVE_HINTS = (
+    "datenschutz",
+    "privacy",
+    "cookie",
+    "login",
+    "anmelden",
+    "warenkorb",
+    "cart",
+    "agb",
+    "wp admin",
+    "wp content",
+    "feed",
+)
+RELATED_SKIP_SUFFIXES = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".zip", ".doc", ".docx", ".xml")
+SEPARATOR_RE = re.compile(r"[-_/.+]+")
+# Grobfilter vor der Bewertung (ungefaltet), damit nicht jeder Navigationslink gefaltet werden muss.
+RELATED_HINT_RE = re.compile(
+    r"kontakt|contact|impressum|imprint|ansprechpartner|vorstand|team|ber.?uns|about|wir.sind|verein|mitmachen",
+    re.IGNORECASE,
+)
+MAX_SITEMAP_BYTES = 2_000_000
+MAX_CHILD_SITEMAPS = 2
+SITEMAP_URL_LIMIT = 20
+SCRAPE_MAX_IN_FLIGHT = 8
+SCRAPE_MAX_PER_HOST = 2
+SNAPSHOT_TTL_HOURS = 168.0
+# `SiteScraperError.reason`, wenn der Host-Circuit offen ist (nicht als URL-Skip merken).
+CIRCUIT_OPEN = "circuit_open"
 
 
 class SiteScraperError(RuntimeError):
-    """Signals fetch/parse issues for site snapshots."""
+    """
+    Signals fetch/parse issues for site snapshots; `status` ist bei HTTP-Fehlern
+    gesetzt, `reason` bei Abbruch anhand der Header (`content_type`, `too_large`)
+    oder bei offenem Host-Circuit (`circuit_open`).
+    """
+
+    def __init__(self, message: str, *, status: Optional[int] = None, reason: str = "") -> None:
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
 
 
 @dataclass
@@ -73,116 +166,390 @@ class SiteSnapshot:
     detected_location: Optional[str]
     contacts: List[ContactInfo] = field(default_factory=list)
     links: List[str] = field(default_factory=list)
+    etag: str = ""
+    last_modified: str = ""
+    fetched_at: str = ""
+    content_hash: str = ""
+    nav_links: List[Dict[str, str]] = field(default_factory=list)
+    charset: str = ""
 
 
-def _slugify(url: str) -> str:
-    parsed = urlparse(url)
-    return (
-        f"{parsed.netloc}{parsed.path}".replace("/", "-")
-        .replace(".", "-")
-        .replace("_", "-")
-        .strip("-")
-    ) or "index"
+def _int_env(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+class _ScrapeLimits:
+    """
+    Globales In-Flight-Limit plus ein Semaphor pro Domain.
+
+    Host-Semaphoren existieren nur, solange jemand den Host nutzt oder auf ihn
+    wartet; danach wird der Eintrag entfernt, damit die Tabelle bei langen Crawls
+    nicht mit jeder je besuchten Domain waechst.
+    """
+
+    def __init__(self, in_flight: int, per_host: int) -> None:
+        self.in_flight = asyncio.Semaphore(in_flight)
+        self.per_host = per_host
+        self.hosts: Dict[str, asyncio.Semaphore] = {}
+        self.users: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        host = domain_key(url) or url
+        host_slots = self.hosts.get(host)
+        if host_slots is None:
+            host_slots = asyncio.Semaphore(self.per_host)
+            self.hosts[host] = host_slots
+        self.users[host] = self.users.get(host, 0) + 1
+        try:
+            # Erst den Host-Slot, damit Wartende auf einen vollen Host keinen globalen Slot blockieren.
+            async with host_slots:
+                async with self.in_flight:
+                    yield
+        finally:
+            self.users[host] -= 1
+            if not self.users[host]:
+                # Wieder voll verfuegbar und niemand wartet: Eintrag freigeben.
+                del self.users[host]
+                del self.hosts[host]
+
+
+# Gleichzeitige Abrufe derselben Seite bzw. Sitemap-Suche derselben Domain teilen sich einen Task.
+_FLIGHTS = SingleFlight()
+_LIMITS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _ScrapeLimits]" = weakref.WeakKeyDictionary()
+
+
+def _scrape_limits() -> _ScrapeLimits:
+    loop = asyncio.get_running_loop()
+    limits = _LIMITS.get(loop)
+    if limits is None:
+        limits = _ScrapeLimits(
+            _int_env("PIPELINE_SCRAPE_CONCURRENCY", SCRAPE_MAX_IN_FLIGHT),
+            _int_env("PIPELINE_SCRAPE_PER_HOST", SCRAPE_MAX_PER_HOST),
+        )
+        _LIMITS[loop] = limits
+    return limits
 
 
-def _cache_path(url: str) -> Path:
-    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
-    return SNAPSHOT_DIR / f"{_slugify(url)}.json"
+def snapshot_ttl_seconds() -> float:
+    try:
+        hours = float(os.environ.get("PIPELINE_SNAPSHOT_TTL_HOURS", SNAPSHOT_TTL_HOURS))
+    except ValueError:
+        hours = SNAPSHOT_TTL_HOURS
+    return max(0.0, hours) * 3600
 
 
-def _fetch(url: str, *, timeout: float = 15.0) -> str:
-    request = Request(url, headers={"User-Agent": USER_AGENT})
+def snapshot_age_seconds(snapshot: SiteSnapshot, now: Optional[datetime] = None) -> Optional[float]:
     try:
-        with urlopen(request, timeout=timeout) as response:
-            content = response.read(MAX_FETCH_BYTES)
-    except HTTPError as exc:  # pragma: no cover
-        raise SiteScraperError(f"HTTP {exc.code} für {url}") from exc
-    except URLError as exc:  # pragma: no cover
+        fetched = datetime.fromisoformat(snapshot.fetched_at)
+    except (TypeError, ValueError):
+        return None
+    if fetched.tzinfo is None:
+        fetched = fetched.replace(tzinfo=timezone.utc)
+    return ((now or datetime.now(timezone.utc)) - fetched).total_seconds()
+
+
+def snapshot_is_fresh(snapshot: SiteSnapshot, max_age: Optional[float] = None) -> bool:
+    age = snapshot_age_seconds(snapshot)
+    limit = snapshot_ttl_seconds() if max_age is None else max_age
+    return age is not None and age <= limit
+
+
+def _validators(snapshot: Optional[SiteSnapshot]) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if snapshot is None:
+        return headers
+    if snapshot.etag:
+        headers["If-None-Match"] = snapshot.etag
+    if snapshot.last_modified:
+        headers["If-Modified-Since"] = snapshot.last_modified
+    return headers
+
+
+async def _fetch(
+    url: str,
+    *,
+    timeout: float = 15.0,
+    headers: Optional[Dict[str, str]] = None,
+    accept_types: Optional[Iterable[str]] = HTML_CONTENT_TYPES,
+) -> HttpResponse:
+    """
+    GET mit optionalen Conditional-Headern; ein 304 wird als Antwort zurueckgegeben.
+    Nicht-HTML (PDF, Bilder, Archive) und zu grosse Antworten brechen vor dem Body ab.
+    Hosts mit offenem Circuit werden ohne Netzwerkzugriff abgelehnt.
+    """
+    try:
+        async with _scrape_limits().slot(url):
+            with get_host_health().guard(url):
+                response = await get_client().request_async(
+                    url,
+                    headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1", **(headers or {})},
+                    timeout=timeout,
+                    max_bytes=MAX_FETCH_BYTES,
+                    accept_types=accept_types,
+                )
+    except HostUnavailableError as exc:
+        raise SiteScraperError(str(exc), reason=CIRCUIT_OPEN) from exc
+    except HttpClientError as exc:  # pragma: no cover
+        if exc.reason:
+            raise SiteScraperError(str(exc), reason=exc.reason) from exc
+        if exc.status is not None:
+            raise SiteScraperError(f"HTTP {exc.status} für {url}", status=exc.status) from exc
         raise SiteScraperError(f"{url} nicht erreichbar ({exc})") from exc
-    return content.decode("utf-8", errors="ignore")
-
-
-def _extract_summary(doc: html.HtmlElement) -> str:
-    paragraphs = doc.xpath("//p")
-    for paragraph in paragraphs:
-        text = " ".join(paragraph.text_content().split())
-        if SUMMARY_MIN_CHARS <= len(text) <= SUMMARY_MAX_CHARS:
-            return text
-    if paragraphs:
-        text = " ".join(paragraphs[0].text_content().split())
-        return text[:SUMMARY_MAX_CHARS]
-    body_text = " ".join(doc.text_content().split())
-    return body_text[:SUMMARY_MAX_CHARS]
-
-
-def _extract_highlights(doc: html.HtmlElement) -> List[str]:
-    highlights: List[str] = []
-    for bullet in doc.xpath("//li"):
-        text = " ".join(bullet.text_content().split())
-        if 20 <= len(text) <= 200 and text not in highlights:
-            highlights.append(text)
-        if len(highlights) >= HIGHLIGHT_LIMIT:
-            break
-    return highlights
+    return response
 
 
-def _extract_contacts(doc: html.HtmlElement, url: str) -> List[ContactInfo]:
-    contacts: List[ContactInfo] = []
-    seen: set[str] = set()
+def _response_validators(response: HttpResponse) -> Tuple[str, str]:
+    return response.headers.get("etag", ""), response.headers.get("last-modified", "")
 
-    def add_contact(email: str, name: str = "", context: str = "") -> None:
-        normalized = email.strip().lower()
-        if not normalized or normalized in seen:
-            return
-        seen.add(normalized)
-        contacts.append(ContactInfo(email=normalized, name=name.strip(), context=context.strip(), source_url=url))
 
-    for node in doc.xpath("//a[starts-with(@href, 'mailto:')]"):
-        href = node.attrib.get("href", "")
-        mail = href.split("mailto:")[-1].split("?")[0]
-        text = " ".join(node.text_content().split())
-        add_contact(mail, name=text, context="mailto link")
+def _normalize_space(text: str) -> str:
+    return " ".join(text.split())
 
-    text_blob = " ".join(doc.text_content().split())
-    for match in EMAIL_RE.findall(text_blob):
-        add_contact(match, context="page text")
 
-    if not contacts:
-        # Suche nach Kontaktblöcken (Impressum/Kontakt)
-        for section in doc.xpath("//section[contains(translate(., 'KONTAKT', 'kontakt'), 'kontakt') or contains(translate(., 'IMPRESSUM', 'impressum'), 'impressum')]"):
-            section_text = " ".join(section.text_content().split())
-            for match in EMAIL_RE.findall(section_text):
-                add_contact(match, context="contact section")
+@dataclass
+class _PageExtract:
+    title: str = ""
+    summary: str = ""
+    highlights: List[str] = field(default_factory=list)
+    contacts: List[ContactInfo] = field(default_factory=list)
+    links: List[str] = field(default_factory=list)
+    nav_links: List[Dict[str, str]] = field(default_factory=list)
 
-    return contacts
 
+class _ContactCollector:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.contacts: List[ContactInfo] = []
+        self.seen: set[str] = set()
 
-def _extract_links(doc: html.HtmlElement, url: str) -> List[str]:
-    parsed = urlparse(url)
-    base_domain = parsed.netloc.lower()
-    links: List[str] = []
-    seen: set[str] = set()
-    for node in doc.xpath("//a[@href]"):
-        href = node.attrib.get("href", "").strip()
-        if not href:
+    def add(self, email: str, name: str = "", context: str = "") -> None:
+        normalized = email.strip().lower()
+        if not normalized or normalized in self.seen:
+            return
+        self.seen.add(normalized)
+        self.contacts.append(ContactInfo(email=normalized, name=name.strip(), context=context.strip(), source_url=self.url))
+
+
+def _find_emails(text: str) -> List[str]:
+    """
+    Wie `EMAIL_RE.findall`, setzt aber nur an `@` an: pro `@` wird der Lokalteil
+    rueckwaerts gesucht und das Muster dort verankert. Auf langen Seiten spart das
+    den Regex-Versuch an jeder Textposition.
+    """
+    matches: List[str] = []
+    pos = 0
+    while True:
+        at = text.find("@", pos)
+        if at < 0:
+            return matches
+        start = at
+        while start > pos and EMAIL_LOCAL_CHAR_RE.match(text, start - 1):
+            start -= 1
+        match = EMAIL_RE.match(text, start) if start < at else None
+        if match:
+            matches.append(match.group(0))
+            pos = match.end()
+        else:
+            pos = at + 1
+
+
+def related_page_score(url: str, text: str = "") -> float:
+    """Relevanz einer Unterseite fuer Kontaktdaten: Schluesselwoerter in Pfad und Linktext, tiefe Pfade abgewertet."""
+    raw_path = unquote(urlparse(url).path).lower()
+    if not raw_path.strip("/") or raw_path.endswith(RELATED_SKIP_SUFFIXES):
+        return 0.0
+    path = SEPARATOR_RE.sub(" ", fold_text(raw_path)).strip()
+    label = " ".join(fold_text(text).split())
+    if any(hint in path or hint in label for hint in RELATED_NEGATIVE_HINTS):
+        return 0.0
+    path_score = max((weight for keyword, weight in RELATED_KEYWORDS.items() if keyword in path), default=0.0)
+    text_score = max((weight for keyword, weight in RELATED_KEYWORDS.items() if keyword in label), default=0.0)
+    if not path_score and not text_score:
+        return 0.0
+    depth = raw_path.strip("/").count("/") + 1
+    return path_score + text_score - 0.25 * max(0, depth - 2)
+
+
+def _nav_links(anchors: List[Tuple[int, str, str]], url: str, base_domain: str) -> List[Dict[str, str]]:
+    own_key = url_key(url)
+    ranked: List[Tuple[float, int, str, str]] = []
+    scored: set[Tuple[str, str]] = set()
+    for order, href, text in anchors:
+        if (href, text) in scored:
+            continue
+        scored.add((href, text))
+        if not RELATED_HINT_RE.search(href) and not RELATED_HINT_RE.search(text):
             continue
-        if href.startswith("#") or href.startswith("mailto:"):
+        score = related_page_score(href, text)
+        if score <= 0:
             continue
         absolute = urljoin(url, href)
-        parsed_link = urlparse(absolute)
-        if not parsed_link.scheme.startswith("http"):
+        if not urlparse(absolute).scheme.startswith("http") or domain_key(absolute) != base_domain:
+            continue
+        ranked.append((-score, order, canonical_url(absolute), text))
+    nav: List[Dict[str, str]] = []
+    seen: set[str] = {own_key}
+    for _, _, target, text in sorted(ranked):
+        key = url_key(target)
+        if key in seen:
             continue
-        domain = parsed_link.netloc.lower()
-        if domain == base_domain:
+        seen.add(key)
+        nav.append({"url": target, "text": text})
+        if len(nav) >= NAV_LINK_LIMIT:
+            break
+    return nav
+
+
+def _link_target(href: str, url: str, base_domain: str) -> Optional[str]:
+    href = href.strip()
+    if not href or href.startswith("#") or href.startswith("mailto:"):
+        return None
+    if not ABSOLUTE_HREF_RE.match(href):
+        return None
+    absolute = urljoin(url, href)
+    if not urlparse(absolute).scheme.startswith("http"):
+        return None
+    if domain_key(absolute) == base_domain:
+        return None
+    return canonical_url(absolute)
+
+
+def _extract_page(doc: html.HtmlElement, url: str) -> _PageExtract:
+    """
+    Sammelt Titel, Zusammenfassung, Highlights, Kontakte, externe Links und
+    relevante interne Links (Navigation) in einem einzigen Durchlauf
+    (`iterwalk`) statt mehrerer XPath-Scans.
+
+    Der Text wird als Liste von Textknoten mitgefuehrt; der Text eines `<p>`,
+    `<li>` oder `<a>` ist der Abschnitt seit dessen Start. Absaetze, Listenpunkte
+    und Links werden nur verfolgt, bis ihr Limit erreicht ist.
+    """
+    base_domain = domain_key(url)
+    parts: List[str] = []
+    titles: List[str] = []
+    paragraphs: List[Tuple[int, str]] = []
+    bullets: List[Tuple[int, str]] = []
+    mailtos: List[Tuple[int, str, str]] = []
+    anchors: List[Tuple[int, str, str]] = []
+    tracked_anchors = 0
+    links: List[str] = []
+    link_keys: set[str] = set()
+    open_nodes: Dict[object, Tuple[int, int]] = {}
+    open_paragraphs = 0
+    open_bullets = 0
+    summary_seen = False
+    summary_found = False
+    bullets_done = False
+    bullet_texts: set[str] = set()
+    doc_span = [0, 0]
+    order = 0
+
+    for event, node in etree.iterwalk(doc.getroottree().getroot(), events=("start", "end", "comment", "pi")):
+        if event in {"comment", "pi"}:
+            if node.tail:
+                parts.append(node.tail)
             continue
-        normalized = absolute.rstrip("/")
-        if normalized in seen:
+        tag = node.tag if isinstance(node.tag, str) else ""
+        if event == "start":
+            if node is doc:
+                doc_span[0] = len(parts)
+            order += 1
+            if tag == "title":
+                titles.extend([node.text] if node.text else [])
+                titles.extend(child.tail for child in node if child.tail)
+            elif tag == "p" and not summary_found:
+                open_nodes[node] = (order, len(parts))
+                open_paragraphs += 1
+            elif tag == "li" and not bullets_done:
+                open_nodes[node] = (order, len(parts))
+                open_bullets += 1
+            elif tag == "a" and "href" in node.attrib:
+                href = node.attrib.get("href", "")
+                if href.startswith("mailto:"):
+                    open_nodes[node] = (order, len(parts))
+                elif tracked_anchors < NAV_SCAN_LIMIT:
+                    tracked_anchors += 1
+                    open_nodes[node] = (order, len(parts))
+                if not href.startswith("mailto:") and len(links) < LINK_LIMIT:
+                    target = _link_target(href, url, base_domain)
+                    key = url_key(target) if target else ""
+                    if target and key not in link_keys:
+                        link_keys.add(key)
+                        links.append(target)
+            if node.text:
+                parts.append(node.text)
             continue
-        seen.add(normalized)
-        links.append(normalized)
-        if len(links) >= LINK_LIMIT:
+
+        opened = open_nodes.pop(node, None)
+        if opened is not None:
+            started, offset = opened
+            text = _normalize_space("".join(parts[offset:]))
+            if tag == "p":
+                paragraphs.append((started, text))
+                open_paragraphs -= 1
+                summary_seen = summary_seen or SUMMARY_MIN_CHARS <= len(text) <= SUMMARY_MAX_CHARS
+                # Spaetere <p> starten nach allen bisherigen; ein Treffer genuegt.
+                summary_found = summary_seen and open_paragraphs == 0
+            elif tag == "li":
+                bullets.append((started, text))
+                open_bullets -= 1
+                if 20 <= len(text) <= 200:
+                    bullet_texts.add(text)
+                bullets_done = open_bullets == 0 and len(bullet_texts) >= HIGHLIGHT_LIMIT
+            else:
+                href = node.attrib.get("href", "")
+                if href.startswith("mailto:"):
+                    mailtos.append((started, href, text))
+                elif href.strip() and not href.strip().startswith("#"):
+                    anchors.append((started, href.strip(), text))
+        if node is doc:
+            doc_span[1] = len(parts)
+        if node.tail:
+            parts.append(node.tail)
+
+    paragraphs.sort()
+    bullets.sort()
+    mailtos.sort()
+    full_text = _normalize_space("".join(parts[doc_span[0] : doc_span[1]]))
+
+    summary = next((text for _, text in paragraphs if SUMMARY_MIN_CHARS <= len(text) <= SUMMARY_MAX_CHARS), None)
+    if summary is None:
+        summary = (paragraphs[0][1] if paragraphs else full_text)[:SUMMARY_MAX_CHARS]
+
+    highlights: List[str] = []
+    for _, text in bullets:
+        if 20 <= len(text) <= 200 and text not in highlights:
+            highlights.append(text)
+        if len(highlights) >= HIGHLIGHT_LIMIT:
             break
-    return links
+
+    collector = _ContactCollector(url)
+    for _, href, text in mailtos:
+        collector.add(href.split("mailto:")[-1].split("?")[0], name=text, context="mailto link")
+    if "@" in full_text:
+        for match in _find_emails(full_text):
+            collector.add(match, context="page text")
+        if not collector.contacts:
+            # Suche nach Kontaktblöcken (Impressum/Kontakt)
+            for section in doc.iter("section"):
+                section_text = _normalize_space(section.text_content())
+                lowered = section_text.lower()
+                if "kontakt" in lowered or "impressum" in lowered:
+                    for match in EMAIL_RE.findall(section_text):
+                        collector.add(match, context="contact section")
+
+    return _PageExtract(
+        title=" ".join(titles),
+        summary=summary,
+        highlights=highlights,
+        contacts=collector.contacts,
+        links=links,
+        nav_links=_nav_links(anchors, url, base_domain),
+    )
 
 
 def _detect_location(text: str) -> Optional[str]:
@@ -196,47 +563,28 @@ def _detect_location(text: str) -> Optional[str]:
     return None
 
 
-def _strip_encoding_declaration(text: str) -> str:
-    return XML_DECLARATION_RE.sub("", text, count=1)
-
-
-def _parse_snapshot(url: str, html_text: str) -> SiteSnapshot:
-    sanitized = _strip_encoding_declaration(html_text)
+def _parse_snapshot(url: str, body: bytes, charset: Optional[str] = None) -> SiteSnapshot:
+    """Parst die Roh-Bytes genau einmal; `charset` ist die erkannte Kodierung (sonst Erkennung)."""
+    charset = charset or detect_charset(body)
     try:
-        doc = html.fromstring(sanitized)
-    except ValueError as exc:
-        message = str(exc)
-        if "encoding declaration" in message.lower():
-            try:
-                doc = html.fromstring(sanitized.encode("utf-8", errors="ignore"))
-            except ValueError as inner_exc:
-                raise SiteScraperError(f"Fehler beim HTML-Parsing für {url}: {inner_exc}") from inner_exc
-        else:
-            raise SiteScraperError(f"Fehler beim HTML-Parsing für {url}: {exc}") from exc
-    title = (" ".join(doc.xpath("//title/text()")) or url).strip()
-    summary = _extract_summary(doc)
-    highlights = _extract_highlights(doc)
-    location = _detect_location(summary + " " + " ".join(highlights))
-    contacts = _extract_contacts(doc, url)
+        doc = parse_html_bytes(body, charset)
+    except HtmlDecodingError as exc:
+        raise SiteScraperError(f"Fehler beim HTML-Parsing für {url}: {exc}") from exc
+    page = _extract_page(doc, url)
     return SiteSnapshot(
         url=url,
-        title=title,
-        summary=summary,
-        highlights=highlights,
-        detected_location=location,
-        contacts=contacts,
-        links=_extract_links(doc, url),
+        title=(page.title or url).strip(),
+        summary=page.summary,
+        highlights=page.highlights,
+        detected_location=_detect_location(page.summary + " " + " ".join(page.highlights)),
+        contacts=page.contacts,
+        links=page.links,
+        nav_links=page.nav_links,
+        charset=charset,
     )
 
 
-def load_cached_snapshot(url: str) -> Optional[SiteSnapshot]:
-    path = _cache_path(url)
-    if not path.exists():
-        return None
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        return None
+def _snapshot_from_payload(payload: Dict, url: str) -> SiteSnapshot:
     contacts: List[ContactInfo] = []
     for entry in payload.get("contacts", []) or []:
         if not isinstance(entry, dict):
@@ -260,38 +608,127 @@ def load_cached_snapshot(url: str) -> Optional[SiteSnapshot]:
         detected_location=payload.get("detected_location"),
         contacts=contacts,
         links=payload.get("links", []) or [],
+        etag=payload.get("etag", "") or "",
+        last_modified=payload.get("last_modified", "") or "",
+        fetched_at=payload.get("fetched_at") or payload.get("generated_at", ""),
+        content_hash=payload.get("content_hash", "") or "",
+        nav_links=[
+            {"url": str(item.get("url")), "text": str(item.get("text") or "")}
+            for item in payload.get("nav_links", []) or []
+            if isinstance(item, dict) and item.get("url")
+        ],
+        charset=payload.get("charset", "") or "",
     )
 
 
-def store_snapshot(snapshot: SiteSnapshot) -> Path:
-    path = _cache_path(snapshot.url)
+def _read_snapshot_file(path: Path, url: str = "") -> Optional[SiteSnapshot]:
+    payload = SnapshotStore.read_path(path)
+    return _snapshot_from_payload(payload, url) if payload is not None else None
+
+
+def load_cached_snapshot(url: str) -> Optional[SiteSnapshot]:
+    payload = get_snapshot_store().read(url)
+    return _snapshot_from_payload(payload, url) if payload is not None else None
+
+
+def load_domain_snapshots(url: str) -> List[SiteSnapshot]:
+    """Alle gespeicherten Snapshots der Domain von `url` (ohne Netz)."""
+    snapshots = (_read_snapshot_file(path) for path in get_snapshot_store().domain_paths(url))
+    return [snapshot for snapshot in snapshots if snapshot is not None]
+
+
+def store_snapshot(snapshot: SiteSnapshot, path: Optional[Path] = None, *, store: Optional[SnapshotStore] = None) -> Path:
     payload = asdict(snapshot)
     payload["generated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    return path
+    return (store or get_snapshot_store()).write(snapshot.url, payload, path)
 
 
-def fetch_site_snapshot(url: str, *, use_cache: bool = True, retries: int = 1, backoff: float = 2.0) -> Optional[SiteSnapshot]:
-    if use_cache:
-        cached = load_cached_snapshot(url)
-        if cached:
-            return cached
-    attempt = 0
-    while attempt <= retries:
+def _ingest_page(url: str, body: bytes, content_type: str = "") -> SiteSnapshot:
+    """Legt das Roh-HTML im PageStore ab und parst es (Charset aus Header, BOM oder Meta-Tag)."""
+    digest = PageStore().put(body)
+    snapshot = _parse_snapshot(url, body, detect_charset(body, charset_from_content_type(content_type)))
+    snapshot.content_hash = digest
+    return snapshot
+
+
+async def _load_snapshot(
+    url: str, *, use_cache: bool, retries: int, backoff: float, max_age: Optional[float]
+) -> SiteSnapshot:
+    """Wie `_load_snapshot_once`; parallele Aufrufe fuer dieselbe Seite teilen sich einen Abruf."""
+    return await _FLIGHTS.run(
+        ("page", url_key(url), use_cache, max_age),
+        lambda: _load_snapshot_once(url, use_cache=use_cache, retries=retries, backoff=backoff, max_age=max_age),
+    )
+
+
+async def _load_snapshot_once(
+    url: str, *, use_cache: bool, retries: int, backoff: float, max_age: Optional[float]
+) -> SiteSnapshot:
+    """
+    Liefert den Snapshot einer Seite oder wirft `SiteScraperError`.
+
+    `use_cache=True`: frische Cache-Eintraege direkt, abgelaufene per bedingtem GET
+    revalidieren (bei Fehlern bleibt der alte Snapshot gueltig). `use_cache=False`
+    laedt die Seite vollstaendig neu. 404/410 werden nicht wiederholt, Hosts mit
+    offenem Circuit nicht angefragt (ein vorhandener Snapshot bleibt gueltig).
+    """
+    cached = load_cached_snapshot(url) if use_cache else None
+    if cached and snapshot_is_fresh(cached, max_age):
+        return cached
+    memory = get_fetch_memory()
+    if memory.is_skipped(url):
+        raise SiteScraperError(f"{url} übersprungen (kein HTML oder zu gross)", reason="skipped")
+    for attempt in range(retries + 1):
         try:
-            html_text = _fetch(url)
-            snapshot = _parse_snapshot(url, html_text)
+            response = await _fetch(url, headers=_validators(cached))
+            etag, last_modified = _response_validators(response)
+            fetched_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            if response.status == 304 and cached:
+                cached.etag = etag or cached.etag
+                cached.last_modified = last_modified or cached.last_modified
+                cached.fetched_at = fetched_at
+                store_snapshot(cached)
+                return cached
+            snapshot = await run_parse(_ingest_page, url, response.body, response.headers.get("content-type", ""))
+            snapshot.etag, snapshot.last_modified, snapshot.fetched_at = etag, last_modified, fetched_at
             store_snapshot(snapshot)
             return snapshot
-        except SiteScraperError:
-            attempt += 1
-            if attempt > retries:
-                return None
-            time.sleep(backoff * attempt)
-    return None
+        except SiteScraperError as exc:
+            if exc.reason == CIRCUIT_OPEN:
+                if cached:
+                    return cached
+                raise
+            if exc.reason:
+                memory.record_skipped(url, exc.reason)
+                raise
+            if attempt >= retries or exc.status in MISSING_STATUSES:
+                if cached:
+                    return cached
+                raise
+            # Backoff ausserhalb der Slots, damit andere Seiten des Hosts weiterlaufen.
+            await asyncio.sleep(backoff * (attempt + 1))
+    raise SiteScraperError(f"{url} nicht erreichbar")  # pragma: no cover
+
+
+async def fetch_site_snapshot_async(
+    url: str,
+    *,
+    use_cache: bool = True,
+    retries: int = 1,
+    backoff: float = 2.0,
+    max_age: Optional[float] = None,
+) -> Optional[SiteSnapshot]:
+    try:
+        return await _load_snapshot(url, use_cache=use_cache, retries=retries, backoff=backoff, max_age=max_age)
+    except SiteScraperError:
+        return None
 
 
-def build_related_urls(url: str, hints: Iterable[str] = RELATED_PATH_HINTS) -> List[str]:
+def fetch_site_snapshot(url: str, *, use_cache: bool = True, retries: int = 1, backoff: float = 2.0) -> Optional[SiteSnapshot]:
+    return run_sync(fetch_site_snapshot_async(url, use_cache=use_cache, retries=retries, backoff=backoff))
+
+
+def build_related_urls(url: str, hints: Iterable[str] = RELATED_PATH_HINTS, *, limit: int = MAX_RELATED_PAGES) -> List[str]:
     parsed = urlparse(url)
     base = f"{parsed.scheme}://{parsed.netloc}"
     related: List[str] = []
@@ -305,18 +742,238 @@ def build_related_urls(url: str, hints: Iterable[str] = RELATED_PATH_HINTS) -> L
             continue
         seen.add(candidate)
         related.append(candidate)
-        if len(related) >= MAX_RELATED_PAGES:
+        if len(related) >= limit:
             break
     return related
 
 
+def _robots_sitemaps(text: str, base: str) -> List[str]:
+    sitemaps: List[str] = []
+    for line in text.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip().lower() == "sitemap" and value.strip():
+            sitemaps.append(urljoin(base, value.strip()))
+    return sitemaps
+
+
+def _parse_sitemap(body: bytes) -> Tuple[List[str], List[str]]:
+    """Liefert (Seiten-URLs, Unter-Sitemaps) aus `<urlset>` bzw. `<sitemapindex>`."""
+    if body[:2] == b"\x1f\x8b":
+        try:
+            body = gzip.decompress(body)
+        except (OSError, EOFError):
+            return [], []
+    try:
+        root = etree.fromstring(body, parser=etree.XMLParser(recover=True, resolve_entities=False, no_network=True))
+    except etree.XMLSyntaxError:
+        return [], []
+    if root is None:
+        return [], []
+    locs = [
+        (node.text or "").strip()
+        for node in root.iter()
+        if isinstance(node.tag, str) and etree.QName(node).localname == "loc" and (node.text or "").strip()
+    ]
+    if etree.QName(root).localname == "sitemapindex":
+        return [], locs
+    return locs, []
+
+
+async def discover_sitemap_urls(url: str, *, memory: Optional[FetchMemory] = None) -> List[str]:
+    """Relevante Seiten der Domain aus `robots.txt`/`sitemap.xml` (pro Domain zwischengespeichert)."""
+    memory = memory or get_fetch_memory()
+    return list(await _FLIGHTS.run(("sitemap", domain_key(url)), lambda: _discover_sitemap_urls(url, memory)))
+
+
+async def _discover_sitemap_urls(url: str, memory: FetchMemory) -> List[str]:
+    cached = memory.sitemap_urls(url)
+    if cached is not None:
+        return cached
+    parsed = urlparse(url)
+    base = f"{parsed.scheme}://{parsed.netloc}"
+    base_domain = domain_key(url)
+    try:
+        robots = await _fetch(f"{base}/robots.txt", accept_types=None)
+        queue = _robots_sitemaps(robots.text(), base) if robots.status == 200 else []
+    except SiteScraperError as exc:
+        if exc.reason == CIRCUIT_OPEN:
+            # Host gerade nicht erreichbar: kein leeres Ergebnis fuer die TTL merken.
+            return []
+        queue = []
+    queue = queue or [f"{base}/sitemap.xml"]
+    pages: List[str] = []
+    fetched = 0
+    while queue and fetched <= MAX_CHILD_SITEMAPS:
+        sitemap_url = queue.pop(0)
+        fetched += 1
+        try:
+            response = await _fetch(sitemap_url, accept_types=None)
+        except SiteScraperError:
+            continue
+        locs, children = await run_parse(_parse_sitemap, response.body[:MAX_SITEMAP_BYTES])
+        pages.extend(urljoin(sitemap_url, loc) for loc in locs)
+        children = [urljoin(sitemap_url, child) for child in children]
+        # WordPress & Co.: Seiten-Sitemaps vor Beitrags-/Kategorie-Sitemaps.
+        queue.extend(sorted(children, key=lambda child: "page" not in child.lower()))
+    ranked: List[Tuple[float, str]] = []
+    seen: set[str] = set()
+    for page in pages:
+        if domain_key(page) != base_domain:
+            continue
+        key = url_key(page)
+        score = related_page_score(page)
+        if score > 0 and key not in seen:
+            seen.add(key)
+            ranked.append((-score, canonical_url(page)))
+    urls = [page for _, page in sorted(ranked)[:SITEMAP_URL_LIMIT]]
+    memory.remember_sitemap(url, urls)
+    return urls
+
+
+async def discover_related_urls(
+    url: str, primary: Optional[SiteSnapshot], *, limit: int = MAX_RELATED_PAGES, memory: Optional[FetchMemory] = None
+) -> List[str]:
+    """
+    Reihenfolge: bekannte Treffer der Domain, Navigationslinks der Startseite,
+    Sitemap-Eintraege (nur wenn die Navigation nicht reicht), geratene Pfade.
+    Bekannte 404 werden uebersprungen.
+    """
+    memory = memory or get_fetch_memory()
+    ranked: List[Tuple[float, int, str]] = []
+    for idx, link in enumerate(primary.nav_links if primary else []):
+        ranked.append((-related_page_score(link["url"], link.get("text", "")), idx, link["url"]))
+    if len(ranked) < limit:
+        offset = len(ranked)
+        for idx, page in enumerate(await discover_sitemap_urls(url, memory=memory)):
+            ranked.append((-related_page_score(page), offset + idx, page))
+    discovered = [page for _, _, page in sorted(ranked)]
+    guesses = build_related_urls(url, limit=len(RELATED_PATH_HINTS))
+    return memory.plan(url, [*discovered, *guesses], limit)
+
+
+async def fetch_related_snapshots_async(
+    url: str,
+    *,
+    max_pages: int = MAX_RELATED_PAGES,
+    use_cache: bool = True,
+    retries: int = 1,
+    backoff: float = 2.0,
+    memory: Optional[FetchMemory] = None,
+    primary: Optional[SiteSnapshot] = None,
+) -> List[SiteSnapshot]:
+    """Laedt die relevantesten Unterseiten (siehe `discover_related_urls`)."""
+    memory = memory or get_fetch_memory()
+    if get_host_health().state(url) == "open":
+        return []
+    primary = primary or load_cached_snapshot(url)
+    planned = await discover_related_urls(url, primary, limit=max_pages, memory=memory)
+
+    async def load(candidate: str) -> Optional[SiteSnapshot]:
+        try:
+            snapshot = await _load_snapshot(candidate, use_cache=use_cache, retries=retries, backoff=backoff, max_age=None)
+        except SiteScraperError as exc:
+            if exc.status in MISSING_STATUSES:
+                memory.record_missing(candidate, exc.status)
+            return None
+        memory.record_ok(candidate)
+        return snapshot
+
+    results = await asyncio.gather(*(load(candidate) for candidate in planned))
+    memory.save()
+    get_host_health().save()
+    return [snapshot for snapshot in results if snapshot]
+
+
 def fetch_related_snapshots(url: str, *, max_pages: int = MAX_RELATED_PAGES, use_cache: bool = True, retries: int = 1, backoff: float = 2.0) -> List[SiteSnapshot]:
-    snapshots: List[SiteSnapshot] = []
-    for candidate in build_related_urls(url)[:max_pages]:
-        snapshot = fetch_site_snapshot(candidate, use_cache=use_cache, retries=retries, backoff=backoff)
-        if snapshot:
-            snapshots.append(snapshot)
-    return snapshots
+    return run_sync(
+        fetch_related_snapshots_async(url, max_pages=max_pages, use_cache=use_cache, retries=retries, backoff=backoff)
+    )
+
+
+def _reextract_file(path_str: str) -> str:
+    """Prozesspool-Worker: parst eine Seite erneut aus dem PageStore."""
+    path = Path(path_str)
+    old = _read_snapshot_file(path)
+    if old is None:
+        return "invalid"
+    body = PageStore().get(old.content_hash)
+    if body is None:
+        return "no_page"
+    try:
+        # Die beim Abruf erkannte Kodierung gilt weiter (der HTTP-Header ist nicht gespeichert).
+        snapshot = _parse_snapshot(old.url, body, old.charset or None)
+    except SiteScraperError:
+        return "error"
+    snapshot.etag, snapshot.last_modified = old.etag, old.last_modified
+    snapshot.fetched_at, snapshot.content_hash = old.fetched_at, old.content_hash
+    store_snapshot(snapshot, path, store=SnapshotStore(path.parents[2]))
+    return "updated"
+
+
+def reextract_all_snapshots(*, workers: Optional[int] = None, directory: Path = SNAPSHOT_DIR) -> Dict[str, int]:
+    """Wendet die aktuellen Extraktoren auf alle Snapshots mit gespeichertem HTML an (ohne Netz)."""
+    store = SnapshotStore(directory)
+    store.migrate_legacy()
+    files = sorted(str(path) for path in store.iter_paths())
+    stats: Dict[str, int] = {"snapshots": len(files)}
+    if not files:
+        return stats
+    workers = max(1, workers or os.cpu_count() or 1)
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for status in pool.map(_reextract_file, files, chunksize=chunksize):
+            stats[status] = stats.get(status, 0) + 1
+    return stats
+
+
+def prune_page_store(*, directory: Path = SNAPSHOT_DIR, pages: Optional[PageStore] = None) -> int:
+    """Loescht Roh-HTML, auf das kein Snapshot mehr verweist (z. B. nach Revalidierung ersetzt)."""
+    store = SnapshotStore(directory)
+    referenced = set()
+    for path in store.iter_paths():
+        payload = store.read_path(path) or {}
+        if payload.get("content_hash"):
+            referenced.add(str(payload["content_hash"]))
+    return (pages or PageStore()).prune(referenced)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Werkzeuge fuer den Snapshot-Cache des Site-Scrapers.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    reextract = sub.add_parser("reextract", help="Alle Snapshots offline aus dem PageStore neu extrahieren.")
+    reextract.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: CPU-Kerne).")
+    sub.add_parser("prune-pages", help="Roh-HTML ohne verweisenden Snapshot loeschen.")
+    args = parser.parse_args()
+    if args.command == "reextract":
+        stats = reextract_all_snapshots(workers=args.workers)
+        print(
+            f"Snapshots: {stats.get('snapshots', 0)}, neu extrahiert: {stats.get('updated', 0)}, "
+            f"ohne gespeichertes HTML: {stats.get('no_page', 0)}, Fehler: {stats.get('error', 0) + stats.get('invalid', 0)}"
+        )
+    if args.command in {"reextract", "prune-pages"}:
+        print(f"Verwaiste Rohseiten entfernt: {prune_page_store()}")
+
+
+__all__ = [
+    "ContactInfo",
+    "SiteSnapshot",
+    "SiteScraperError",
+    "build_related_urls",
+    "discover_related_urls",
+    "discover_sitemap_urls",
+    "fetch_related_snapshots",
+    "fetch_related_snapshots_async",
+    "fetch_site_snapshot",
+    "fetch_site_snapshot_async",
+    "load_cached_snapshot",
+    "load_domain_snapshots",
+    "prune_page_store",
+    "reextract_all_snapshots",
+    "related_page_score",
+    "snapshot_is_fresh",
+    "snapshot_ttl_seconds",
+]
 
 
-__all__ = ["ContactInfo", "SiteSnapshot", "SiteScraperError", "fetch_site_snapshot", "fetch_related_snapshots", "build_related_urls"]
+if __name__ == "__main__":
+    main()
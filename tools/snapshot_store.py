@@ -0,0 +1,105 @@
+"""
+Sharded Snapshot-Ablage des Site-Scrapers.
+
+Jeder Snapshot liegt unter `data/staging/snapshots/<aa>/<domain>/<sha256>.json`:
+der Dateiname ist der SHA-256 des Dedupe-Schluessels (`url_key`, inkl. sortierter
+Query), `<aa>` die ersten zwei Hex-Zeichen des Domain-Hashs. Damit kollidieren
+verschiedene URLs nie, ein Lookup ist ein einziger Dateizugriff, und das
+Domain-Verzeichnis dient als Index Domain -> Snapshots, ohne eine zentrale Datei
+bei jedem Schreiben neu zu schreiben.
+
+Snapshots aus dem frueheren flachen Layout (`snapshots/<slug>.json`) werden beim
+ersten Zugriff anhand der gespeicherten URL einsortiert.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from tools.url_utils import domain_key, url_key
+
+SNAPSHOT_DIR = Path("data/staging/snapshots")
+SNAPSHOT_SUFFIX = ".json"
+NO_DOMAIN = "_"
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class SnapshotStore:
+    def __init__(self, directory: Path = SNAPSHOT_DIR) -> None:
+        self.directory = directory
+
+    def domain_dir(self, url: str) -> Path:
+        domain = domain_key(url) or NO_DOMAIN
+        return self.directory / _digest(domain)[:2] / domain
+
+    def path_for(self, url: str) -> Path:
+        return self.domain_dir(url) / f"{_digest(url_key(url))}{SNAPSHOT_SUFFIX}"
+
+    def read(self, url: str) -> Optional[Dict]:
+        return self.read_path(self.path_for(url))
+
+    @staticmethod
+    def read_path(path: Path) -> Optional[Dict]:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def write(self, url: str, payload: Dict, path: Optional[Path] = None) -> Path:
+        path = path or self.path_for(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Eindeutiger Temp-Name: Scraper-Threads und Reextract-Prozesse schreiben parallel.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp_path.replace(path)
+        return path
+
+    def domain_paths(self, url_or_domain: str) -> List[Path]:
+        """Alle Snapshot-Dateien einer Domain (Index ueber das Domain-Verzeichnis)."""
+        return sorted(self.domain_dir(url_or_domain).glob(f"*{SNAPSHOT_SUFFIX}"))
+
+    def iter_paths(self) -> Iterator[Path]:
+        yield from self.directory.glob(f"*/*/*{SNAPSHOT_SUFFIX}")
+
+    def migrate_legacy(self) -> int:
+        """Sortiert flache Snapshots (`<slug>.json`) in das Shard-Layout ein; liefert die Anzahl."""
+        moved = 0
+        for path in self.directory.glob(f"*{SNAPSHOT_SUFFIX}"):
+            payload = self.read_path(path)
+            url = str((payload or {}).get("url") or "")
+            if not url:
+                continue
+            target = self.path_for(url)
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                path.replace(target)
+                moved += 1
+            else:
+                path.unlink(missing_ok=True)
+        return moved
+
+
+_STORE: Optional[SnapshotStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = SnapshotStore()
+            if _STORE.directory.is_dir():
+                _STORE.migrate_legacy()
+        return _STORE
+
+
+__all__ = ["SNAPSHOT_DIR", "SnapshotStore", "get_snapshot_store"]
@@ -0,0 +1,106 @@
+"""
+Gemeinsame URL-Kanonisierung fuer Suche, Scraper, Directory-Expansion und Blacklist.
+
+`canonical_url` liefert eine abrufbare, bereinigte URL (Host klein, Default-Port,
+Fragment, Tracking-Parameter und abschliessender Slash entfernt). `url_key`
+ignoriert zusaetzlich Schema und `www.` und dient als Dedupe-Schluessel;
+`domain_key` ist der registrierbare Host ohne `www.` und Port (IPv6-Literale
+bleiben in eckigen Klammern).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, Tuple
+from urllib.parse import SplitResult, parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAM_PREFIXES = ("utm_", "pk_", "mtm_")
+TRACKING_PARAMS = {
+    "_ga",
+    "_gl",
+    "fbclid",
+    "gclid",
+    "dclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "msclkid",
+    "ref_src",
+    "yclid",
+}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# `mailto:`, `tel:`, `javascript:` ... (ohne Punkt, damit `host.de:8080` nicht matcht)
+_OTHER_SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+-]*:(?!//)")
+
+
+def _split(url: str) -> SplitResult:
+    value = url.strip()
+    if "://" not in value and not value.startswith("//") and not _OTHER_SCHEME_RE.match(value):
+        value = f"//{value}"
+    return urlsplit(value)
+
+
+def _host(parts: SplitResult) -> str:
+    if parts.scheme and parts.scheme.lower() not in DEFAULT_PORTS:
+        return ""
+    host = (parts.hostname or "").rstrip(".")
+    if ":" in host:
+        # IPv6-Literal: `hostname` entfernt die Klammern, ohne sie waere der Port nicht mehr eindeutig.
+        return f"[{host}]"
+    if host.isascii():
+        return host
+    try:
+        return host.encode("idna").decode("ascii")
+    except UnicodeError:
+        return host
+
+
+def _clean_query(query: str) -> List[Tuple[str, str]]:
+    return [
+        (key, value)
+        for key, value in parse_qsl(query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ]
+
+
+def canonical_url(url: str) -> str:
+    """Bereinigte URL mit Schema; unbekannte Formen werden nur getrimmt zurueckgegeben."""
+    parts = _split(url)
+    host = _host(parts)
+    if not host:
+        return url.strip()
+    scheme = (parts.scheme or "https").lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port in (None, DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+    path = parts.path.rstrip("/")
+    query = urlencode(_clean_query(parts.query), doseq=True)
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def domain_key(url: str) -> str:
+    host = _host(_split(url))
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+def url_key(url: str) -> str:
+    """Dedupe-Schluessel: kanonische URL ohne Schema/`www.`, Query-Parameter sortiert."""
+    parts = _split(canonical_url(url))
+    host = domain_key(url)
+    if not host:
+        return url.strip().lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port:
+        host = f"{host}:{port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)), doseq=True)
+    return f"{host}{parts.path}" + (f"?{query}" if query else "")
+
+
+__all__ = ["canonical_url", "domain_key", "url_key"]
@@ -7,15 +7,18 @@ Provides a thin wrapper that runs a dedicated search agent with the hosted
 
 from __future__ import annotations
 
+import asyncio
 import json
 from dataclasses import dataclass
-from typing import List, Sequence
+from typing import Dict, List, Optional, Sequence
 
 from agents import Agent, Runner
 from agents.model_settings import ModelSettings
 from agents.models.openai_responses import OpenAIResponsesModel
 from agents.tool import WebSearchTool
 
+from tools.rate_limiter import get_limiter
+
 
 @dataclass
 class WebSearchAgentResult:
@@ -34,53 +37,40 @@ def _extract_json_block(text: str) -> str:
     return "{}"
 
 
-async def run_web_search_agent(
-    model: OpenAIResponsesModel,
-    *,
-    query: str,
-    max_results: int,
-    location_hint: str | None = None,
-) -> List[WebSearchAgentResult]:
-    """
-    Executes a web search through OpenAI's hosted WebSearchTool.
-    """
+SEARCH_INSTRUCTIONS = (
+    "Du recherchierst zielsicher nach nicht-kommerziellen Maker:innen, Hackspaces, "
+    "offenen Werkstätten und ähnlichen Projekten. "
+)
+DEFAULT_BATCH_SIZE = 5
 
-    location_note = (
-        f"Die Ergebnisse sollen sich, wenn möglich, auf {location_hint} beziehen.\n"
-        if location_hint
-        else ""
-    )
-    agent = Agent(
+
+def _build_agent(model: OpenAIResponsesModel, response_format: str) -> Agent:
+    return Agent(
         name="WebSearchAgent",
         instructions=(
-            "Du recherchierst zielsicher nach nicht-kommerziellen Maker:innen, Hackspaces, "
-            "offenen Werkstätten und ähnlichen Projekten. "
-            "Nutze das bereitgestellte web_search Tool und antworte ausschließlich mit JSON:\n"
-            '{"results": [{"title": "...", "url": "...", "snippet": "..."}]}\n'
-            "Gib maximal die angeforderte Anzahl an Treffern zurück. "
+            SEARCH_INSTRUCTIONS
+            + "Nutze das bereitgestellte web_search Tool und antworte ausschließlich mit JSON:\n"
+            + response_format
+            + "\nGib maximal die angeforderte Anzahl an Treffern zurück. "
             "Konzentriere dich auf Quellen, die echte Projekte oder Vereine beschreiben."
         ),
         model=model,
         tools=[WebSearchTool()],
         model_settings=ModelSettings(tool_choice="required"),
     )
-    prompt = (
-        f"{location_note}"
-        "Auftrag:\n"
-        f"Suche nach: {query}\n"
-        f"Gib bis zu {max_results} qualitativ hochwertige Treffer zurueck."
-        "Fasse jeden Treffer in 30-40 Woertern zusammen."
-    )
-    result = await Runner.run(agent, prompt)
-    raw = result.final_output or "{}"
-    try:
-        data = json.loads(_extract_json_block(raw))
-    except json.JSONDecodeError:
-        data = {}
 
-    entries: Sequence[dict] = data.get("results") or []
+
+def _location_note(location_hint: str | None) -> str:
+    if not location_hint:
+        return ""
+    return f"Die Ergebnisse sollen sich, wenn möglich, auf {location_hint} beziehen.\n"
+
+
+def _parse_entries(query: str, entries: Sequence[dict]) -> List[WebSearchAgentResult]:
     parsed: List[WebSearchAgentResult] = []
     for item in entries:
+        if not isinstance(item, dict):
+            continue
         title = str(item.get("title") or "").strip()
         url = str(item.get("url") or "").strip()
         snippet = str(item.get("snippet") or "").strip()
@@ -95,3 +85,135 @@ async def run_web_search_agent(
             )
         )
     return parsed
+
+
+async def run_web_search_agent(
+    model: OpenAIResponsesModel,
+    *,
+    query: str,
+    max_results: int,
+    location_hint: str | None = None,
+) -> List[WebSearchAgentResult]:
+    """
+    Executes a web search through OpenAI's hosted WebSearchTool.
+    """
+
+    agent = _build_agent(model, '{"results": [{"title": "...", "url": "...", "snippet": "..."}]}')
+    prompt = (
+        f"{_location_note(location_hint)}"
+        "Auftrag:\n"
+        f"Suche nach: {query}\n"
+        f"Gib bis zu {max_results} qualitativ hochwertige Treffer zurueck."
+        "Fasse jeden Treffer in 30-40 Woertern zusammen."
+    )
+    await get_limiter("web_tool").acquire()
+    result = await Runner.run(agent, prompt)
+    raw = result.final_output or "{}"
+    try:
+        data = json.loads(_extract_json_block(raw))
+    except json.JSONDecodeError:
+        data = {}
+
+    return _parse_entries(query, data.get("results") or [])
+
+
+async def _run_batch_once(
+    model: OpenAIResponsesModel,
+    queries: Sequence[str],
+    *,
+    max_results: int,
+    location_hint: str | None,
+) -> Optional[Dict[str, List[WebSearchAgentResult]]]:
+    """Ein Agent-Lauf fuer mehrere Queries; None, wenn die Antwort kein vollstaendiges JSON ist."""
+    agent = _build_agent(
+        model,
+        '{"queries": [{"id": 1, "results": [{"title": "...", "url": "...", "snippet": "..."}]}]}',
+    )
+    listing = "\n".join(f"{idx}. {query}" for idx, query in enumerate(queries, start=1))
+    prompt = (
+        f"{_location_note(location_hint)}"
+        "Auftrag:\n"
+        "Fuehre fuer jede der folgenden Suchen eine eigene Websuche aus:\n"
+        f"{listing}\n"
+        f"Gib pro Suche bis zu {max_results} qualitativ hochwertige Treffer zurueck, "
+        "gruppiert nach der Nummer der Suche (`id`). "
+        "Fasse jeden Treffer in 20-30 Woertern zusammen."
+    )
+    await get_limiter("web_tool").acquire()
+    result = await Runner.run(agent, prompt)
+    try:
+        data = json.loads(_extract_json_block(result.final_output or ""))
+    except json.JSONDecodeError:
+        return None
+    grouped: Dict[str, List[WebSearchAgentResult]] = {}
+    for group in data.get("queries") or []:
+        if not isinstance(group, dict):
+            continue
+        try:
+            idx = int(group.get("id")) - 1
+        except (TypeError, ValueError):
+            continue
+        if 0 <= idx < len(queries):
+            grouped[queries[idx]] = _parse_entries(queries[idx], group.get("results") or [])
+    return grouped or None
+
+
+async def _run_batch(
+    model: OpenAIResponsesModel,
+    queries: Sequence[str],
+    *,
+    max_results: int,
+    location_hint: str | None,
+) -> Dict[str, List[WebSearchAgentResult]]:
+    if len(queries) == 1:
+        results = await run_web_search_agent(
+            model,
+            query=queries[0],
+            max_results=max_results,
+            location_hint=location_hint,
+        )
+        return {queries[0]: results}
+    grouped = await _run_batch_once(model, queries, max_results=max_results, location_hint=location_hint)
+    if grouped is None:
+        # Abgeschnittene/kaputte Antwort: Batch halbieren und getrennt wiederholen.
+        print(f"[WebSearchAgent] Batch mit {len(queries)} Queries unvollstaendig, teile auf.")
+        grouped = {}
+        middle = len(queries) // 2
+        for part in (queries[:middle], queries[middle:]):
+            grouped.update(await _run_batch(model, part, max_results=max_results, location_hint=location_hint))
+        return grouped
+    missing = [query for query in queries if query not in grouped]
+    if missing:
+        grouped.update(await _run_batch(model, missing, max_results=max_results, location_hint=location_hint))
+    return grouped
+
+
+async def run_web_search_batch(
+    model: OpenAIResponsesModel,
+    queries: Sequence[str],
+    *,
+    max_results: int,
+    location_hint: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, List[WebSearchAgentResult]]:
+    """
+    Runs several searches per hosted-search call and returns results grouped by query.
+
+    Queries are sent in chunks of `batch_size`; chunks run concurrently (paced by
+    the web_tool limiter). Chunks that fail are left out of the result, so callers
+    can fall back to `run_web_search_agent` for those queries.
+    """
+    unique = list(dict.fromkeys(query for query in queries if query.strip()))
+    size = max(1, batch_size)
+    chunks = [unique[idx : idx + size] for idx in range(0, len(unique), size)]
+    outcomes = await asyncio.gather(
+        *(_run_batch(model, chunk, max_results=max_results, location_hint=location_hint) for chunk in chunks),
+        return_exceptions=True,
+    )
+    grouped: Dict[str, List[WebSearchAgentResult]] = {}
+    for chunk, outcome in zip(chunks, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"[WebSearchAgent] Batch {chunk} fehlgeschlagen: {outcome}")
+            continue
+        grouped.update(outcome)
+    return grouped
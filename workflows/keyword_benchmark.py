@@ -0,0 +1,99 @@
+"""
+Micro-Benchmark: kompilierte Keyword-Matcher gegen die frueheren `any(...)`-Schleifen.
+
+Texte stammen aus den gespeicherten Snapshots (Titel, Zusammenfassung,
+Highlights, Linktexte der Navigation) bzw. aus synthetischen Vereinsseiten,
+wenn noch keine Snapshots vorliegen. Gemessen wird pro Heuristik die Zeit pro
+Text fuer Schleife und Matcher sowie die Zahl abweichender Ergebnisse
+(erwartet nur bei `OFF_REGION_KEYWORDS`, die der Matcher am Wortanfang prueft).
+
+    python -m workflows.keyword_benchmark [--texts 2000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, List, Sequence, Tuple
+
+from tools.directory_parser import ENTRY_KEYWORDS, ENTRY_MATCHER
+from tools.snapshot_store import SnapshotStore
+from workflows.research_pipeline import (
+    DIRECTORY_HINT_KEYWORDS,
+    DIRECTORY_HINT_MATCHER,
+    OFF_REGION_KEYWORDS,
+    OFF_REGION_MATCHER,
+)
+
+WORDS = (
+    "verein werkstatt makerspace offene hackerspace treffen lübeck niedersachsen interessen kiel "
+    "übersicht netzwerk fablab repair café projekte mitglieder kontakt impressum essen hamburg"
+).split()
+
+
+def snapshot_texts(limit: int) -> List[str]:
+    texts: List[str] = []
+    store = SnapshotStore()
+    for path in store.iter_paths():
+        payload = store.read_path(path) or {}
+        texts.append(" ".join([str(payload.get("title") or ""), str(payload.get("summary") or "")]))
+        texts.append(" ".join(str(item) for item in payload.get("highlights") or []))
+        texts.extend(str(link.get("text") or "") for link in payload.get("nav_links") or [] if isinstance(link, dict))
+        if len(texts) >= limit:
+            break
+    return [text for text in texts if text.strip()][:limit]
+
+
+def synthetic_texts(count: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 60))) for _ in range(count)]
+
+
+def _time(func: Callable[[str], object], texts: Sequence[str], repeat: int) -> Tuple[float, List[object]]:
+    results = [func(text) for text in texts]
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - started) / (repeat * len(texts)) * 1e6, results
+
+
+CASES = (
+    ("directory_hints", lambda t: any(k in t.lower() for k in DIRECTORY_HINT_KEYWORDS), DIRECTORY_HINT_MATCHER.search),
+    ("entry_anchor", lambda t: any(k in t.lower() for k in ENTRY_KEYWORDS), ENTRY_MATCHER.search),
+    ("off_region", lambda t: any(k in t.lower() for k in OFF_REGION_KEYWORDS), OFF_REGION_MATCHER.search),
+)
+
+
+def run_benchmark(texts: Sequence[str], repeat: int = 5) -> List[Tuple[str, float, float, int]]:
+    """Liefert (heuristik, us_schleife, us_matcher, abweichungen) pro Fall."""
+    rows: List[Tuple[str, float, float, int]] = []
+    for name, loop, matcher in CASES:
+        loop_us, loop_results = _time(loop, texts, repeat)
+        matcher_us, matcher_results = _time(matcher, texts, repeat)
+        diffs = sum(1 for old, new in zip(loop_results, matcher_results) if old != new)
+        rows.append((name, loop_us, matcher_us, diffs))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Keyword-Matcher vs. any()-Schleifen.")
+    parser.add_argument("--texts", type=int, default=2000, help="Anzahl Texte (Standard 2000).")
+    parser.add_argument("--repeat", type=int, default=5, help="Wiederholungen pro Messung.")
+    args = parser.parse_args()
+    texts = snapshot_texts(args.texts)
+    source = "Snapshots"
+    if not texts:
+        texts, source = synthetic_texts(args.texts), "synthetisch"
+    print(f"{len(texts)} Texte ({source}), Ø {sum(map(len, texts)) / len(texts):.0f} Zeichen")
+    print(f"{'heuristik':<16} {'schleife us':>11} {'matcher us':>11} {'faktor':>7} {'abweichend':>10}")
+    for name, loop_us, matcher_us, diffs in run_benchmark(texts, args.repeat):
+        print(f"{name:<16} {loop_us:>11.2f} {matcher_us:>11.2f} {loop_us / matcher_us:>7.1f} {diffs:>10}")
+
+
+__all__ = ["run_benchmark", "snapshot_texts", "synthetic_texts"]
+
+
+if __name__ == "__main__":
+    main()
@@ -20,12 +20,14 @@ import argparse
 import asyncio
 import json
 import os
+import math
 import re
+import time
 from collections import Counter
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Iterable, List, Optional, Sequence, Protocol, Tuple, Mapping
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Protocol, Tuple, Mapping
 from urllib.parse import urlparse
 
 from agents import Agent, Runner
@@ -37,30 +39,43 @@ from openai import AsyncOpenAI
 from tools.identity_loader import get_identity_summary, load_identity
 from tools.blacklist import BlacklistManager
 from tools.org_registry import OrganizationRegistry
-from tools.directory_parser import DirectoryEntry, DirectoryParserError, expand_directory
+from tools.crawl_frontier import CrawlFrontier, FrontierBudget, FrontierItem, anchor_relevance
+from tools.directory_parser import ENTRY_KEYWORDS, DirectoryEntry, DirectoryParserError, expand_directory_async
+from tools.host_health import get_host_health
+from tools.keyword_matcher import KeywordMatcher, keyword_matcher
 from workflows.brief import DEFAULT_BRIEF_PATH, CampaignBrief, load_campaign_brief, load_message_template
 from workflows.settings import PipelineSettings, load_pipeline_settings
 from tools.google_search import (
+    GoogleQuotaExceeded,
     GoogleSearchResult,
+    google_quota_remaining,
     iter_queries,
-    search_google,
-    store_search_results as store_google_results,
-    load_cached_results as load_cached_google_results,
+    search_google_async,
 )
 from tools.duckduckgo import (
     DuckDuckGoResult,
-    search_duckduckgo,
-    store_search_results as store_duckduckgo_results,
-    load_cached_results as load_cached_duckduckgo_results,
+    close_duckduckgo_client,
+    search_duckduckgo_async,
 )
+from tools.replay_search import ReplayBackend
+from tools.search_cache import get_search_cache, to_search_results
+from tools.query_dedupe import QueryIndex, canonical_query, query_tokens
+from tools.query_stats import QueryStats
+from tools.search_hedging import LatencyTracker, hedged_search
+from tools.url_utils import canonical_url, domain_key, url_key
 from tools.northdata import (
     NorthDataError,
-    fetch_suggestions,
+    fetch_suggestions_async,
     format_top_suggestion,
     store_suggestions,
 )
-from tools.site_scraper import ContactInfo, SiteSnapshot, fetch_site_snapshot, fetch_related_snapshots
-from tools.web_search_agent import run_web_search_agent
+from tools.site_scraper import (
+    ContactInfo,
+    SiteSnapshot,
+    fetch_related_snapshots_async,
+    fetch_site_snapshot_async,
+)
+from tools.web_search_agent import run_web_search_agent, run_web_search_batch
 
 
 STAGING_NOTES = Path("data/staging/research_notes.md")
@@ -86,9 +101,16 @@ DEFAULT_MAX_RESULTS_PER_QUERY = 10
 EVALUATION_ACCEPT_THRESHOLD = 0.62
 NORTHDATA_COUNTRIES = "DE"
 MAX_QA_RETRIES = 3
-DUCKDUCKGO_QUERY_DELAY = 2.5
 DEFAULT_SEARCH_RETRIES = 2
 DEFAULT_SEARCH_RETRY_BACKOFF = 3.0
+DEFAULT_QUERY_CONCURRENCY = 3
+# Suchtreffer pro Domain und Lauf, bevor weitere Treffer derselben Domain verworfen werden.
+MAX_SEARCH_CANDIDATES_PER_DOMAIN = 3
+DEFAULT_SEARCH_CACHE_MODE = "fallback"  # fallback | prefer
+DEFAULT_SEARCH_CACHE_TTL_HOURS = 168.0
+DEFAULT_QUERY_DEDUPE_TTL_DAYS = 14.0
+DEFAULT_SEARCH_HEDGE_DELAY = 8.0
+DEFAULT_WEB_SEARCH_BATCH_SIZE = 5
 PROMISE_PATTERNS = [
     r"\bversprech",
     r"\bgarantier",
@@ -140,18 +162,36 @@ OFF_REGION_KEYWORDS = [
     "münchen",
     "munchen",
     "bayern",
+    # Komposita explizit, da OFF_REGION_MATCHER nur am Wortanfang prueft.
+    "nordbayern",
+    "südbayern",
+    "suedbayern",
+    "ostbayern",
+    "oberbayern",
+    "niederbayern",
     "stuttgart",
     "rheinland",
     "saarland",
     "thüringen",
     "thueringen",
     "sachsen",
+    "nordsachsen",
+    "südsachsen",
+    "suedsachsen",
+    "ostsachsen",
+    "westsachsen",
+    "südthüringen",
+    "suedthueringen",
+    "ostthüringen",
+    "ostthueringen",
     "leipzig",
     "düsseldorf",
     "dusseldorf",
     "köln",
     "koeln",
     "berlin",
+    "ostberlin",
+    "westberlin",
     "frankfurt",
     "freiburg",
     "augsburg",
@@ -186,10 +226,19 @@ DIRECTORY_HINT_KEYWORDS = [
     "open labs",
     "labore und werkstätten",
 ]
+DIRECTORY_HINT_MATCHER = KeywordMatcher(DIRECTORY_HINT_KEYWORDS)
+# Orte nur am Wortanfang: "sachsen" soll nicht in "Niedersachsen", "essen" nicht in "Interessen" greifen.
+OFF_REGION_MATCHER = KeywordMatcher(OFF_REGION_KEYWORDS, word_start=True)
 DIRECTORY_EXPANSION_MIN_SCORE = 0.5
 DIRECTORY_MAX_ENTRIES = 25
 DIRECTORY_MAX_DEPTH = 2
 PARTNER_LINK_LIMIT = 5
+# Budgets der Crawl-Frontier fuer abgeleitete Kandidaten (pro Lauf, pro Quell-Domain, pro Tiefe).
+EXPANSION_MAX_DERIVED = 80
+EXPANSION_MAX_PER_SOURCE = 25
+EXPANSION_MAX_PER_DEPTH = 50
+# Verzeichnis-Eintraege haben Linktext und Beschreibung, Partner-Links nur die URL.
+DIRECTORY_ENTRY_PRIORITY = 0.25
 DEFAULT_PHASE = "acquire"
 DEFAULT_REGION = "nord"  # placeholder for macro areas
 
@@ -239,10 +288,10 @@ def fallback_region_queries(
     if not pool:
         return []
     remaining = max(1, min(len(pool), max(missing, 5)))
-    used = set(q.lower() for q in used_queries)
+    used = set(canonical_query(q) for q in used_queries)
     candidates: List[str] = []
     for query in pool:
-        if query.lower() in used:
+        if canonical_query(query) in used:
             continue
         candidates.append(query)
         if len(candidates) >= remaining:
@@ -269,7 +318,7 @@ def should_skip_url(url: str, brief: CampaignBrief) -> bool:
     }
     if any(lowered.endswith(suffix) for suffix in suffixes):
         return True
-    domain = urlparse(url).netloc.lower()
+    domain = domain_key(url)
     blocked_domains = {neg.lower() for neg in (brief.exclude_domains or [])} | {
         neg.lower() for neg in DEFAULT_NEGATIVE_DOMAINS
     }
@@ -278,18 +327,15 @@ def should_skip_url(url: str, brief: CampaignBrief) -> bool:
     return False
 
 
+def off_region_terms(candidate: CandidateInfo, region: str) -> List[str]:
+    """Off-Region-Begriffe im Kandidatentext (leer = Region passt oder ist unbekannt)."""
+    if not region or region.strip().lower() in {"any", "all", "global", "world"}:
+        return []
+    return sorted(OFF_REGION_MATCHER.hits(_candidate_text(candidate) + " " + candidate.source_query))
+
+
 def candidate_matches_region(candidate: CandidateInfo, region: str) -> bool:
-    if not region:
-        return True
-    if region.strip().lower() in {"any", "all", "global", "world"}:
-        return True
-    text = (_candidate_text(candidate) + " " + candidate.source_query).lower()
-    positives = NORD_REGION_KEYWORDS + REGION_POSITIVE_KEYWORDS.get(region.lower(), [])
-    if any(keyword in text for keyword in OFF_REGION_KEYWORDS):
-        return False
-    if any(keyword in text for keyword in positives):
-        return True
-    return True  # Unbekannt => nicht blockieren
+    return not off_region_terms(candidate, region)  # Positive Regionstreffer oder unbekannt => nicht blockieren
 
 
 def parse_args() -> argparse.Namespace:
@@ -350,6 +396,24 @@ def parse_args() -> argparse.Namespace:
         default=os.environ.get("PIPELINE_SEARCH_RETRIES"),
         help="Anzahl Wiederholungen pro Query bei Suchfehlern.",
     )
+    parser.add_argument(
+        "--search-cache",
+        choices=["fallback", "prefer"],
+        default=os.environ.get("PIPELINE_SEARCH_CACHE_MODE"),
+        help="fallback: Cache nur nach Suchfehlern; prefer: frische Cache-Treffer vor jedem Netzwerkaufruf.",
+    )
+    parser.add_argument(
+        "--search-backend",
+        choices=list(SEARCH_BACKENDS),
+        default=os.environ.get("PIPELINE_SEARCH_BACKEND"),
+        help="auto: Google falls konfiguriert, sonst DuckDuckGo; replay: Offline-Treffer aus data/staging/search bzw. PIPELINE_REPLAY_FIXTURE.",
+    )
+    parser.add_argument(
+        "--search-hedge",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Zweites Backend nach Verzoegerung (p90-Latenz bzw. search_hedge_delay) parallel starten; erstes Ergebnis gewinnt.",
+    )
     parser.add_argument(
         "--search-retry-backoff",
         type=float,
@@ -440,6 +504,7 @@ class CandidateInfo:
     context: Optional["CandidateContext"] = field(default=None, repr=False)
     org_slug: str = ""
     duplicate_reason: str = ""
+    root_query: str = ""
     letter_status: str = "pending"
     letter_path: str = ""
     profile_path: str = ""
@@ -488,17 +553,7 @@ def _candidate_text(candidate: CandidateInfo) -> str:
 
 
 def looks_like_directory_candidate(candidate: CandidateInfo) -> bool:
-    text = _candidate_text(candidate)
-    return any(keyword in text for keyword in DIRECTORY_HINT_KEYWORDS)
-
-
-def domain_key(url: str) -> str:
-    host = urlparse(url).netloc.lower()
-    if host.startswith("www."):
-        host = host[4:]
-    if ":" in host:
-        host = host.split(":", 1)[0]
-    return host
+    return DIRECTORY_HINT_MATCHER.search(_candidate_text(candidate))
 
 
 def default_org_slug(candidate: CandidateInfo) -> str:
@@ -699,14 +754,63 @@ def has_google_config() -> bool:
     )
 
 
-def select_search_backend() -> Tuple[
-    str,
-    Callable[..., List[SearchResult]],
-    Callable[[str, Sequence[SearchResult]], Path],
-]:
+SEARCH_BACKENDS = ("auto", "google", "duckduckgo", "replay")
+
+
+def select_search_backend(preferred: str = "auto") -> Tuple[str, Callable[..., Awaitable[List[SearchResult]]]]:
+    if preferred == "replay":
+        backend = ReplayBackend()
+        append_log("search.replay", entries=len(backend.corpus), config=str(backend.config))
+        return "replay", backend.search
+    if preferred == "google":
+        if not has_google_config():
+            raise RuntimeError("Search-Backend 'google' verlangt GOOGLE_API_KEY und GOOGLE_SEARCH_ENGINE_ID.")
+        return "google", search_google_async
+    if preferred == "duckduckgo":
+        return "duckduckgo", search_duckduckgo_async
     if has_google_config():
-        return "google", search_google, store_google_results
-    return "duckduckgo", search_duckduckgo, store_duckduckgo_results
+        return "google", search_google_async
+    return "duckduckgo", search_duckduckgo_async
+
+
+def plan_google_budget(remaining: Optional[int], query_count: int, results_per_query: int) -> Tuple[int, str]:
+    """
+    Plans one iteration against the Google quota ledger.
+
+    Returns (results_per_query, mode): `ok` (full pagination), `shrink` (fewer
+    pages per query), `cache` (serve any cached results first, one page max) or
+    `switch` (quota exhausted, use the fallback backend).
+    """
+    if remaining is None or query_count <= 0:
+        return results_per_query, "ok"
+    if remaining <= 0:
+        return results_per_query, "switch"
+    pages_per_query = math.ceil(results_per_query / 10)
+    if remaining >= query_count * pages_per_query:
+        return results_per_query, "ok"
+    if remaining >= query_count:
+        return min(results_per_query, 10 * (remaining // query_count)), "shrink"
+    return min(results_per_query, 10), "cache"
+
+
+def load_cached_search(
+    query: str,
+    backends: Sequence[str],
+    *,
+    fresh_only: bool = False,
+    max_age: Optional[float] = None,
+) -> Tuple[List[SearchResult], Optional[str]]:
+    """Looks the query up in the search cache index, backend by backend."""
+    cache = get_search_cache()
+    for backend in backends:
+        hit = cache.lookup(query, backend, fresh_only=fresh_only, max_age=max_age)
+        if hit is None:
+            continue
+        _, items = hit
+        results = to_search_results(items, query=query, backend=backend)
+        if results:
+            return list(results), backend
+    return [], None
 
 
 def extract_json_block(text: str) -> str:
@@ -824,10 +928,15 @@ def build_candidates_from_search(
     query: str, results: Sequence[SearchResult], *, brief: CampaignBrief
 ) -> List[CandidateInfo]:
     candidates: List[CandidateInfo] = []
-    exclude_terms = {term.lower() for term in (brief.exclude_text_terms or []) if term.strip()}
+    seen_keys: set[str] = set()
+    exclude_terms = keyword_matcher(sorted({term.lower() for term in (brief.exclude_text_terms or []) if term.strip()}))
     for item in results:
         if not item.url:
             continue
+        key = url_key(item.url)
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
         if should_skip_url(item.url, brief):
             append_log(
                 "search.filtered",
@@ -836,21 +945,23 @@ def build_candidates_from_search(
             )
             continue
         title = item.title or item.url
-        combined_text = f"{title} {item.snippet}".lower()
-        if exclude_terms and any(term in combined_text for term in exclude_terms):
+        excluded_hits = exclude_terms.hits(f"{title} {item.snippet}")
+        if excluded_hits:
             append_log(
                 "search.filtered",
                 url=item.url,
                 reason="negative_text",
+                terms=sorted(excluded_hits),
             )
             continue
         summary = item.snippet or ""
         candidate = CandidateInfo(
             name=title.strip(),
-            url=item.url.strip(),
+            url=canonical_url(item.url),
             summary=summary.strip(),
             source_query=query,
             snippet=item.snippet or "",
+            root_query=query,
         )
         candidates.append(candidate)
     return candidates
@@ -922,19 +1033,19 @@ def candidate_from_directory_entry(
         summary=summary,
         source_query=f"directory:{parent.url}",
         snippet=summary,
+        root_query=parent.root_query,
     )
 
 
 def candidate_from_partner_link(parent: CandidateInfo, url: str) -> CandidateInfo:
-    parsed = urlparse(url)
-    hostname = parsed.netloc.replace("www.", "")
-    name = hostname.split(":")[0] or url
+    name = domain_key(url) or url
     return CandidateInfo(
         name=name,
-        url=url,
+        url=canonical_url(url),
         summary=f"Gefunden als Partner-/Netzwerk-Link auf {parent.url}",
         source_query=f"partner:{parent.url}",
         snippet="",
+        root_query=parent.root_query,
     )
 
 
@@ -961,20 +1072,20 @@ def select_letter_candidates(
     chosen: List[CandidateInfo] = []
     seen_urls: set[str] = set()
     for candidate in ranked:
-        if candidate.url in seen_urls:
+        if url_key(candidate.url) in seen_urls:
             continue
         if looks_like_directory_candidate(candidate):
             continue
         chosen.append(candidate)
-        seen_urls.add(candidate.url)
+        seen_urls.add(url_key(candidate.url))
         if len(chosen) >= limit:
             break
     if not chosen:
         for candidate in ranked:
-            if candidate.url in seen_urls:
+            if url_key(candidate.url) in seen_urls:
                 continue
             chosen.append(candidate)
-            seen_urls.add(candidate.url)
+            seen_urls.add(url_key(candidate.url))
             if len(chosen) >= limit:
                 break
     return chosen
@@ -1153,6 +1264,20 @@ def enforce_focus_keywords(queries: Sequence[str], brief: CampaignBrief) -> List
     return normalized
 
 
+def focus_suffix_tokens(brief: CampaignBrief) -> List[str]:
+    """Tokens des von `enforce_focus_keywords` angehaengten Suffixes (fuer den Query-Vergleich irrelevant)."""
+    return query_tokens(" ".join((brief.search_focus_keywords or [])[:2]))
+
+
+def build_query_stats(brief: CampaignBrief, region: str) -> QueryStats:
+    """Query-Statistik, deren Familien Orts- und Fokus-Suffixe ignorieren."""
+    location_terms = list(NORD_REGION_KEYWORDS) + [region.replace("-", " ")]
+    for keywords in REGION_POSITIVE_KEYWORDS.values():
+        location_terms.extend(keywords)
+    ignore = focus_suffix_tokens(brief) + query_tokens(" ".join(location_terms))
+    return QueryStats(ignore_tokens=ignore)
+
+
 async def evaluate_candidate(
     model: OpenAIChatCompletionsModel,
     identity_summary: str,
@@ -1392,6 +1517,7 @@ async def refine_queries(
     missing: int,
     region: str,
     recent_accepts: Sequence[CandidateInfo],
+    query_stats_summary: str = "",
 ) -> tuple[List[str], List[CandidateInfo]]:
     hints = [hint for hint in feedback_hints if hint]
     accepted_block = summarize_candidates_for_prompt(recent_accepts)
@@ -1424,7 +1550,8 @@ async def refine_queries(
         + "\n\n"
         "Bereits akzeptierte Kandidaten (verwende Themen/Ortsangaben als Inspiration für neue Suchbegriffe oder Direktlinks):\n"
         f"{accepted_block}\n\n"
-        f"Gesuchtes Profil:\n{brief.target_profile}\n\n"
+        + (f"Ertrag bisheriger Query-Familien (über Läufe hinweg):\n{query_stats_summary}\n\n" if query_stats_summary else "")
+        + f"Gesuchtes Profil:\n{brief.target_profile}\n\n"
         "Erzeuge maximal 5 neue Queries und gib bei bekannten URLs (inkl. kurzer Zusammenfassung) Einträge in direct_urls zurück."
     )
     result = await Runner.run(agent, prompt)
@@ -1446,30 +1573,32 @@ async def refine_queries(
     return queries, direct_urls
 
 
-def enrich_with_northdata(candidates: Sequence[CandidateInfo]) -> None:
-    for candidate in candidates:
+async def enrich_with_northdata(candidates: Sequence[CandidateInfo]) -> None:
+    async def enrich_one(candidate: CandidateInfo) -> None:
         query = candidate.name
         try:
-            suggestions = fetch_suggestions(query, countries=NORTHDATA_COUNTRIES)
+            suggestions = await fetch_suggestions_async(query, countries=NORTHDATA_COUNTRIES)
         except NorthDataError as exc:
             candidate.northdata_info = f"NorthData-Fehler: {exc}"
-            continue
+            return
         except Exception as exc:  # pragma: no cover - Netzwerkzeitüberschreitungen u.ä.
             append_log("northdata.fetch_error", query=query, error=str(exc))
             candidate.northdata_info = f"NorthData-Timeout/Fehler: {exc}"
-            continue
+            return
 
         try:
             store_suggestions(query, suggestions)
         except OSError as exc:
             append_log("northdata.store_error", query=query, error=str(exc))
             candidate.northdata_info = f"NorthData nicht gespeichert ({exc})"
-            continue
+            return
         if suggestions:
             candidate.northdata_info = format_top_suggestion(suggestions)
         else:
             candidate.northdata_info = "NorthData: keine Treffer."
 
+    await asyncio.gather(*(enrich_one(candidate) for candidate in candidates))
+
 
 def store_candidates_snapshot(
     accepted: Sequence[CandidateInfo],
@@ -1641,21 +1770,26 @@ def dedupe_links(links: Iterable[str], base_url: str) -> List[str]:
     unique: List[str] = []
     seen: set[str] = set()
     for link in links:
-        normalized = link.rstrip("/")
-        if not normalized or normalized in seen:
+        normalized = canonical_url(link)
+        key = url_key(normalized)
+        if not normalized or key in seen:
             continue
         if domain_key(normalized) == base_domain:
             continue
-        seen.add(normalized)
+        seen.add(key)
         unique.append(normalized)
         if len(unique) >= 12:
             break
     return unique
 
 
-def collect_candidate_context(candidate: CandidateInfo) -> CandidateContext:
-    primary = fetch_site_snapshot(candidate.url, retries=1, backoff=2.0)
-    related = fetch_related_snapshots(candidate.url, max_pages=3, retries=1, backoff=2.0)
+async def collect_candidate_context(candidate: CandidateInfo) -> CandidateContext:
+    """
+    Laedt die Startseite und danach parallel die relevantesten Unterseiten aus
+    deren Navigation bzw. Sitemap (Limits pro Host in `tools.site_scraper`).
+    """
+    primary = await fetch_site_snapshot_async(candidate.url, retries=1, backoff=2.0)
+    related = await fetch_related_snapshots_async(candidate.url, max_pages=3, retries=1, backoff=2.0, primary=primary)
     all_contacts: List[ContactInfo] = []
     partner_links: List[str] = []
     if primary:
@@ -1942,6 +2076,7 @@ class LetterDispatcher:
         message_template: str,
         blacklist: BlacklistManager,
         org_registry: OrganizationRegistry,
+        query_stats: Optional[QueryStats] = None,
     ) -> None:
         self.limit = max(0, limit)
         self.model = model
@@ -1950,6 +2085,7 @@ class LetterDispatcher:
         self.message_template = message_template
         self.blacklist = blacklist
         self.org_registry = org_registry
+        self.query_stats = query_stats
         self._lock = asyncio.Lock()
         self._scheduled = 0
         self._completed = 0
@@ -1978,7 +2114,7 @@ class LetterDispatcher:
             context = candidate.context
             if context is None:
                 try:
-                    context = await asyncio.to_thread(collect_candidate_context, candidate)
+                    context = await collect_candidate_context(candidate)
                 except Exception as exc:
                     append_log("context.error", candidate=candidate.name, url=candidate.url, error=str(exc))
                     context = None
@@ -1989,7 +2125,7 @@ class LetterDispatcher:
             snapshot = context.primary if context else None
             if snapshot is None:
                 try:
-                    snapshot = await asyncio.to_thread(fetch_site_snapshot, candidate.url)
+                    snapshot = await fetch_site_snapshot_async(candidate.url)
                 except Exception as exc:
                     append_log("snapshot.error", candidate=candidate.name, url=candidate.url, error=str(exc))
                     snapshot = None
@@ -2031,6 +2167,8 @@ class LetterDispatcher:
             console(f"Anschreiben gespeichert unter: {letter_path}")
             candidate.letter_status = "sent"
             candidate.letter_path = str(letter_path)
+            if self.query_stats is not None:
+                self.query_stats.record_letter(candidate.root_query)
             if candidate.org_slug:
                 self.org_registry.mark_status(candidate.org_slug, "contacted")
             self.blacklist.add(
@@ -2091,6 +2229,14 @@ async def orchestrate_search(
     stop_signal: Optional[StopSignal] = None,
     search_retries: int = DEFAULT_SEARCH_RETRIES,
     search_retry_backoff: float = DEFAULT_SEARCH_RETRY_BACKOFF,
+    search_cache_mode: str = DEFAULT_SEARCH_CACHE_MODE,
+    search_cache_ttl_hours: float = DEFAULT_SEARCH_CACHE_TTL_HOURS,
+    query_dedupe_ttl_days: float = DEFAULT_QUERY_DEDUPE_TTL_DAYS,
+    search_hedge: bool = False,
+    search_hedge_delay: float = DEFAULT_SEARCH_HEDGE_DELAY,
+    web_search_batch_size: int = DEFAULT_WEB_SEARCH_BATCH_SIZE,
+    query_stats: Optional[QueryStats] = None,
+    search_backend: str = "auto",
     letter_dispatcher: Optional[LetterDispatcher] = None,
 ) -> tuple[List[CandidateInfo], List[CandidateInfo], str, int]:
     accepted: List[CandidateInfo] = []
@@ -2099,16 +2245,89 @@ async def orchestrate_search(
     used_queries: List[str] = []
     feedback_bus = FeedbackBus()
     seen_org_slugs: set[str] = set()
-
-    backend_name, search_fn, store_fn = select_search_backend()
+    claimed_urls: set[str] = set()
+    domain_claims: Counter[str] = Counter()
+
+    backend_name, search_fn = select_search_backend(search_backend)
+    if backend_name == "replay" and search_model is not None:
+        # Offline-Benchmark: kein gehosteter WebSearchTool-Aufruf.
+        search_model = None
+    cache_backends = [backend_name, "web_tool"]
+    cache_ttl_seconds = max(0.0, float(search_cache_ttl_hours)) * 3600
     append_log(
         "search.backend",
         backend=backend_name,
         google_config=has_google_config(),
         web_tool_enabled=bool(search_model),
+        cache_mode=search_cache_mode,
+        hedge=search_hedge,
     )
+    latency_tracker = LatencyTracker()
+    effective_results = max_results_per_query
+    quota_cache_first = False
+    web_prefetch: Dict[str, asyncio.Task] = {}
+    web_chunks: Dict[str, List[str]] = {}
+
+    def switch_to_fallback_backend(reason: str) -> bool:
+        """Switches from Google to DuckDuckGo once the quota is gone."""
+        nonlocal backend_name, search_fn
+        if backend_name != "google":
+            return False
+        backend_name, search_fn = "duckduckgo", search_duckduckgo_async
+        if "duckduckgo" not in cache_backends:
+            cache_backends.append("duckduckgo")
+        append_log("search.backend_switch", backend=backend_name, reason=reason)
+        console(f"Google-Kontingent erschoepft ({reason}) – wechsle auf DuckDuckGo.")
+        return True
 
-    queries = list(iter_queries(plan.search_queries))
+    def apply_google_budget(query_count: int) -> None:
+        nonlocal effective_results, quota_cache_first
+        if backend_name != "google":
+            effective_results, quota_cache_first = max_results_per_query, False
+            return
+        remaining = google_quota_remaining()
+        effective_results, mode = plan_google_budget(remaining, query_count, max_results_per_query)
+        quota_cache_first = mode == "cache"
+        if mode != "ok":
+            append_log(
+                "search.quota_budget",
+                remaining=remaining,
+                queries=query_count,
+                results_per_query=effective_results,
+                mode=mode,
+            )
+        if mode == "switch":
+            switch_to_fallback_backend("ledger")
+
+    query_index = QueryIndex(ttl_days=query_dedupe_ttl_days, ignore_tokens=focus_suffix_tokens(brief))
+    merged_queries: set[str] = set()
+
+    def admit_queries(candidates: Iterable[str]) -> List[str]:
+        """Drops near-duplicates of this run; earlier runs' queries are reused verbatim (cache-first)."""
+        admitted: List[str] = []
+        for decision in query_index.admit(iter_queries(candidates)):
+            if decision.status == "duplicate":
+                append_log("query.duplicate", query=decision.original, match=decision.match)
+                continue
+            if decision.status == "merged":
+                merged_queries.add(decision.query)
+                append_log("query.merged", query=decision.original, match=decision.match)
+            admitted.append(decision.query)
+        return admitted
+
+    query_stats = query_stats or build_query_stats(brief, region)
+
+    def schedule_queries(candidates: List[str]) -> List[str]:
+        """Orders queries by expected accepts per cost and drops barren query families."""
+        ordered, pruned = query_stats.schedule(candidates)
+        for query in pruned:
+            append_log("query.pruned", query=query, family=query_stats.family_of(query))
+        if not ordered and pruned:
+            # Nicht komplett stehen bleiben: die beste verworfene Query trotzdem testen.
+            ordered = pruned[:1]
+        return ordered
+
+    queries = schedule_queries(admit_queries(plan.search_queries))
     iteration = 0
     empty_searches = 0
     expanded_directories: set[str] = set()
@@ -2116,15 +2335,49 @@ async def orchestrate_search(
     search_failed = False
     candidate_concurrency = max(1, get_int_setting("PIPELINE_CANDIDATE_CONCURRENCY", 4))
     candidate_semaphore = asyncio.Semaphore(candidate_concurrency)
+    query_concurrency = max(1, get_int_setting("PIPELINE_QUERY_CONCURRENCY", DEFAULT_QUERY_CONCURRENCY))
+    query_semaphore = asyncio.Semaphore(query_concurrency)
+    stop_announced = False
     state_lock = asyncio.Lock()
+    append_log(
+        "search.concurrency",
+        queries=query_concurrency,
+        candidates=candidate_concurrency,
+        scrape=get_int_setting("PIPELINE_SCRAPE_CONCURRENCY", 8),
+        scrape_per_host=get_int_setting("PIPELINE_SCRAPE_PER_HOST", 2),
+    )
+    frontier = CrawlFrontier(
+        FrontierBudget(
+            max_total=max(0, get_int_setting("PIPELINE_EXPANSION_MAX_DERIVED", EXPANSION_MAX_DERIVED)),
+            max_per_source=max(0, get_int_setting("PIPELINE_EXPANSION_MAX_PER_SOURCE", EXPANSION_MAX_PER_SOURCE)),
+            max_per_depth=max(0, get_int_setting("PIPELINE_EXPANSION_MAX_PER_DEPTH", EXPANSION_MAX_PER_DEPTH)),
+        )
+    )
+    expansion_keywords = [*brief.search_focus_keywords, *brief.focus_areas, *ENTRY_KEYWORDS]
+
+    def enqueue_derived(parent: CandidateInfo, derived: CandidateInfo, depth: int, *, anchor_text: str) -> None:
+        """Pushes a derived candidate into the frontier instead of processing it inline."""
+        relevance = anchor_relevance(f"{anchor_text} {derived.url}", expansion_keywords)
+        if derived.source_query.startswith("directory:"):
+            relevance += DIRECTORY_ENTRY_PRIORITY
+        if not frontier.push(
+            derived,
+            key=url_key(derived.url),
+            source=domain_key(parent.url) or parent.url,
+            depth=depth,
+            relevance=relevance,
+        ):
+            append_log("frontier.drop", url=derived.url, source=parent.url, depth=depth)
 
     async def process_candidate(candidate: CandidateInfo, depth: int = 0) -> int:
         """Evaluates a candidate and expands directory-style pages if useful."""
         context_obj: Optional[CandidateContext] = None
+        candidate.url = canonical_url(candidate.url)
         async with state_lock:
-            if candidate.url in seen_urls:
+            key = url_key(candidate.url)
+            if key in seen_urls:
                 return 0
-            seen_urls.add(candidate.url)
+            seen_urls.add(key)
 
         blacklist_entry = blacklist.is_blacklisted(candidate.url)
         if blacklist_entry:
@@ -2138,8 +2391,9 @@ async def orchestrate_search(
             )
             return 1
 
-        if not candidate_matches_region(candidate, region):
-            reason = f"Außerhalb Zielregion '{region}' (Geo-Heuristik)."
+        region_hits = off_region_terms(candidate, region)
+        if region_hits:
+            reason = f"Außerhalb Zielregion '{region}' (Geo-Heuristik: {', '.join(region_hits)})."
             evaluation = EvaluationResult(
                 score=0.15,
                 accepted=False,
@@ -2205,7 +2459,7 @@ async def orchestrate_search(
                 search_adjustment="konkrete Organisation mit eigener Kontaktseite finden",
             )
         else:
-            context_obj = await asyncio.to_thread(collect_candidate_context, candidate)
+            context_obj = await collect_candidate_context(candidate)
             candidate.context = context_obj
             candidate.contacts = context_obj.contacts
             evaluation = await evaluate_candidate(
@@ -2300,6 +2554,7 @@ async def orchestrate_search(
                 if len(accepted) < plan.target_candidates:
                     accepted.append(candidate)
                     accepted_now = True
+                    query_stats.record_accept(candidate.root_query)
                     if candidate.org_slug:
                         org_registry.mark_status(candidate.org_slug, "accepted")
         if accepted_now:
@@ -2323,8 +2578,7 @@ async def orchestrate_search(
         )
         if should_expand:
             try:
-                entries = await asyncio.to_thread(
-                    expand_directory,
+                entries = await expand_directory_async(
                     candidate.url,
                     max_entries=DIRECTORY_MAX_ENTRIES,
                 )
@@ -2346,7 +2600,12 @@ async def orchestrate_search(
                             candidate,
                             entry,
                         )
-                        processed += await process_candidate(derived_candidate, depth + 1)
+                        enqueue_derived(
+                            candidate,
+                            derived_candidate,
+                            depth + 1,
+                            anchor_text=f"{entry.name} {entry.description}",
+                        )
 
         partner_links = context_obj.partner_links if context_obj else []
         if partner_links and depth < DIRECTORY_MAX_DEPTH:
@@ -2358,88 +2617,275 @@ async def orchestrate_search(
             )
             for link in limited_links:
                 derived_candidate = candidate_from_partner_link(candidate, link)
-                processed += await process_candidate(derived_candidate, depth + 1)
+                enqueue_derived(candidate, derived_candidate, depth + 1, anchor_text="")
         return processed
 
-    while len(accepted) < plan.target_candidates and iteration < max_iterations and queries:
-        if stop_signal and stop_signal.triggered():
-            console("Stop-Flag erkannt – keine neuen Aufgaben, laufende Tasks werden beendet.")
-            append_log("pipeline.stop_flag", accepted=len(accepted), considered=len(all_candidates))
-            break
-        iteration += 1
-        console(f"--- Suchiteration {iteration} mit {len(queries)} Queries ---")
-        new_candidates_in_iteration = 0
+    async def process_frontier_item(item: FrontierItem) -> int:
+        """Frontier worker step: derived candidates share the candidate semaphore with search hits."""
+        if len(accepted) >= plan.target_candidates or (stop_signal and stop_signal.triggered()):
+            return 0
+        candidate: CandidateInfo = item.payload
+        async with candidate_semaphore:
+            try:
+                return await process_candidate(candidate, item.depth)
+            except Exception as exc:
+                append_log(
+                    "candidate.error",
+                    candidate=getattr(candidate, "name", "unknown"),
+                    url=getattr(candidate, "url", ""),
+                    error=str(exc),
+                    source="frontier",
+                )
+                console(f"[WARN] Fehler bei abgeleitetem Kandidat {getattr(candidate, 'name', 'unknown')}: {exc}")
+                return 0
 
-        for query in queries:
-            if stop_signal and stop_signal.triggered():
-                console("Stop-Flag erkannt – breche neue Suche ab, vorhandene Ergebnisse werden verwendet.")
-                break
-            used_queries.append(query)
-            results: List[SearchResult] = []
-            backend_used = None
+    # Hoechstens die Haelfte der Kandidaten-Slots fuer Expansionen, damit Suchtreffer nicht verhungern.
+    # Bei candidate_concurrency == 1 laufen keine Worker parallel; die Frontier wird nach den Queries geleert.
+    frontier_workers = candidate_concurrency // 2
 
-            if search_model is not None:
-                try:
-                    results = await run_web_search_agent(
-                        search_model,
-                        query=query,
-                        max_results=max_results_per_query,
-                        location_hint=WEB_SEARCH_LOCATION,
-                    )
-                    backend_used = "web_tool"
-                    if results:
-                        append_log("search.web_tool", query=query, count=len(results))
-                        console(
-                            f"WebSearchTool lieferte {len(results)} Ergebnisse fuer '{query}'."
-                        )
-                except Exception as exc:  # pragma: no cover
-                    append_log("search.web_tool_error", query=query, error=str(exc))
-                    console(f"WebSearchTool Fehler fuer '{query}': {exc}")
+    async def drain_frontier() -> None:
+        if frontier_workers:
+            await frontier.join()
+            return
+        frontier.start(1, process_frontier_item)
+        try:
+            await frontier.join()
+        finally:
+            await frontier.close()
+
+    def claim_search_candidates(candidates: List[CandidateInfo]) -> List[CandidateInfo]:
+        """Drops hits already seen in other queries (canonical URL) or from over-represented domains."""
+        claimed: List[CandidateInfo] = []
+        for candidate in candidates:
+            key = url_key(candidate.url)
+            domain = domain_key(candidate.url)
+            if key in claimed_urls or key in seen_urls:
+                append_log("search.duplicate", url=candidate.url, reason="url", query=candidate.source_query)
+                continue
+            if domain and domain_claims[domain] >= MAX_SEARCH_CANDIDATES_PER_DOMAIN:
+                append_log("search.duplicate", url=candidate.url, reason="domain", query=candidate.source_query)
+                continue
+            claimed_urls.add(key)
+            if domain:
+                domain_claims[domain] += 1
+            claimed.append(candidate)
+        return claimed
+
+    def cached_first(query: str) -> Tuple[List[SearchResult], Optional[str]]:
+        """Cache lookup that runs before any network call (prefer mode, merged queries, low quota)."""
+        if not (search_cache_mode == "prefer" or query in merged_queries or quota_cache_first):
+            return [], None
+        # Bei knappem Google-Kontingent ist auch ein aelterer Cache-Treffer besser als ein Aufruf.
+        return load_cached_search(
+            query,
+            cache_backends,
+            fresh_only=not quota_cache_first,
+            max_age=cache_ttl_seconds,
+        )
 
-            if not results:
-                attempt = 0
-                while attempt <= search_retries:
-                    try:
-                        results = await asyncio.to_thread(
-                            search_fn,
-                            query,
-                            max_results=max_results_per_query,
-                        )
-                        backend_used = backend_name
-                        console(f"{backend_name} Suche fuer '{query}' gestartet (Versuch {attempt+1}) ...")
-                        break
-                    except Exception as exc:
-                        append_log(
-                            "search.error",
-                            backend=backend_name,
-                            query=query,
-                            error=str(exc),
-                            attempt=attempt + 1,
-                        )
-                        attempt += 1
-                        if attempt > search_retries:
-                            console(f"{backend_name} Suche abgebrochen (Limit/Fehler): {exc}")
-                            search_failed = True
-                            break
-                        await asyncio.sleep(search_retry_backoff * attempt)
-                if search_failed:
-                    break
+    def prefetch_web_batch(batch_queries: List[str]) -> None:
+        """Plans WebSearchTool chunks of `web_search_batch_size` for the iteration (started lazily)."""
+        web_prefetch.clear()
+        web_chunks.clear()
+        if search_model is None or web_search_batch_size <= 1:
+            return
+        pending = [query for query in batch_queries if not cached_first(query)[0]]
+        for start in range(0, len(pending), web_search_batch_size):
+            chunk = pending[start : start + web_search_batch_size]
+            if len(chunk) < 2:
+                continue
+            for query in chunk:
+                web_chunks[query] = chunk
+
+    def web_batch_task(query: str) -> Optional[asyncio.Task]:
+        """Starts the query's chunk once its first query reaches the WebSearchTool.
+
+        Queries run in scheduler order, so a chunk is fetched just ahead of the workers;
+        queries skipped by the early return or the pruning never start their chunk.
+        """
+        task = web_prefetch.get(query)
+        chunk = web_chunks.get(query)
+        if task is not None or not chunk:
+            return task
+        task = asyncio.create_task(
+            run_web_search_batch(
+                search_model,
+                chunk,
+                max_results=max_results_per_query,
+                location_hint=WEB_SEARCH_LOCATION,
+                batch_size=web_search_batch_size,
+            )
+        )
+        append_log("search.web_tool_batch", queries=len(chunk), batch_size=web_search_batch_size)
+        for member in chunk:
+            web_prefetch[member] = task
+        return task
+
+    async def run_web_tool(query: str) -> List[SearchResult]:
+        """Runs the WebSearchTool; errors are logged and treated as an empty result."""
+        started = time.monotonic()
+        try:
+            return await web_tool_attempt(query, started)
+        except asyncio.CancelledError:
+            # Vom Hedge abgebrochen: Laufzeit als untere Schranke erfassen, sonst driftet p90 zu den Gewinnern.
+            latency_tracker.record("web_tool", time.monotonic() - started, censored=True)
+            raise
+
+    async def web_tool_attempt(query: str, started: float) -> List[SearchResult]:
+        batch_task = web_batch_task(query)
+        if batch_task is not None:
+            try:
+                grouped = await asyncio.shield(batch_task)
+            except Exception as exc:  # pragma: no cover
+                append_log("search.web_tool_error", query=query, error=str(exc), batched=True)
+                grouped = {}
+            if query in grouped:
+                results = list(grouped[query])[:max_results_per_query]
+                latency_tracker.record("web_tool", time.monotonic() - started)
+                if results:
+                    append_log("search.web_tool", query=query, count=len(results), batched=True)
+                    console(f"WebSearchTool (Batch) lieferte {len(results)} Ergebnisse fuer '{query}'.")
+                return results
+        try:
+            results = await run_web_search_agent(
+                search_model,
+                query=query,
+                max_results=max_results_per_query,
+                location_hint=WEB_SEARCH_LOCATION,
+            )
+        except Exception as exc:  # pragma: no cover
+            latency_tracker.record("web_tool", time.monotonic() - started, ok=False)
+            append_log("search.web_tool_error", query=query, error=str(exc))
+            console(f"WebSearchTool Fehler fuer '{query}': {exc}")
+            return []
+        latency_tracker.record("web_tool", time.monotonic() - started)
+        if results:
+            append_log("search.web_tool", query=query, count=len(results))
+            console(f"WebSearchTool lieferte {len(results)} Ergebnisse fuer '{query}'.")
+        return results
 
-            if not results:
-                cached_results = (
-                    load_cached_duckduckgo_results(query)
-                    if backend_name == "duckduckgo"
-                    else load_cached_google_results(query)
+    async def run_backend(query: str) -> List[SearchResult]:
+        """Runs the configured backend with retries; re-raises after the last failed attempt."""
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                results = await search_fn(
+                    query,
+                    max_results=effective_results,
                 )
-                if cached_results:
-                    results = cached_results
-                    backend_used = f"{backend_name}_cache"
-                    append_log("search.cache_hit", backend=backend_name, query=query)
-                    console(f"Cache-Treffer fuer '{query}' ({len(results)} Ergebnisse).")
+            except asyncio.CancelledError:
+                latency_tracker.record(backend_name, time.monotonic() - started, censored=True)
+                raise
+            except GoogleQuotaExceeded as exc:
+                append_log("search.quota_exhausted", backend=backend_name, query=query, error=str(exc))
+                if switch_to_fallback_backend("api"):
+                    continue
+                raise
+            except Exception as exc:
+                latency_tracker.record(backend_name, time.monotonic() - started, ok=False)
+                append_log(
+                    "search.error",
+                    backend=backend_name,
+                    query=query,
+                    error=str(exc),
+                    attempt=attempt + 1,
+                )
+                attempt += 1
+                if attempt > search_retries:
+                    console(f"{backend_name} Suche abgebrochen (Limit/Fehler): {exc}")
+                    raise
+                await asyncio.sleep(search_retry_backoff * attempt)
+                continue
+            latency_tracker.record(backend_name, time.monotonic() - started)
+            console(f"{backend_name} Suche fuer '{query}' gestartet (Versuch {attempt+1}) ...")
+            return results
+
+    async def search_query(query: str) -> Optional[Tuple[List[SearchResult], Optional[str]]]:
+        """Runs WebSearchTool and the configured backend (sequentially or hedged), then the cache.
+
+        Returns None when the backend gave up (limit/errors) so callers can stop.
+        """
+        nonlocal search_failed
+        results: List[SearchResult] = []
+        backend_used = None
+
+        results, cached_backend = cached_first(query)
+        if results:
+            append_log("search.cache_first", backend=cached_backend, query=query, count=len(results))
+            console(f"Cache-first fuer '{query}' ({len(results)} Ergebnisse, {cached_backend}).")
+            return results, f"{cached_backend}_cache"
+
+        if search_hedge:
+            attempts = []
+            if search_model is not None:
+                attempts.append(("web_tool", lambda: run_web_tool(query)))
+            attempts.append((backend_name, lambda: run_backend(query)))
+            outcome = await hedged_search(
+                attempts,
+                delay_for=lambda name: latency_tracker.hedge_delay(name, search_hedge_delay),
+            )
+            append_log(
+                "search.hedge",
+                query=query,
+                winner=outcome.backend,
+                launched=outcome.launched,
+                errors=outcome.errors,
+                elapsed=round(outcome.elapsed, 2),
+            )
+            if not outcome.results and any(name != "web_tool" for name in outcome.errors):
+                search_failed = True
+                return None
+            results = outcome.results
+            # Nach einem Backend-Wechsel stammt das Ergebnis vom aktuellen Backend.
+            backend_used = outcome.backend if outcome.backend in {None, "web_tool"} else backend_name
+        else:
+            if search_model is not None:
+                results = await run_web_tool(query)
+                backend_used = "web_tool"
+            if not results:
+                try:
+                    results = await run_backend(query)
+                except Exception:
+                    search_failed = True
+                    return None
+                backend_used = backend_name
+
+        if not results:
+            cached_results, cached_backend = load_cached_search(query, cache_backends)
+            if cached_results:
+                results = cached_results
+                backend_used = f"{cached_backend}_cache"
+                append_log("search.cache_hit", backend=cached_backend, query=query)
+                console(f"Cache-Treffer fuer '{query}' ({len(results)} Ergebnisse).")
+        return results, backend_used
+
+    async def run_query(query: str) -> int:
+        """Searches one query (bounded by the query semaphore) and processes its candidates."""
+        nonlocal empty_searches, stop_announced
+        async with query_semaphore:
+            if search_failed:
+                return 0
+            if stop_signal and stop_signal.triggered():
+                if not stop_announced:
+                    stop_announced = True
+                    console("Stop-Flag erkannt – breche neue Suche ab, vorhandene Ergebnisse werden verwendet.")
+                return 0
+            if len(accepted) >= plan.target_candidates:
+                # Ziel bereits erreicht: nachrangige Queries (Scheduler-Reihenfolge) sparen.
+                return 0
+            used_queries.append(query)
+            outcome = await search_query(query)
+            if outcome is None:
+                return 0
+            results, backend_used = outcome
+            raw_count = len(results)
 
             if results:
                 results = await filter_search_results(model, identity_summary, brief, query, results)
-                store_fn(query, results)
+                # Nur nicht-leere Filterergebnisse cachen; ein leerer Durchlauf soll den Fallback nicht zerstoeren.
+                if results and backend_used and not backend_used.endswith("_cache") and backend_used != "replay":
+                    get_search_cache().store(query, results, backend=backend_used)
                 append_log(
                     "search.results",
                     backend=backend_used,
@@ -2450,97 +2896,145 @@ async def orchestrate_search(
                     f"Suche '{query}' via {backend_used} -> {len(results)} Ergebnisse."
                 )
 
-            if not results:
-                empty_searches += 1
-                if backend_used == "duckduckgo" and DUCKDUCKGO_QUERY_DELAY > 0:
-                    await asyncio.sleep(DUCKDUCKGO_QUERY_DELAY)
-                continue
-
-            if backend_used == "duckduckgo" and DUCKDUCKGO_QUERY_DELAY > 0:
-                await asyncio.sleep(DUCKDUCKGO_QUERY_DELAY)
+        if not results:
+            empty_searches += 1
+            query_stats.record_search(query, results=raw_count, candidates=0)
+            return 0
 
-            candidates = build_candidates_from_search(query, results, brief=brief)
-            async def process_one(candidate: CandidateInfo) -> int:
-                async with candidate_semaphore:
-                    try:
-                        return await process_candidate(candidate)
-                    except Exception as exc:
-                        append_log(
-                            "candidate.error",
-                            candidate=getattr(candidate, "name", "unknown"),
-                            url=getattr(candidate, "url", ""),
-                            error=str(exc),
-                            query=query,
-                        )
-                        console(f"[WARN] Fehler bei Kandidat {getattr(candidate, 'name', 'unknown')}: {exc} (suche laeuft weiter)")
-                        return 0
+        candidates = claim_search_candidates(build_candidates_from_search(query, results, brief=brief))
+        query_stats.record_search(query, results=raw_count, candidates=len(candidates))
 
-            tasks = [asyncio.create_task(process_one(candidate)) for candidate in candidates]
-            if tasks:
-                results_processed = await asyncio.gather(*tasks, return_exceptions=True)
-                for processed in results_processed:
-                    if isinstance(processed, Exception):
-                        continue
-                    try:
-                        new_candidates_in_iteration += int(processed)
-                    except (TypeError, ValueError):
-                        continue
-
-        if len(accepted) >= plan.target_candidates:
-            break
-
-        if search_failed:
-            console("Suche wurde aufgrund eines Fehlers/Limit erreicht. Nutze vorhandene Kandidaten.")
-            append_log("search.partial", reason="search_failed", accepted=len(accepted), considered=len(all_candidates))
-            break
-
-        remaining = plan.target_candidates - len(accepted)
-        recent_accepts = accepted[-5:]
-        new_queries, direct_candidates = await refine_queries(
-            model=model,
-            identity_summary=identity_summary,
-            brief=brief,
-            feedback_hints=feedback_bus.recent(10),  # letzte Hinweise reichen
-            used_queries=used_queries,
-            missing=remaining,
-            region=region,
-            recent_accepts=recent_accepts,
-        )
-        if direct_candidates:
-            async def process_direct(candidate: CandidateInfo) -> int:
-                async with candidate_semaphore:
-                    try:
-                        return await process_candidate(candidate)
-                    except Exception as exc:
-                        append_log(
-                            "candidate.error",
-                            candidate=getattr(candidate, "name", "unknown"),
-                            url=getattr(candidate, "url", ""),
-                            error=str(exc),
-                            source="refine_direct",
-                        )
-                        console(
-                            f"[WARN] Fehler bei Direkt-Kandidat {getattr(candidate, 'name', 'unknown')}: {exc} (suche laeuft weiter)"
-                        )
-                        return 0
+        async def process_one(candidate: CandidateInfo) -> int:
+            async with candidate_semaphore:
+                try:
+                    return await process_candidate(candidate)
+                except Exception as exc:
+                    append_log(
+                        "candidate.error",
+                        candidate=getattr(candidate, "name", "unknown"),
+                        url=getattr(candidate, "url", ""),
+                        error=str(exc),
+                        query=query,
+                    )
+                    console(f"[WARN] Fehler bei Kandidat {getattr(candidate, 'name', 'unknown')}: {exc} (suche laeuft weiter)")
+                    return 0
 
-            direct_results = await asyncio.gather(
-                *(process_direct(cand) for cand in direct_candidates),
-                return_exceptions=True,
-            )
-            for processed in direct_results:
+        processed_total = 0
+        tasks = [asyncio.create_task(process_one(candidate)) for candidate in candidates]
+        if tasks:
+            results_processed = await asyncio.gather(*tasks, return_exceptions=True)
+            for processed in results_processed:
                 if isinstance(processed, Exception):
                     continue
                 try:
-                    new_candidates_in_iteration += int(processed)
+                    processed_total += int(processed)
                 except (TypeError, ValueError):
                     continue
-        queries = [q for q in iter_queries(new_queries) if q not in used_queries]
+        return processed_total
 
-        if new_candidates_in_iteration == 0 and not queries:
-            console("Keine neuen Kandidaten gefunden, Abbruch.")
-            break
+    if frontier_workers:
+        frontier.start(frontier_workers, process_frontier_item)
+    try:
+        while len(accepted) < plan.target_candidates and iteration < max_iterations and queries:
+            if stop_signal and stop_signal.triggered():
+                console("Stop-Flag erkannt – keine neuen Aufgaben, laufende Tasks werden beendet.")
+                append_log("pipeline.stop_flag", accepted=len(accepted), considered=len(all_candidates))
+                break
+            iteration += 1
+            console(f"--- Suchiteration {iteration} mit {len(queries)} Queries ---")
+            apply_google_budget(len(queries))
+            prefetch_web_batch(queries)
+            new_candidates_in_iteration = 0
+            frontier_processed_before = frontier.processed
+
+            query_outcomes = await asyncio.gather(
+                *(run_query(query) for query in queries),
+                return_exceptions=True,
+            )
+            for processed in query_outcomes:
+                if isinstance(processed, Exception):
+                    append_log("search.query_error", error=str(processed))
+                    continue
+                new_candidates_in_iteration += processed
+            # Expansionen laufen parallel zu den Queries (bei nur einem Slot erst jetzt); vor der Verfeinerung abwarten.
+            await drain_frontier()
+            for batch_task in set(web_prefetch.values()):
+                if not batch_task.done():
+                    batch_task.cancel()
+
+            if len(accepted) >= plan.target_candidates:
+                break
+
+            if search_failed:
+                console("Suche wurde aufgrund eines Fehlers/Limit erreicht. Nutze vorhandene Kandidaten.")
+                append_log("search.partial", reason="search_failed", accepted=len(accepted), considered=len(all_candidates))
+                break
+
+            remaining = plan.target_candidates - len(accepted)
+            recent_accepts = accepted[-5:]
+            new_queries, direct_candidates = await refine_queries(
+                model=model,
+                identity_summary=identity_summary,
+                brief=brief,
+                feedback_hints=feedback_bus.recent(10),  # letzte Hinweise reichen
+                used_queries=used_queries,
+                missing=remaining,
+                region=region,
+                recent_accepts=recent_accepts,
+                query_stats_summary=query_stats.prompt_summary(),
+            )
+            if direct_candidates:
+                async def process_direct(candidate: CandidateInfo) -> int:
+                    async with candidate_semaphore:
+                        try:
+                            return await process_candidate(candidate)
+                        except Exception as exc:
+                            append_log(
+                                "candidate.error",
+                                candidate=getattr(candidate, "name", "unknown"),
+                                url=getattr(candidate, "url", ""),
+                                error=str(exc),
+                                source="refine_direct",
+                            )
+                            console(
+                                f"[WARN] Fehler bei Direkt-Kandidat {getattr(candidate, 'name', 'unknown')}: {exc} (suche laeuft weiter)"
+                            )
+                            return 0
+
+                direct_results = await asyncio.gather(
+                    *(process_direct(cand) for cand in direct_candidates),
+                    return_exceptions=True,
+                )
+                for processed in direct_results:
+                    if isinstance(processed, Exception):
+                        continue
+                    try:
+                        new_candidates_in_iteration += int(processed)
+                    except (TypeError, ValueError):
+                        continue
+                await drain_frontier()
+            new_candidates_in_iteration += frontier.processed - frontier_processed_before
+            queries = schedule_queries(admit_queries(new_queries))
 
+            if new_candidates_in_iteration == 0 and not queries:
+                console("Keine neuen Kandidaten gefunden, Abbruch.")
+                break
+    finally:
+        # Auch bei Fehlern (z. B. in refine_queries) oder Abbruch Worker beenden und Statistik loggen.
+        await frontier.close()
+        if frontier.admitted or frontier.dropped:
+            append_log("frontier.stats", **frontier.stats())
+        latency_path = latency_tracker.save()
+        if latency_path:
+            append_log("search.latency", path=str(latency_path), backends=latency_tracker.summary())
+        stats_path = query_stats.save()
+        if stats_path:
+            append_log("query_stats.persisted", path=str(stats_path), queries=len(query_stats.queries))
+        index_path = query_index.save()
+        if index_path:
+            append_log("query_index.persisted", path=str(index_path), queries=len(query_index.records))
+        # DDGS-Session schliessen und die AIMD-Rate einmal am Laufende speichern.
+        close_duckduckgo_client()
     return accepted, all_candidates, backend_name, empty_searches
 
 
@@ -2549,6 +3043,25 @@ async def async_main() -> None:
     settings = load_pipeline_settings()
     if getattr(settings, "candidate_concurrency", None):
         os.environ.setdefault("PIPELINE_CANDIDATE_CONCURRENCY", str(settings.candidate_concurrency))
+    if getattr(settings, "query_concurrency", None):
+        os.environ.setdefault("PIPELINE_QUERY_CONCURRENCY", str(settings.query_concurrency))
+    for name in ("expansion_max_derived", "expansion_max_per_source", "expansion_max_per_depth"):
+        if getattr(settings, name, None) is not None:
+            os.environ.setdefault(f"PIPELINE_{name.upper()}", str(getattr(settings, name)))
+    if getattr(settings, "scrape_concurrency", None):
+        os.environ.setdefault("PIPELINE_SCRAPE_CONCURRENCY", str(settings.scrape_concurrency))
+    if getattr(settings, "scrape_per_host", None):
+        os.environ.setdefault("PIPELINE_SCRAPE_PER_HOST", str(settings.scrape_per_host))
+    if getattr(settings, "parse_workers", None) is not None:
+        os.environ.setdefault("PIPELINE_PARSE_WORKERS", str(settings.parse_workers))
+    if getattr(settings, "snapshot_ttl_hours", None) is not None:
+        os.environ.setdefault("PIPELINE_SNAPSHOT_TTL_HOURS", str(settings.snapshot_ttl_hours))
+    if getattr(settings, "fetch_memory_ttl_days", None) is not None:
+        os.environ.setdefault("PIPELINE_FETCH_MEMORY_TTL_DAYS", str(settings.fetch_memory_ttl_days))
+    if getattr(settings, "host_failure_threshold", None):
+        os.environ.setdefault("PIPELINE_HOST_FAILURE_THRESHOLD", str(settings.host_failure_threshold))
+    if getattr(settings, "host_cooldown_minutes", None) is not None:
+        os.environ.setdefault("PIPELINE_HOST_COOLDOWN_MINUTES", str(settings.host_cooldown_minutes))
     brief_path = Path(args.brief) if args.brief else DEFAULT_BRIEF_PATH
     brief = load_campaign_brief(brief_path)
     message_template = load_message_template(Path(brief.message_template_path))
@@ -2599,6 +3112,9 @@ async def async_main() -> None:
         if args.search_retry_backoff is not None
         else settings.search_retry_backoff or DEFAULT_SEARCH_RETRY_BACKOFF
     )
+    search_cache_mode = args.search_cache or settings.search_cache_mode or DEFAULT_SEARCH_CACHE_MODE
+    search_hedge = args.search_hedge if args.search_hedge is not None else settings.search_hedge
+    search_backend = args.search_backend or settings.search_backend or "auto"
     target_override = args.target_candidates
     if target_override is not None:
         try:
@@ -2664,6 +3180,7 @@ async def async_main() -> None:
     org_registry = OrganizationRegistry()
     console(f"Geladene Organisations-Registry: {len(org_registry)}")
     append_log("registry.loaded", entries=len(org_registry))
+    query_stats = build_query_stats(brief, args.region)
     letter_dispatcher = LetterDispatcher(
         limit=plan.target_candidates,
         model=chat_model,
@@ -2672,6 +3189,7 @@ async def async_main() -> None:
         message_template=message_template,
         blacklist=blacklist,
         org_registry=org_registry,
+        query_stats=query_stats,
     )
 
     accept_threshold = presets["accept_threshold"]
@@ -2722,6 +3240,14 @@ async def async_main() -> None:
             stop_signal=stop_signal,
             search_retries=search_retries,
             search_retry_backoff=search_retry_backoff,
+            search_cache_mode=search_cache_mode,
+            search_cache_ttl_hours=settings.search_cache_ttl_hours,
+            query_dedupe_ttl_days=settings.query_dedupe_ttl_days,
+            search_hedge=search_hedge,
+            search_hedge_delay=settings.search_hedge_delay,
+            web_search_batch_size=settings.web_search_batch_size,
+            query_stats=query_stats,
+            search_backend=search_backend,
             letter_dispatcher=letter_dispatcher,
         )
     if not accepted:
@@ -2747,7 +3273,7 @@ async def async_main() -> None:
         empty_searches=empty_searches,
     )
 
-    enrich_with_northdata(accepted)
+    await enrich_with_northdata(accepted)
     store_candidates_snapshot(accepted, all_candidates)
 
     rejected = [c for c in all_candidates if not (c.evaluation and c.evaluation.accepted)]
@@ -2801,10 +3327,16 @@ async def async_main() -> None:
     if persisted:
         append_log("blacklist.persisted", path=str(persisted))
         console(f"Blacklist aktualisiert: {persisted}")
+    stats_path = query_stats.save()
+    if stats_path:
+        append_log("query_stats.persisted", path=str(stats_path), queries=len(query_stats.queries))
     reg_path = org_registry.save()
     if reg_path:
         append_log("registry.persisted", path=str(reg_path))
         console(f"Organisations-Registry aktualisiert: {reg_path}")
+    health_path = get_host_health().save()
+    if health_path:
+        append_log("host_health.persisted", path=str(health_path), hosts=len(get_host_health().hosts))
 
 
 if __name__ == "__main__":
@@ -20,8 +20,26 @@ class PipelineSettings:
     results_per_query: int = 6
     letters_per_run: int = 5
     candidate_concurrency: int = 4
+    query_concurrency: int = 3
+    expansion_max_derived: int = 80
+    expansion_max_per_source: int = 25
+    expansion_max_per_depth: int = 50
+    scrape_concurrency: int = 8
+    scrape_per_host: int = 2
+    parse_workers: int = 0
+    snapshot_ttl_hours: float = 168.0
+    fetch_memory_ttl_days: float = 30.0
+    host_failure_threshold: int = 3
+    host_cooldown_minutes: float = 30.0
     search_retries: int = 2
     search_retry_backoff: float = 3.0
+    search_cache_mode: str = "fallback"
+    search_cache_ttl_hours: float = 168.0
+    query_dedupe_ttl_days: float = 14.0
+    search_hedge: bool = False
+    search_hedge_delay: float = 8.0
+    web_search_batch_size: int = 5
+    search_backend: str = "auto"
     stop_file: str = "data/staging/stop.flag"
 
     @classmethod
@@ -34,8 +52,26 @@ class PipelineSettings:
             results_per_query=int(data.get("results_per_query", cls.results_per_query)),
             letters_per_run=int(data.get("letters_per_run", cls.letters_per_run)),
             candidate_concurrency=int(data.get("candidate_concurrency", cls.candidate_concurrency)),
+            query_concurrency=int(data.get("query_concurrency", cls.query_concurrency)),
+            expansion_max_derived=int(data.get("expansion_max_derived", cls.expansion_max_derived)),
+            expansion_max_per_source=int(data.get("expansion_max_per_source", cls.expansion_max_per_source)),
+            expansion_max_per_depth=int(data.get("expansion_max_per_depth", cls.expansion_max_per_depth)),
+            scrape_concurrency=int(data.get("scrape_concurrency", cls.scrape_concurrency)),
+            scrape_per_host=int(data.get("scrape_per_host", cls.scrape_per_host)),
+            parse_workers=int(data.get("parse_workers", cls.parse_workers)),
+            snapshot_ttl_hours=float(data.get("snapshot_ttl_hours", cls.snapshot_ttl_hours)),
+            fetch_memory_ttl_days=float(data.get("fetch_memory_ttl_days", cls.fetch_memory_ttl_days)),
+            host_failure_threshold=int(data.get("host_failure_threshold", cls.host_failure_threshold)),
+            host_cooldown_minutes=float(data.get("host_cooldown_minutes", cls.host_cooldown_minutes)),
             search_retries=int(data.get("search_retries", cls.search_retries)),
             search_retry_backoff=float(data.get("search_retry_backoff", cls.search_retry_backoff)),
+            search_cache_mode=str(data.get("search_cache_mode", cls.search_cache_mode)),
+            search_cache_ttl_hours=float(data.get("search_cache_ttl_hours", cls.search_cache_ttl_hours)),
+            query_dedupe_ttl_days=float(data.get("query_dedupe_ttl_days", cls.query_dedupe_ttl_days)),
+            search_hedge=bool(data.get("search_hedge", cls.search_hedge)),
+            search_hedge_delay=float(data.get("search_hedge_delay", cls.search_hedge_delay)),
+            web_search_batch_size=int(data.get("web_search_batch_size", cls.web_search_batch_size)),
+            search_backend=str(data.get("search_backend", cls.search_backend)),
             stop_file=str(data.get("stop_file", cls.stop_file)),
         )
 
@@ -62,4 +98,40 @@ def load_pipeline_settings(path: Path = DEFAULT_CONFIG_PATH) -> PipelineSettings
         settings.letters_per_run = max(0, int(env_val))
     if env_val := os.environ.get("PIPELINE_CANDIDATE_CONCURRENCY"):
         settings.candidate_concurrency = max(1, int(env_val))
+    if env_val := os.environ.get("PIPELINE_QUERY_CONCURRENCY"):
+        settings.query_concurrency = max(1, int(env_val))
+    if env_val := os.environ.get("PIPELINE_EXPANSION_MAX_DERIVED"):
+        settings.expansion_max_derived = max(0, int(env_val))
+    if env_val := os.environ.get("PIPELINE_EXPANSION_MAX_PER_SOURCE"):
+        settings.expansion_max_per_source = max(0, int(env_val))
+    if env_val := os.environ.get("PIPELINE_EXPANSION_MAX_PER_DEPTH"):
+        settings.expansion_max_per_depth = max(0, int(env_val))
+    if env_val := os.environ.get("PIPELINE_SCRAPE_CONCURRENCY"):
+        settings.scrape_concurrency = max(1, int(env_val))
+    if env_val := os.environ.get("PIPELINE_SCRAPE_PER_HOST"):
+        settings.scrape_per_host = max(1, int(env_val))
+    if env_val := os.environ.get("PIPELINE_PARSE_WORKERS"):
+        settings.parse_workers = max(0, int(env_val))
+    if env_val := os.environ.get("PIPELINE_SNAPSHOT_TTL_HOURS"):
+        settings.snapshot_ttl_hours = max(0.0, float(env_val))
+    if env_val := os.environ.get("PIPELINE_FETCH_MEMORY_TTL_DAYS"):
+        settings.fetch_memory_ttl_days = max(0.0, float(env_val))
+    if env_val := os.environ.get("PIPELINE_HOST_FAILURE_THRESHOLD"):
+        settings.host_failure_threshold = max(1, int(env_val))
+    if env_val := os.environ.get("PIPELINE_HOST_COOLDOWN_MINUTES"):
+        settings.host_cooldown_minutes = max(0.0, float(env_val))
+    if env_val := os.environ.get("PIPELINE_SEARCH_CACHE_MODE"):
+        settings.search_cache_mode = env_val.strip().lower()
+    if env_val := os.environ.get("PIPELINE_SEARCH_CACHE_TTL_HOURS"):
+        settings.search_cache_ttl_hours = max(0.0, float(env_val))
+    if env_val := os.environ.get("PIPELINE_QUERY_DEDUPE_TTL_DAYS"):
+        settings.query_dedupe_ttl_days = max(0.0, float(env_val))
+    if env_val := os.environ.get("PIPELINE_SEARCH_HEDGE"):
+        settings.search_hedge = env_val.strip().lower() in {"1", "true", "yes", "on"}
+    if env_val := os.environ.get("PIPELINE_SEARCH_HEDGE_DELAY"):
+        settings.search_hedge_delay = max(0.0, float(env_val))
+    if env_val := os.environ.get("PIPELINE_WEB_SEARCH_BATCH_SIZE"):
+        settings.web_search_batch_size = max(1, int(env_val))
+    if env_val := os.environ.get("PIPELINE_SEARCH_BACKEND"):
+        settings.search_backend = env_val.strip().lower()
     return settings